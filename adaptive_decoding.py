@@ -0,0 +1,104 @@
+"""Adaptive decoding: greedy first, beam search only where it is needed.
+
+Beam search with ``beam_size=5`` costs several times more than greedy
+decoding on CPU, yet for clear speech both give the same text. In
+adaptive mode every 30-second window is decoded greedily first; only
+windows whose result looks unreliable - low average log-probability or a
+high compression ratio (repetition loops) - are decoded again with the
+configured beam. Temperature fallback of ``whisper.transcribe`` still
+applies afterwards.
+
+The hook wraps ``model.decode`` for the duration of one call, which is
+safe because inference on a shared model is serialised by the registry
+lock.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, Optional
+import time
+
+#: Greedy windows below this average log-probability are re-decoded.
+DEFAULT_LOGPROB_THRESHOLD = -0.8
+
+#: Greedy windows above this gzip compression ratio are re-decoded.
+DEFAULT_COMPRESSION_RATIO_THRESHOLD = 2.2
+
+
+@dataclass
+class DecodingStats:
+    """Counters of one adaptive run."""
+
+    windows: int = 0
+    escalated: int = 0
+    greedy_seconds: float = 0.0
+    beam_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters with the escalation rate and estimated speedup.
+
+        The speedup compares the measured time with decoding every window
+        with beam search, estimated from the escalated windows.
+        """
+        elapsed = self.greedy_seconds + self.beam_seconds
+        speedup: Optional[float] = None
+        if self.escalated and elapsed:
+            speedup = round(self.beam_seconds / self.escalated * self.windows / elapsed, 2)
+        return {
+            "windows": self.windows,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.windows, 3) if self.windows else 0.0,
+            "greedy_seconds": round(self.greedy_seconds, 3),
+            "beam_seconds": round(self.beam_seconds, 3),
+            "estimated_speedup": speedup,
+        }
+
+
+def needs_beam(
+    result: Any,
+    logprob_threshold: float,
+    compression_ratio_threshold: float,
+    no_speech_threshold: Optional[float] = None,
+) -> bool:
+    """Return ``True`` when a greedy ``DecodingResult`` looks unreliable."""
+    if no_speech_threshold is not None and result.no_speech_prob > no_speech_threshold:
+        return False  # silence: Whisper drops the window anyway
+    return result.avg_logprob < logprob_threshold or result.compression_ratio > compression_ratio_threshold
+
+
+@contextmanager
+def adaptive_decoding(
+    model: Any,
+    stats: DecodingStats,
+    logprob_threshold: float = DEFAULT_LOGPROB_THRESHOLD,
+    compression_ratio_threshold: float = DEFAULT_COMPRESSION_RATIO_THRESHOLD,
+    no_speech_threshold: Optional[float] = None,
+) -> Iterator[None]:
+    """Decode beam-search windows of ``model`` greedily first while active."""
+    original = model.decode
+    shadowed = "decode" in vars(model)
+
+    def decode(mel: Any, options: Any) -> Any:
+        if options.temperature > 0 or not options.beam_size or options.beam_size <= 1:
+            return original(mel, options)
+        begin = time.perf_counter()
+        greedy = original(mel, replace(options, beam_size=None, patience=None))
+        stats.greedy_seconds += time.perf_counter() - begin
+        stats.windows += 1
+        if not needs_beam(greedy, logprob_threshold, compression_ratio_threshold, no_speech_threshold):
+            return greedy
+        begin = time.perf_counter()
+        result = original(mel, options)
+        stats.beam_seconds += time.perf_counter() - begin
+        stats.escalated += 1
+        return result
+
+    model.decode = decode
+    try:
+        yield
+    finally:
+        if shadowed:
+            model.decode = original
+        else:
+            del model.decode
@@ -28,6 +28,25 @@ def analyse_file(path: str | Path) -> Dict[str, object]:
     return analyse_text(read_text(Path(path)))
 
 
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Return the word error rate of ``hypothesis`` against ``reference``."""
+    ref = WORD_REGEX.findall(reference.lower())
+    hyp = WORD_REGEX.findall(hypothesis.lower())
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
 def render_report(stats: Dict[str, object]) -> str:
     lines: List[str] = [
         "Статистика текста:",
@@ -0,0 +1,154 @@
+"""In-memory audio input for the transcription API.
+
+Whisper's own loader only takes a filesystem path, so callers that
+already hold audio in memory (web uploads, pipelines producing PCM) had
+to write a temporary file and let FFmpeg read it back. :func:`load_audio`
+accepts paths and in-memory sources alike and returns the mono 16 kHz
+float32 waveform Whisper expects:
+
+* ``str`` / :class:`~pathlib.Path` - decoded by Whisper as before;
+* ``numpy.ndarray`` - float samples in ``[-1, 1]`` or int16 PCM, mono or
+  ``(samples, channels)``; resampled when ``sample_rate`` is not 16 kHz;
+* ``bytes`` with ``sample_rate`` - raw 16-bit little-endian mono PCM;
+* ``bytes`` without ``sample_rate`` or a binary file-like object - an
+  encoded container (WAV, MP3, OGG ...) piped through FFmpeg's stdin.
+  File objects are read from their current position; their ``name``
+  only hints the container format to FFmpeg.
+
+No temporary file is written in any case.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
+import hashlib
+import subprocess
+
+import numpy as np
+
+from utils import detect_ffmpeg, ensure_file_exists
+from vad import SAMPLE_RATE
+
+AudioInput = Union[str, Path, np.ndarray, bytes, bytearray, memoryview, BinaryIO]
+
+#: Blocks of samples, e.g. from :func:`video_processor.stream_audio`.
+AudioBlocks = Iterable[np.ndarray]
+
+#: FFmpeg demuxers for file name suffixes of file-like sources.
+FORMAT_HINTS = {
+    ".wav": "wav",
+    ".mp3": "mp3",
+    ".ogg": "ogg",
+    ".oga": "ogg",
+    ".opus": "ogg",
+    ".flac": "flac",
+    ".webm": "matroska",
+    ".mkv": "matroska",
+    ".m4a": "mov",
+    ".mp4": "mov",
+}
+
+
+def is_path(source: AudioInput) -> bool:
+    """Return ``True`` when ``source`` names a file on disk."""
+    return isinstance(source, (str, Path))
+
+
+def is_block_stream(source: object) -> bool:
+    """Return ``True`` when ``source`` is an iterable of sample blocks."""
+    return (
+        not isinstance(source, (str, Path, np.ndarray, bytes, bytearray, memoryview))
+        and not hasattr(source, "read")
+        and isinstance(source, Iterable)
+    )
+
+
+def _run_ffmpeg(data: bytes, input_args: list) -> np.ndarray:
+    command = [
+        detect_ffmpeg(),
+        "-hide_banner",
+        "-threads", "0",
+        *input_args,
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        output = subprocess.run(command, input=data, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f"Не удалось декодировать аудио: {exc.stderr.decode(errors='ignore')}") from exc
+    return np.frombuffer(output, np.int16).astype(np.float32) / 32768.0
+
+
+def decode_bytes(data: bytes, format_hint: Optional[str] = None) -> np.ndarray:
+    """Decode an encoded audio container held in memory with FFmpeg.
+
+    ``format_hint`` is a file name or suffix; known suffixes select the
+    demuxer instead of letting FFmpeg probe the stream.
+    """
+    if not data:
+        raise ValueError("Пустые аудиоданные")
+    demuxer = FORMAT_HINTS.get(Path(format_hint).suffix.lower()) if format_hint else None
+    return _run_ffmpeg(bytes(data), ["-f", demuxer] if demuxer else [])
+
+
+def resample(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Resample a mono float32 waveform to 16 kHz using FFmpeg."""
+    if sample_rate == SAMPLE_RATE or not len(audio):
+        return audio
+    raw = np.ascontiguousarray(audio, dtype="<f4").tobytes()
+    return _run_ffmpeg(raw, ["-f", "f32le", "-ac", "1", "-ar", str(sample_rate)])
+
+
+def _to_mono_float32(samples: np.ndarray) -> np.ndarray:
+    if samples.ndim == 2:
+        # (samples, channels) is what soundfile/Gradio return; accept the
+        # transposed layout too as long as channels are the short axis.
+        axis = 1 if samples.shape[1] <= samples.shape[0] else 0
+        samples = _to_mono_float32(samples.reshape(-1)).reshape(samples.shape).mean(axis=axis)
+    elif samples.ndim != 1:
+        raise ValueError(f"Ожидался одномерный или двумерный массив, получено измерений: {samples.ndim}")
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    if samples.dtype == np.int32:
+        return samples.astype(np.float32) / 2147483648.0
+    if not np.issubdtype(samples.dtype, np.floating):
+        raise ValueError(f"Неподдерживаемый тип отсчетов: {samples.dtype}")
+    return samples.astype(np.float32, copy=False)
+
+
+def load_audio(source: AudioInput, sample_rate: Optional[int] = None) -> np.ndarray:
+    """Return ``source`` as a mono 16 kHz float32 waveform.
+
+    Args:
+        source: Path, sample array, raw/encoded bytes or binary file-like
+            object (see the module docstring).
+        sample_rate: Sample rate of array or raw PCM input. Arrays default
+            to 16 kHz; bytes without a rate are treated as an encoded file.
+    """
+    if is_path(source):
+        import whisper
+
+        return whisper.load_audio(str(ensure_file_exists(Path(source))))
+    if isinstance(source, np.ndarray):
+        return resample(_to_mono_float32(source), sample_rate or SAMPLE_RATE)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if sample_rate is None:
+            return decode_bytes(bytes(source))
+        pcm = np.frombuffer(source, dtype="<i2")
+        return resample(pcm.astype(np.float32) / 32768.0, sample_rate)
+    if hasattr(source, "read"):
+        data = source.read()
+        name = getattr(source, "name", None)
+        if sample_rate is None and isinstance(name, str):
+            return decode_bytes(data, name)
+        return load_audio(data, sample_rate)
+    raise TypeError(f"Неподдерживаемый источник аудио: {type(source).__name__}")
+
+
+def audio_digest(audio: np.ndarray) -> str:
+    """Return the SHA-256 hex digest of decoded samples (cache key input)."""
+    return hashlib.sha256(np.ascontiguousarray(audio, dtype=np.float32).tobytes()).hexdigest()
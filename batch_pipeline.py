@@ -0,0 +1,179 @@
+"""Staged pipeline overlapping audio decoding, inference and output writing.
+
+``Transcriber.batch_transcribe`` used to handle files strictly one after
+another. The pipeline keeps three stages busy at once:
+
+* a thread pool decodes upcoming files to 16 kHz PCM (FFmpeg runs in a
+  subprocess, so the threads do not contend for the GIL);
+* the calling thread runs inference on the current file;
+* a writer thread persists finished results.
+
+Stages are connected by bounded queues so memory stays proportional to
+``queue_size`` decoded files.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """Busy time and processed item count of one pipeline stage."""
+
+    workers: int = 1
+    busy_seconds: float = 0.0
+    items: int = 0
+
+
+@dataclass
+class PipelineReport:
+    """Per-stage statistics of a pipeline run."""
+
+    wall_seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+    def utilization(self) -> Dict[str, float]:
+        """Return the busy fraction of every stage (0.0 - 1.0)."""
+        if self.wall_seconds <= 0:
+            return {name: 0.0 for name in self.stages}
+        return {
+            name: round(stats.busy_seconds / (self.wall_seconds * stats.workers), 3)
+            for name, stats in self.stages.items()
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stages": {
+                name: {
+                    "workers": stats.workers,
+                    "busy_seconds": round(stats.busy_seconds, 3),
+                    "items": stats.items,
+                }
+                for name, stats in self.stages.items()
+            },
+            "utilization": self.utilization(),
+        }
+
+
+def run_pipeline(
+    paths: Iterable[Path],
+    decode: Callable[[Path], Any],
+    infer: Callable[[Path, Any], Any],
+    write: Callable[[Path, Any], Optional[Path]],
+    *,
+    decode_workers: int = 2,
+    queue_size: int = 4,
+    preserve_order: bool = True,
+) -> Tuple[List[Optional[Path]], PipelineReport]:
+    """Run ``decode`` → ``infer`` → ``write`` over ``paths`` with overlap.
+
+    Args:
+        paths: Input files.
+        decode: Turns a path into model input (e.g. PCM samples).
+        infer: Runs the model; called from the calling thread only.
+        write: Persists a result and returns the written path.
+        decode_workers: Threads decoding ahead of inference.
+        queue_size: Maximum decoded files waiting for inference and
+            results waiting to be written.
+        preserve_order: Run inference and return outputs in input order.
+            When ``False`` files are processed as soon as they are decoded.
+
+    Returns:
+        The written paths and a :class:`PipelineReport`.
+    """
+    decode_stats = StageStats(workers=max(1, decode_workers))
+    infer_stats = StageStats()
+    write_stats = StageStats()
+    report = PipelineReport(stages={"decode": decode_stats, "inference": infer_stats, "write": write_stats})
+    stats_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def timed_decode(path: Path) -> Any:
+        begin = time.perf_counter()
+        try:
+            return decode(path)
+        finally:
+            with stats_lock:
+                decode_stats.busy_seconds += time.perf_counter() - begin
+                decode_stats.items += 1
+
+    written: Dict[int, Optional[Path]] = {}
+    completion: List[int] = []
+    write_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    write_errors: List[BaseException] = []
+
+    def writer() -> None:
+        while True:
+            item = write_queue.get()
+            if item is _STOP:
+                return
+            index, path, result = item
+            if write_errors:
+                continue
+            begin = time.perf_counter()
+            try:
+                written[index] = write(path, result)
+                completion.append(index)
+            except BaseException as exc:  # noqa: BLE001 - re-raised in the caller
+                write_errors.append(exc)
+            finally:
+                write_stats.busy_seconds += time.perf_counter() - begin
+                write_stats.items += 1
+
+    writer_thread = threading.Thread(target=writer, name="voicebox-writer", daemon=True)
+    writer_thread.start()
+
+    pending: Deque[Tuple[int, Path, Future]] = deque()
+    source = iter(enumerate(Path(path) for path in paths))
+    try:
+        with ThreadPoolExecutor(max_workers=decode_stats.workers, thread_name_prefix="voicebox-decode") as pool:
+
+            def refill() -> None:
+                while len(pending) < max(1, queue_size):
+                    item: Optional[Tuple[int, Path]] = next(source, None)
+                    if item is None:
+                        return
+                    index, path = item
+                    pending.append((index, path, pool.submit(timed_decode, path)))
+
+            refill()
+            while pending:
+                if preserve_order:
+                    index, path, future = pending.popleft()
+                else:
+                    done, _ = wait([entry[2] for entry in pending], return_when=FIRST_COMPLETED)
+                    entry = next(entry for entry in pending if entry[2] in done)
+                    pending.remove(entry)
+                    index, path, future = entry
+                audio = future.result()
+                refill()
+
+                begin = time.perf_counter()
+                result = infer(path, audio)
+                infer_stats.busy_seconds += time.perf_counter() - begin
+                infer_stats.items += 1
+
+                if write_errors:
+                    raise write_errors[0]
+                write_queue.put((index, path, result))
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        write_queue.put(_STOP)
+        writer_thread.join()
+
+    if write_errors:
+        raise write_errors[0]
+    report.wall_seconds = time.perf_counter() - started
+    order = sorted(written) if preserve_order else completion
+    return [written[index] for index in order], report
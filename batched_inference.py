@@ -0,0 +1,201 @@
+"""Cross-file batched inference for short clips.
+
+Transcribing thousands of short recordings one by one leaves the hardware
+mostly idle: every clip gets its own tiny encoder and decoder call. Here
+the 30-second mel windows of several clips are stacked into one batch so
+the encoder and the (batched) decoder of ``whisper.decode`` process them
+together, and the decoded tokens are split back into one Whisper-like
+result per clip.
+
+Only the decoding itself is batched, with the same temperature fallback
+as ``whisper.transcribe``. Pipeline features of
+:meth:`transcriber.Transcriber.transcribe` (silence skipping, adaptive
+decoding, the model cascade, speculative decoding) are not applied here;
+``Transcriber.transcribe_batch`` sends clips through the regular path
+when any of them is enabled.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import whisper
+from whisper.audio import HOP_LENGTH, N_FRAMES, N_SAMPLES, SAMPLE_RATE
+
+#: Seconds represented by one timestamp token.
+TIME_PRECISION = 0.02
+
+#: Same default as ``whisper.transcribe``: a window is silent when the
+#: no-speech probability is high *and* the average log-probability low.
+LOGPROB_THRESHOLD = -1.0
+
+#: ``whisper.transcribe`` default: re-decode at the next temperature when
+#: the text compresses better than this (repetition loops).
+COMPRESSION_RATIO_THRESHOLD = 2.4
+
+
+def fits_single_window(audio: np.ndarray) -> bool:
+    """Return ``True`` when ``audio`` fits one 30-second Whisper window."""
+    return len(audio) <= N_SAMPLES
+
+
+def _window_mel(audio: np.ndarray, n_mels: int) -> torch.Tensor:
+    mel = whisper.log_mel_spectrogram(audio, n_mels, padding=N_SAMPLES)
+    content_frames = len(audio) // HOP_LENGTH
+    return whisper.pad_or_trim(mel[:, :content_frames], N_FRAMES)
+
+
+def _segments_from_tokens(
+    tokens: Sequence[int], tokenizer: Any, duration: float, decoded: Any
+) -> List[Dict[str, Any]]:
+    """Split decoded tokens into segments at timestamp token pairs."""
+    timestamp_begin = tokenizer.timestamp_begin
+    spans: List[tuple[float, float, List[int]]] = []
+    start = None
+    current: List[int] = []
+    for token in tokens:
+        if token >= timestamp_begin:
+            moment = (token - timestamp_begin) * TIME_PRECISION
+            if start is not None and current:
+                spans.append((start, moment, current))
+                current = []
+                start = None
+            else:
+                start = moment
+        elif token < tokenizer.eot:
+            current.append(token)
+    if current:
+        spans.append((start or 0.0, duration, current))
+
+    segments = []
+    for start, end, text_tokens in spans:
+        segments.append(
+            {
+                "id": len(segments),
+                "seek": 0,
+                "start": round(min(start, duration), 3),
+                "end": round(min(max(end, start), duration), 3),
+                "text": tokenizer.decode(text_tokens),
+                "tokens": list(text_tokens),
+                "temperature": decoded.temperature,
+                "avg_logprob": decoded.avg_logprob,
+                "compression_ratio": decoded.compression_ratio,
+                "no_speech_prob": decoded.no_speech_prob,
+            }
+        )
+    return segments
+
+
+def _decoding_options(model: "whisper.model.Whisper", decode_options: Dict[str, Any], temperature: float) -> Any:
+    return whisper.DecodingOptions(
+        task=decode_options.get("task", "transcribe"),
+        language=decode_options.get("language"),
+        temperature=temperature,
+        beam_size=decode_options.get("beam_size") if temperature == 0 else None,
+        best_of=decode_options.get("best_of") if temperature > 0 else None,
+        prompt=decode_options.get("initial_prompt"),
+        fp16=model.device.type == "cuda",
+    )
+
+
+def _decode(model: "whisper.model.Whisper", mel: torch.Tensor, options: Any) -> List[Any]:
+    try:
+        return whisper.decode(model, mel, options)
+    except RuntimeError:
+        # Some Whisper releases do not expand the audio features per beam
+        # (or per best-of sample), so batched beam search and sampling fail;
+        # decode the clips one by one then.
+        if not ((options.beam_size or options.best_of or 1) > 1 and len(mel) > 1):
+            raise
+        return [whisper.decode(model, window, options) for window in mel]
+
+
+def _needs_fallback(
+    decoded: Any,
+    no_speech_threshold: Optional[float],
+    logprob_threshold: Optional[float],
+    compression_ratio_threshold: Optional[float],
+) -> bool:
+    """Same rule as ``whisper.transcribe``: retry unreliable, non-silent windows."""
+    if no_speech_threshold is not None and decoded.no_speech_prob > no_speech_threshold:
+        return False
+    if compression_ratio_threshold is not None and decoded.compression_ratio > compression_ratio_threshold:
+        return True
+    return logprob_threshold is not None and decoded.avg_logprob < logprob_threshold
+
+
+def decode_batch(
+    model: "whisper.model.Whisper",
+    audios: Sequence[np.ndarray],
+    decode_options: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Decode clips of at most 30 seconds in a single batched forward pass.
+
+    Args:
+        model: Loaded Whisper model.
+        audios: Mono 16 kHz float32 clips, each fitting one window.
+        decode_options: Options as passed to ``model.transcribe``.
+
+    Returns:
+        One result dictionary (``text``, ``segments``, ``language``) per
+        clip, in input order.
+
+    Greedy decoding (``beam_size=1``) gives the largest gain: beam search
+    already multiplies the decoder batch by the beam width. When
+    ``temperature`` is a sequence, clips whose result is unreliable
+    (``compression_ratio_threshold`` / ``logprob_threshold``, defaults as
+    in ``whisper.transcribe``) are re-decoded together at the next
+    temperature.
+    """
+    if not audios:
+        return []
+    mel = torch.stack([_window_mel(audio, model.dims.n_mels) for audio in audios]).to(model.device)
+    temperature = decode_options.get("temperature", 0.0)
+    temperatures: Tuple[float, ...] = (
+        (temperature,) if isinstance(temperature, (int, float)) else tuple(temperature)
+    )
+    no_speech_threshold = decode_options.get("no_speech_threshold")
+    logprob_threshold = decode_options.get("logprob_threshold", LOGPROB_THRESHOLD)
+    compression_ratio_threshold = decode_options.get("compression_ratio_threshold", COMPRESSION_RATIO_THRESHOLD)
+
+    decoded_batch: List[Any] = [None] * len(audios)
+    pending = list(range(len(audios)))
+    for position, current in enumerate(temperatures):
+        options = _decoding_options(model, decode_options, current)
+        for index, decoded in zip(pending, _decode(model, mel[pending], options)):
+            decoded_batch[index] = decoded
+        if position + 1 == len(temperatures):
+            break
+        pending = [
+            index
+            for index in pending
+            if _needs_fallback(decoded_batch[index], no_speech_threshold, logprob_threshold, compression_ratio_threshold)
+        ]
+        if not pending:
+            break
+
+    tokenizer_options = {"num_languages": model.num_languages} if hasattr(model, "num_languages") else {}
+    results = []
+    for audio, decoded in zip(audios, decoded_batch):
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            language=decoded.language,
+            task=decode_options.get("task", "transcribe"),
+            **tokenizer_options,
+        )
+        silent = (
+            no_speech_threshold is not None
+            and decoded.no_speech_prob > no_speech_threshold
+            and not (logprob_threshold is not None and decoded.avg_logprob > logprob_threshold)
+        )
+        duration = len(audio) / SAMPLE_RATE
+        segments = [] if silent else _segments_from_tokens(decoded.tokens, tokenizer, duration, decoded)
+        results.append(
+            {
+                "text": "".join(segment["text"] for segment in segments),
+                "segments": segments,
+                "language": decoded.language,
+            }
+        )
+    return results
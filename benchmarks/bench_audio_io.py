@@ -0,0 +1,102 @@
+"""Benchmark: in-memory audio input vs a temporary-file round trip.
+
+Usage:
+    python benchmarks/bench_audio_io.py meeting.wav --repeat 5
+
+The file is decoded once to 16 kHz PCM. The benchmark then measures how
+long it takes to hand the same audio to the transcriber:
+
+* ``tempfile`` - write a WAV to disk and decode it again with FFmpeg
+  (what callers holding audio in memory had to do before);
+* ``array`` - pass the float32 samples directly;
+* ``pcm_bytes`` - pass raw 16-bit PCM with ``sample_rate``;
+* ``wav_bytes`` - pass an encoded WAV held in memory (piped to FFmpeg).
+
+Only input preparation is timed; the model is not loaded.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from audio_io import load_audio  # noqa: E402
+from vad import SAMPLE_RATE  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Передача аудио из памяти против временного файла")
+    parser.add_argument("audio", help="Аудио или видео файл")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов на каждый способ")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def wav_bytes(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def via_tempfile(encoded: bytes) -> np.ndarray:
+    fd, name = tempfile.mkstemp(suffix=".wav")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(encoded)
+        return load_audio(name)
+    finally:
+        os.unlink(name)
+
+
+def measure(function: Callable[[], np.ndarray], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(timings) * 1000, 2), "min_ms": round(min(timings) * 1000, 2)}
+
+
+def main() -> None:
+    args = parse_args()
+    audio = load_audio(args.audio)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    encoded = wav_bytes(pcm)
+
+    results = {
+        "tempfile": measure(lambda: via_tempfile(encoded), args.repeat),
+        "array": measure(lambda: load_audio(audio), args.repeat),
+        "pcm_bytes": measure(lambda: load_audio(pcm, sample_rate=SAMPLE_RATE), args.repeat),
+        "wav_bytes": measure(lambda: load_audio(encoded), args.repeat),
+    }
+    baseline = results["tempfile"]["median_ms"]
+    for name, result in results.items():
+        result["speedup"] = round(baseline / result["median_ms"], 2) if result["median_ms"] else None
+    report = {
+        "audio_seconds": round(len(audio) / SAMPLE_RATE, 2),
+        "wav_mb": round(len(encoded) / 2**20, 2),
+        "results": results,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
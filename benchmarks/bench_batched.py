@@ -0,0 +1,68 @@
+"""Benchmark: files/sec of cross-file batched inference by batch size.
+
+Usage:
+    python benchmarks/bench_batched.py clips/ --model base --batch-sizes 1,4,8,16
+
+All ``*.wav``/``*.mp3``/``*.ogg``/``*.m4a`` files in the directory are
+transcribed greedily on CPU once per batch size (result cache disabled).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcriber import Transcriber  # noqa: E402
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".ogg", ".m4a", ".flac"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пропускная способность пакетного инференса")
+    parser.add_argument("directory", help="Каталог с короткими аудиофайлами")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--language", default=None, help="Язык аудио")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16", help="Размеры пакета через запятую")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    files = sorted(p for p in Path(args.directory).iterdir() if p.suffix.lower() in AUDIO_SUFFIXES)
+    if not files:
+        raise SystemExit("Нет аудиофайлов в каталоге")
+
+    transcriber = Transcriber(
+        model_size=args.model,
+        language=args.language,
+        device="cpu",
+        beam_size=1,
+        best_of=1,
+        use_cache=False,
+    )
+    transcriber._load_model()
+
+    rows = []
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        started = time.perf_counter()
+        transcriber.transcribe_batch(files, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        rows.append({
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 3),
+            "files_per_second": round(len(files) / elapsed, 3),
+        })
+        print(f"batch={batch_size:>3}  {rows[-1]['files_per_second']:.2f} файлов/с")
+
+    report = {"model": args.model, "files": len(files), "runs": rows}
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
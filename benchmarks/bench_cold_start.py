@@ -0,0 +1,135 @@
+"""Benchmark: cold start of whisper.load_model vs memory-mapped snapshots.
+
+Usage:
+    python benchmarks/bench_cold_start.py --model base --runs 3 --processes 4
+
+Every measurement runs in a fresh interpreter. The report shows the model
+load time and memory of one process (RSS, anonymous and file-backed
+parts) and, with ``--processes``, the proportional set size (PSS) summed
+over that many processes holding the model at the same time - the
+physical memory actually used, where mapped snapshot pages are shared.
+The snapshot is created before timing starts.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ("whisper", "mmap")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Время холодного старта и память: whisper.load_model против mmap")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--runs", type=int, default=3, help="Запусков на каждый режим")
+    parser.add_argument("--processes", type=int, default=1, help="Одновременных процессов для замера общей памяти")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    parser.add_argument("--child", choices=MODES, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--hold", type=float, default=0.0, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def memory_kb() -> Dict[str, int]:
+    fields = {}
+    for name in ("/proc/self/status", "/proc/self/smaps_rollup"):
+        try:
+            lines = Path(name).read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile", "Pss"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def child(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    from transcriber import Transcriber
+
+    import_seconds = time.perf_counter() - started
+    transcriber = Transcriber(model_size=args.model, device="cpu", use_cache=False, mmap_model=args.child == "mmap")
+    started = time.perf_counter()
+    model = transcriber._load_model()
+    load_seconds = time.perf_counter() - started
+    # Touch every weight once, as the first inference would.
+    sum(float(parameter.detach().float().sum()) for parameter in model.parameters())
+    first_touch_seconds = time.perf_counter() - started - load_seconds
+    print(json.dumps({
+        "import_seconds": round(import_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "first_touch_seconds": round(first_touch_seconds, 3),
+        "memory_kb": memory_kb(),
+    }), flush=True)
+    time.sleep(args.hold)
+    if args.hold:
+        print(json.dumps({"memory_kb": memory_kb()}), flush=True)
+
+
+def spawn(mode: str, args: argparse.Namespace, hold: float = 0.0) -> subprocess.Popen:
+    command = [sys.executable, __file__, "--child", mode, "--model", args.model, "--hold", str(hold)]
+    return subprocess.Popen(command, stdout=subprocess.PIPE, text=True, cwd=ROOT)
+
+
+def run_once(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    process = spawn(mode, args)
+    output, _ = process.communicate()
+    if process.returncode:
+        raise SystemExit(f"Ошибка дочернего процесса ({mode})")
+    return json.loads(output.splitlines()[-1])
+
+
+def shared_memory(mode: str, args: argparse.Namespace) -> Dict[str, int]:
+    hold = 5.0
+    processes = [spawn(mode, args, hold) for _ in range(args.processes)]
+    reports: List[Dict[str, Any]] = []
+    for process in processes:
+        output, _ = process.communicate()
+        reports.append(json.loads(output.splitlines()[-1]))
+    return {
+        "processes": args.processes,
+        "total_rss_mb": round(sum(r["memory_kb"].get("VmRSS", 0) for r in reports) / 1024, 1),
+        "total_pss_mb": round(sum(r["memory_kb"].get("Pss", 0) for r in reports) / 1024, 1),
+    }
+
+
+def summarise(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    last = runs[-1]["memory_kb"]
+    return {
+        "load_seconds": round(statistics.median(r["load_seconds"] for r in runs), 3),
+        "first_touch_seconds": round(statistics.median(r["first_touch_seconds"] for r in runs), 3),
+        "rss_mb": round(last.get("VmRSS", 0) / 1024, 1),
+        "rss_anon_mb": round(last.get("RssAnon", 0) / 1024, 1),
+        "rss_file_mb": round(last.get("RssFile", 0) / 1024, 1),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    if args.child:
+        child(args)
+        return
+
+    run_once("mmap", args)  # creates the snapshot
+    report: Dict[str, Any] = {"model": args.model, "runs": args.runs}
+    for mode in MODES:
+        report[mode] = summarise([run_once(mode, args) for _ in range(max(1, args.runs))])
+        if args.processes > 1:
+            report[mode]["shared"] = shared_memory(mode, args)
+    report["load_speedup"] = round(report["whisper"]["load_seconds"] / max(report["mmap"]["load_seconds"], 1e-6), 2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
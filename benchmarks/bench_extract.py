@@ -0,0 +1,44 @@
+"""Benchmark: sequential ``extract_audio`` vs concurrent ``extract_audio_many``.
+
+Usage:
+    python benchmarks/bench_extract.py videos/*.mp4 --workers 1 4 8
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video_processor import extract_audio, extract_audio_many  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пропускная способность извлечения аудио")
+    parser.add_argument("inputs", nargs="+", help="Видео или аудио файлы")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="Число процессов FFmpeg")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        for path in args.inputs:
+            extract_audio(path, Path(tmp) / "sequential.wav")
+        report["sequential_seconds"] = round(time.perf_counter() - started, 3)
+        for workers in args.workers:
+            result = extract_audio_many(args.inputs, Path(tmp) / str(workers), max_workers=workers)
+            summary = result.as_dict()
+            summary.pop("results")
+            report[f"workers_{workers}"] = summary
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: import time of the entry points and tools (``-X importtime``).
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --check --budget-ms 500
+
+Every module is imported in a fresh interpreter with ``-X importtime``.
+The report shows its cumulative import time and which heavy dependencies
+(torch, whisper ...) it pulled in, plus the wall time of ``main.py
+--help``. With ``--check`` the script exits with an error when a module
+that must stay light imports a heavy dependency or exceeds the budget, so
+it can guard the lazy imports in CI.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+
+#: Modules that must start without loading a model runtime.
+LIGHT_MODULES = (
+    "config",
+    "utils",
+    "audio_analyzer",
+    "summarizer",
+    "main",
+    "transcriber",
+    "subtitle_generator",
+    "gui_mega",
+)
+
+HEAVY_PACKAGES = ("torch", "whisper", "numba", "tiktoken", "gradio")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Время импорта модулей VOICEBOX (-X importtime)")
+    parser.add_argument("--modules", nargs="+", default=list(LIGHT_MODULES), help="Проверяемые модули")
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на модуль")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Допустимое время импорта (мс)")
+    parser.add_argument("--check", action="store_true", help="Завершиться с ошибкой при превышении")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def import_profile(module: str) -> Dict[str, Any]:
+    """Import ``module`` in a fresh interpreter and parse ``-X importtime``."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    if process.returncode:
+        return {"error": process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "import failed"}
+    cumulative_us = 0
+    packages = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return {
+        "import_ms": round(cumulative_us / 1000, 1),
+        "heavy": sorted(packages.intersection(HEAVY_PACKAGES)),
+    }
+
+
+def cli_help_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", "--help"], capture_output=True, cwd=ROOT, check=True)
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def main() -> None:
+    args = parse_args()
+    results: Dict[str, Dict[str, Any]] = {}
+    for module in args.modules:
+        runs: List[Dict[str, Any]] = [import_profile(module) for _ in range(max(1, args.repeat))]
+        if "error" in runs[0]:
+            results[module] = runs[0]
+            continue
+        results[module] = {
+            "import_ms": statistics.median(run["import_ms"] for run in runs),
+            "heavy": runs[0]["heavy"],
+        }
+    report = {
+        "budget_ms": args.budget_ms,
+        "modules": results,
+        "main_help_ms": statistics.median(cli_help_ms() for _ in range(max(1, args.repeat))),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.check:
+        problems = [
+            f"{module}: {', '.join(result['heavy'])}" if result.get("heavy") else f"{module}: {result['import_ms']} мс"
+            for module, result in results.items()
+            if "error" not in result and (result["heavy"] or result["import_ms"] > args.budget_ms)
+        ]
+        if problems:
+            raise SystemExit("Медленный импорт:\n" + "\n".join(problems))
+
+
+if __name__ == "__main__":
+    main()
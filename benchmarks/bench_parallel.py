@@ -0,0 +1,75 @@
+"""Benchmark: sequential vs chunked parallel transcription.
+
+Usage:
+    python benchmarks/bench_parallel.py meeting.wav --model base --workers 4
+
+Both paths transcribe the same file; the report shows wall-clock time,
+real-time factor and the speedup of the process pool (worker model
+loading included).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import whisper  # noqa: E402
+
+from transcriber import Transcriber  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Последовательная vs параллельная транскрибация")
+    parser.add_argument("input", help="Длинная аудиозапись")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--language", default=None, help="Язык аудио")
+    parser.add_argument("--workers", type=int, default=4, help="Количество процессов")
+    parser.add_argument("--chunk-seconds", type=float, default=300.0, help="Длина фрагмента (сек)")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def _timed(transcriber: Transcriber, path: str) -> float:
+    started = time.perf_counter()
+    transcriber.transcribe(path)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    args = parse_args()
+    duration = len(whisper.load_audio(args.input)) / whisper.audio.SAMPLE_RATE
+
+    sequential = Transcriber(model_size=args.model, language=args.language, device="cpu")
+    sequential._load_model()
+    sequential_time = _timed(sequential, args.input)
+
+    parallel = Transcriber(
+        model_size=args.model,
+        language=args.language,
+        device="cpu",
+        parallel_workers=args.workers,
+        chunk_seconds=args.chunk_seconds,
+    )
+    parallel_time = _timed(parallel, args.input)
+
+    report = {
+        "audio_seconds": round(duration, 2),
+        "model": args.model,
+        "workers": args.workers,
+        "sequential_seconds": round(sequential_time, 2),
+        "parallel_seconds": round(parallel_time, 2),
+        "sequential_rtf": round(sequential_time / duration, 3),
+        "parallel_rtf": round(parallel_time / duration, 3),
+        "speedup": round(sequential_time / parallel_time, 2),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
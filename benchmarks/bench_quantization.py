@@ -0,0 +1,99 @@
+"""Benchmark: int8 dynamic quantization vs fp32 on CPU.
+
+Usage:
+    python benchmarks/bench_quantization.py reference/ --model base
+
+``reference/`` holds audio files with a same-named ``.txt`` transcript
+next to each (``call1.wav`` + ``call1.txt``). Both precisions transcribe
+the whole set; the report shows load time, model memory, inference time,
+real-time factor and word error rate, plus the int8/fp32 deltas.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import whisper  # noqa: E402
+
+from audio_analyzer import word_error_rate  # noqa: E402
+from model_registry import estimate_model_bytes  # noqa: E402
+from transcriber import Transcriber  # noqa: E402
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".ogg", ".m4a", ".flac"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="int8 vs fp32: скорость, память, точность")
+    parser.add_argument("reference", help="Каталог с аудио и эталонными .txt")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--language", default=None, help="Язык аудио")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def run(precision: str, files: List[Path], args: argparse.Namespace) -> Dict[str, float]:
+    transcriber = Transcriber(
+        model_size=args.model,
+        language=args.language,
+        device="cpu",
+        use_cache=False,
+        quantize=None if precision == "fp32" else precision,
+    )
+    started = time.perf_counter()
+    model = transcriber._load_model()
+    load_seconds = time.perf_counter() - started
+
+    audio_seconds = 0.0
+    inference_seconds = 0.0
+    errors = []
+    for path in files:
+        audio_seconds += len(whisper.load_audio(str(path))) / whisper.audio.SAMPLE_RATE
+        started = time.perf_counter()
+        result = transcriber.transcribe(path)
+        inference_seconds += time.perf_counter() - started
+        reference = path.with_suffix(".txt").read_text(encoding="utf-8")
+        errors.append(word_error_rate(reference, result.get("text", "")))
+    transcriber.close()
+
+    return {
+        "load_seconds": round(load_seconds, 3),
+        "model_mb": round(estimate_model_bytes(model) / 2**20, 1),
+        "inference_seconds": round(inference_seconds, 3),
+        "rtf": round(inference_seconds / audio_seconds, 4) if audio_seconds else 0.0,
+        "wer": round(sum(errors) / len(errors), 4),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    files = sorted(
+        p for p in Path(args.reference).iterdir()
+        if p.suffix.lower() in AUDIO_SUFFIXES and p.with_suffix(".txt").is_file()
+    )
+    if not files:
+        raise SystemExit("Нет пар аудио + .txt в каталоге")
+
+    fp32 = run("fp32", files, args)
+    int8 = run("int8", files, args)
+    report = {
+        "model": args.model,
+        "files": len(files),
+        "fp32": fp32,
+        "int8": int8,
+        "speedup": round(fp32["inference_seconds"] / int8["inference_seconds"], 2),
+        "memory_ratio": round(int8["model_mb"] / fp32["model_mb"], 3),
+        "wer_delta": round(int8["wer"] - fp32["wer"], 4),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
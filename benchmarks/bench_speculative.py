@@ -0,0 +1,102 @@
+"""Benchmark: tokens/sec of greedy vs speculative decoding.
+
+Usage:
+    python benchmarks/bench_speculative.py speech.wav --model medium --draft-model base --draft-tokens 2,4,6
+
+The first ``--windows`` 30-second windows of the file are decoded on CPU
+by the target model alone (``model.decode``, greedy) and speculatively
+with the draft model for each draft length. Throughput counts generated
+tokens including the end-of-text token; the report also checks that the
+speculative tokens equal the greedy ones.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_io import load_audio  # noqa: E402
+from transcriber import Transcriber  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Токенов в секунду: жадное против спекулятивного декодирования")
+    parser.add_argument("audio", help="Аудиофайл с речью")
+    parser.add_argument("--model", default="medium", help="Основная модель Whisper")
+    parser.add_argument("--draft-model", default="base", help="Черновая модель")
+    parser.add_argument("--draft-tokens", default="2,4,6", help="Длины черновика через запятую")
+    parser.add_argument("--language", default=None, help="Язык аудио (по умолчанию определяется)")
+    parser.add_argument("--windows", type=int, default=4, help="Сколько 30-секундных окон декодировать")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    import torch
+    import whisper
+    from whisper.audio import N_FRAMES, N_SAMPLES
+
+    from speculative_decoding import SpeculativeStats, check_compatible, speculative_decode
+
+    audio = load_audio(args.audio)
+    target = Transcriber(model_size=args.model, device="cpu", use_cache=False)._load_model()
+    draft = Transcriber(model_size=args.draft_model, device="cpu", use_cache=False)._load_model()
+    check_compatible(target, draft)
+
+    mels = []
+    for start in range(0, max(len(audio), 1), N_SAMPLES)[: args.windows]:
+        mel = whisper.log_mel_spectrogram(audio[start:start + N_SAMPLES], target.dims.n_mels, padding=N_SAMPLES)
+        mels.append(whisper.pad_or_trim(mel, N_FRAMES))
+    language = args.language
+    if language is None:
+        _, probs = target.detect_language(mels[0])
+        language = max(probs, key=probs.get)
+    options = whisper.DecodingOptions(language=language, fp16=False)
+
+    with torch.no_grad():
+        started = time.perf_counter()
+        reference = [target.decode(mel, options) for mel in mels]
+        greedy_seconds = time.perf_counter() - started
+    tokens = sum(len(result.tokens) + 1 for result in reference)
+    report: Dict[str, Any] = {
+        "model": args.model,
+        "draft_model": args.draft_model,
+        "windows": len(mels),
+        "greedy": {
+            "tokens": tokens,
+            "seconds": round(greedy_seconds, 3),
+            "tokens_per_second": round(tokens / greedy_seconds, 1),
+        },
+        "speculative": [],
+    }
+    print(f"greedy        {report['greedy']['tokens_per_second']:>8.1f} токенов/с")
+
+    rows: List[Dict[str, Any]] = report["speculative"]
+    for draft_tokens in (int(value) for value in args.draft_tokens.split(",")):
+        stats = SpeculativeStats()
+        results = [speculative_decode(target, draft, mel, options, draft_tokens, stats) for mel in mels]
+        row = {
+            "draft_tokens": draft_tokens,
+            **stats.as_dict(),
+            "identical": all(a.tokens == b.tokens for a, b in zip(results, reference)),
+        }
+        row["speedup"] = round(row["tokens_per_second"] / report["greedy"]["tokens_per_second"], 2)
+        rows.append(row)
+        print(
+            f"draft={draft_tokens:<2}      {row['tokens_per_second']:>8.1f} токенов/с  "
+            f"x{row['speedup']}  принято {row['acceptance_rate']:.0%}  совпадает: {row['identical']}"
+        )
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: time-to-first-segment of ``transcribe_stream`` vs ``transcribe``.
+
+Usage:
+    python benchmarks/bench_stream.py lecture.wav --model base
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcriber import Transcriber  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Время до первого сегмента")
+    parser.add_argument("input", help="Аудио или видео файл")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--language", default=None, help="Язык аудио")
+    parser.add_argument("--window-seconds", type=float, default=30.0, help="Длина окна потоковой обработки")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    transcriber = Transcriber(model_size=args.model, language=args.language)
+    transcriber._load_model()
+
+    started = time.perf_counter()
+    transcriber.transcribe(args.input)
+    full_latency = time.perf_counter() - started
+
+    for _ in transcriber.transcribe_stream(args.input, window_seconds=args.window_seconds):
+        pass
+    stream = transcriber.last_stream_stats
+
+    print(json.dumps(
+        {
+            "transcribe_seconds": round(full_latency, 3),
+            "stream_time_to_first_segment": round(stream["time_to_first_segment"] or 0.0, 3),
+            "stream_total_seconds": round(stream["elapsed"], 3),
+            "windows": stream["windows"],
+            "segments": stream["segments"],
+        },
+        indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: ``add_subtitles`` modes and parallel burn-in on one video.
+
+Usage:
+    python benchmarks/bench_subtitles.py video.mp4 subtitles.srt --modes mux burn --workers 1 2 4
+
+Burn-in runs once per ``--workers`` value; the speedup is the wall time
+of the single-process burn divided by the parallel one.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+import argparse
+import json
+import sys
+import tempfile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video_processor import SUBTITLE_MODES, SubtitleStats, add_subtitles  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Время добавления субтитров по режимам")
+    parser.add_argument("video", help="Видео файл")
+    parser.add_argument("subtitles", help="Субтитры SRT/VTT")
+    parser.add_argument("--modes", nargs="+", choices=SUBTITLE_MODES, default=list(SUBTITLE_MODES), help="Режимы")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Процессов FFmpeg для прожига")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [("mux", 1)] if "mux" in args.modes else []
+        if "burn" in args.modes:
+            runs += [("burn", workers) for workers in args.workers]
+        for mode, workers in runs:
+            stats = SubtitleStats()
+            target = Path(tmp) / f"{mode}{workers}{Path(args.video).suffix}"
+            output = add_subtitles(args.video, args.subtitles, target, mode=mode, stats=stats, workers=workers)
+            name = mode if mode == "mux" else f"burn_workers_{workers}"
+            report[name] = {
+                "mode": stats.mode,
+                "seconds": round(stats.seconds, 3),
+                "codec": stats.codec,
+                "segments": stats.segments,
+                "stages": {stage: round(seconds, 3) for stage, seconds in stats.stages.items()},
+                "output_mb": round(output.stat().st_size / 1e6, 2),
+            }
+        single = report.get("burn_workers_1")
+        for name, row in report.items():
+            if single and name.startswith("burn"):
+                row["speedup"] = round(single["seconds"] / row["seconds"], 2) if row["seconds"] else None
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
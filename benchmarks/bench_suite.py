@@ -0,0 +1,194 @@
+"""Benchmark suite: throughput, real-time factor, latency and memory.
+
+Usage:
+    python benchmarks/bench_suite.py --models tiny base --beam-sizes 1 5 --threads 1 4 --json suite.json
+    python benchmarks/bench_suite.py --stub --max-rtf 0.5        # offline, no weights
+
+Every combination of model size, beam size, device and thread count runs
+in a fresh process (clean peak memory, thread pools sized once) and
+transcribes deterministic speech-like audio from :mod:`synthetic_audio`
+``--runs`` times after one warm-up run. The JSON report holds latency
+percentiles, real-time factor, decoder tokens/sec, peak memory and the
+median per-stage timings of :mod:`instrumentation`.
+
+``--stub`` replaces the models by :mod:`stub_model`, so the suite needs
+neither checkpoints nor network and tracks the pipeline overhead; with
+``--max-rtf`` it exits with an error when the median RTF of any
+combination exceeds the limit.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_audio import SAMPLE_RATE, speech_like  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Набор бенчмарков: RTF, задержка и память")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"], help="Размеры моделей Whisper")
+    parser.add_argument("--beam-sizes", type=int, nargs="+", default=[1, 5], help="Размеры луча (1 = greedy)")
+    parser.add_argument("--devices", nargs="+", default=["cpu"], help="Устройства (cpu, cuda)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0], help="Потоков PyTorch (0 = по умолчанию)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Длительность синтетического аудио (сек)")
+    parser.add_argument("--runs", type=int, default=3, help="Замеров на комбинацию (после прогрева)")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора аудио")
+    parser.add_argument("--language", default="en", help="Язык декодирования (без автоопределения)")
+    parser.add_argument("--stub", action="store_true", help="Заглушка вместо модели: без весов и сети")
+    parser.add_argument("--max-rtf", type=float, default=None, help="Ошибка, если медианный RTF выше")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p90": round(float(np.percentile(values, 90)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "mean": round(statistics.fmean(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def child(spec: Dict[str, Any]) -> Dict[str, Any]:
+    if spec["stub"]:
+        from stub_model import StubTranscriber as TranscriberClass
+    else:
+        from transcriber import Transcriber as TranscriberClass
+
+    audio = speech_like(spec["seconds"], spec["seed"])
+    transcriber = TranscriberClass(
+        model_size=spec["model"],
+        language=spec["language"],
+        device=spec["device"],
+        beam_size=spec["beam_size"],
+        best_of=spec["beam_size"],
+        use_cache=False,
+        num_threads=spec["threads"] or None,
+    )
+    started = time.perf_counter()
+    transcriber._load_model()
+    load_seconds = time.perf_counter() - started
+    transcriber.transcribe(audio)  # warm-up
+
+    latencies: List[float] = []
+    records: List[Dict[str, Any]] = []
+    for _ in range(max(1, spec["runs"])):
+        started = time.perf_counter()
+        result = transcriber.transcribe(audio)
+        latencies.append(time.perf_counter() - started)
+        records.append(result["timings"])
+
+    audio_seconds = len(audio) / SAMPLE_RATE
+    stages = sorted({stage for record in records for stage in record["stages"]})
+    tokens_per_second = [r["tokens_per_second"] for r in records if r["tokens_per_second"] is not None]
+    return {
+        "audio_seconds": round(audio_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "latency_seconds": percentiles(latencies),
+        "rtf": percentiles([latency / audio_seconds for latency in latencies]),
+        "tokens": records[-1]["tokens"],
+        "tokens_per_second": round(statistics.median(tokens_per_second), 1) if tokens_per_second else None,
+        "peak_rss_mb": records[-1]["peak_rss_mb"],
+        "cuda_peak_mb": records[-1]["cuda_peak_mb"],
+        "stages": {
+            stage: round(statistics.median(r["stages"].get(stage, 0.0) for r in records), 4) for stage in stages
+        },
+    }
+
+
+def run_child(spec: Dict[str, Any]) -> Dict[str, Any]:
+    command = [sys.executable, __file__, "--child", json.dumps(spec)]
+    process = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+    if process.returncode:
+        lines = process.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"код возврата {process.returncode}"}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    info: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "stub": args.stub,
+    }
+    try:
+        import torch
+
+        info["torch"] = torch.__version__
+        info["cuda"] = torch.cuda.get_device_name(0) if torch.cuda.is_available() else None
+    except ImportError:
+        info["torch"] = None
+    return info
+
+
+def main() -> None:
+    args = parse_args()
+    if args.child:
+        print(json.dumps(child(json.loads(args.child))), flush=True)
+        return
+
+    report: Dict[str, Any] = {
+        "environment": environment(args),
+        "audio": {"seconds": args.seconds, "seed": args.seed},
+        "runs": args.runs,
+        "results": [],
+    }
+    failed: List[str] = []
+    for model, beam_size, device, threads in itertools.product(args.models, args.beam_sizes, args.devices, args.threads):
+        spec = {
+            "model": model,
+            "beam_size": beam_size,
+            "device": device,
+            "threads": threads,
+            "seconds": args.seconds,
+            "seed": args.seed,
+            "runs": args.runs,
+            "language": args.language,
+            "stub": args.stub,
+        }
+        row = {key: spec[key] for key in ("model", "beam_size", "device", "threads")}
+        row.update(run_child(spec))
+        report["results"].append(row)
+        label = f"{model:<9} beam={beam_size:<2} {device:<4} threads={threads or 'auto':<4}"
+        if "error" in row:
+            print(f"{label}  ошибка: {row['error']}")
+            failed.append(label)
+            continue
+        rtf = row["rtf"]["p50"]
+        print(
+            f"{label}  RTF p50={rtf:.3f}  задержка p50={row['latency_seconds']['p50']:.2f} с "
+            f"p90={row['latency_seconds']['p90']:.2f} с  память={row['peak_rss_mb']} МБ"
+        )
+        if args.max_rtf is not None and rtf > args.max_rtf:
+            failed.append(f"{label}: RTF {rtf:.3f} > {args.max_rtf}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if failed:
+        raise SystemExit("Не пройдено:\n" + "\n".join(failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: inference throughput vs PyTorch thread count on CPU.
+
+Usage:
+    python benchmarks/bench_threads.py meeting.wav --model base --threads 1 2 4 8
+
+Each thread count runs in a fresh process (the inter-op pool can only be
+sized once per process) and transcribes the same audio. The report shows
+real-time factor and throughput (audio seconds per wall second) for each
+setting, so the best ``--threads`` value for the machine can be picked.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cpu_threads import available_cores  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Скорость распознавания в зависимости от числа потоков")
+    parser.add_argument("audio", help="Аудио или видео файл")
+    parser.add_argument("--model", default="base", help="Размер модели Whisper")
+    parser.add_argument("--language", default=None, help="Язык аудио")
+    parser.add_argument("--threads", type=int, nargs="+", default=None, help="Проверяемые значения (по умолчанию 1, 2, 4 ... ядра)")
+    parser.add_argument("--interop-threads", type=int, default=1, help="Потоков между операциями")
+    parser.add_argument("--cpu-affinity", default=None, help="Привязка к ядрам: auto или список")
+    parser.add_argument("--repeat", type=int, default=1, help="Повторов на каждое значение")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    return parser.parse_args()
+
+
+def measure(args: argparse.Namespace, threads: int) -> Dict[str, Any]:
+    import whisper
+
+    from transcriber import Transcriber
+
+    transcriber = Transcriber(
+        model_size=args.model,
+        language=args.language,
+        device="cpu",
+        use_cache=False,
+        num_threads=threads,
+        num_interop_threads=args.interop_threads,
+        cpu_affinity=args.cpu_affinity,
+    )
+    transcriber._load_model()
+    audio_seconds = len(whisper.load_audio(args.audio)) / whisper.audio.SAMPLE_RATE
+    runs: List[float] = []
+    for _ in range(max(1, args.repeat)):
+        started = time.perf_counter()
+        transcriber.transcribe(args.audio)
+        runs.append(time.perf_counter() - started)
+    transcriber.close()
+    best = min(runs)
+    return {
+        "threads": threads,
+        "seconds": round(best, 3),
+        "rtf": round(best / audio_seconds, 4) if audio_seconds else 0.0,
+        "throughput": round(audio_seconds / best, 2) if best else 0.0,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    cores = len(available_cores())
+    counts = args.threads
+    if not counts:
+        counts = sorted({1, *(2 ** power for power in range(1, cores.bit_length()) if 2 ** power <= cores), cores})
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for threads in counts:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(measure, (args, threads)))
+
+    report = {"model": args.model, "cores": cores, "results": results}
+    if results:
+        report["best_threads"] = max(results, key=lambda item: item["throughput"])["threads"]
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
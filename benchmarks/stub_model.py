@@ -0,0 +1,80 @@
+"""Weight-free stand-in for Whisper models.
+
+:class:`StubTranscriber` runs the real pipeline - audio handling, mel
+spectrogram, encoder, decoding loop, timestamp rules, result assembly -
+on a tiny randomly initialised model built in memory, so benchmarks and
+smoke tests work offline without downloading checkpoints. The stub keeps
+the mel bins and vocabulary of the requested size; its decoder is wired
+to emit a timestamp and end-of-text for every window, so it measures
+pipeline overhead rather than transcription.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcriber import Transcriber  # noqa: E402
+
+if TYPE_CHECKING:
+    import whisper
+
+#: Width and depth of the stub encoder and decoder.
+STUB_STATE = 64
+STUB_LAYERS = 2
+
+
+def stub_model(model_size: str, device: str = "cpu") -> "whisper.model.Whisper":
+    """Build a deterministic stub with the input/output shapes of ``model_size``."""
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+    from whisper.tokenizer import get_tokenizer
+
+    english = model_size.endswith(".en")
+    v3 = model_size == "large-v3"
+    dims = ModelDimensions(
+        n_mels=128 if v3 else 80,
+        n_audio_ctx=1500,
+        n_audio_state=STUB_STATE,
+        n_audio_head=2,
+        n_audio_layer=STUB_LAYERS,
+        n_vocab=51864 if english else 51866 if v3 else 51865,
+        n_text_ctx=448,
+        n_text_state=STUB_STATE,
+        n_text_head=2,
+        n_text_layer=STUB_LAYERS,
+    )
+    with torch.random.fork_rng():
+        torch.manual_seed(0)
+        model = Whisper(dims)
+        with torch.no_grad():
+            model.decoder.positional_embedding.normal_(0, 0.02)
+            tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages)
+            # Constant decoder output ``direction``: the logits rank
+            # end-of-text first and <|0.00|> first among timestamps.
+            direction = torch.nn.functional.normalize(torch.randn(STUB_STATE), dim=0)
+            model.decoder.ln.weight.zero_()
+            model.decoder.ln.bias.copy_(direction)
+            embedding = model.decoder.token_embedding.weight
+            embedding.normal_(0, 0.02)
+            embedding[tokenizer.eot] = direction * 8
+            embedding[tokenizer.timestamp_begin] = direction * 4
+            if tokenizer.no_speech is not None:
+                embedding[tokenizer.no_speech] = -direction * 8
+    return model.eval().to(device)
+
+
+class StubTranscriber(Transcriber):
+    """:class:`~transcriber.Transcriber` backed by :func:`stub_model`.
+
+    Stubs are registered under their own precision so a real model of the
+    same size in the same process never receives the stub, or vice versa.
+    """
+
+    def _precision(self) -> str:
+        return "stub"
+
+    def _build_model(self, device: str) -> "whisper.model.Whisper":
+        return stub_model(self.config.model_size, device)
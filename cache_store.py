@@ -0,0 +1,146 @@
+"""Size-bounded on-disk store shared by the VOICEBOX caches.
+
+:class:`ContentStore` keeps one file per key under ``directory/key[:2]/``,
+writes entries atomically and evicts the least recently used ones once
+the directory exceeds its size limit. :mod:`result_cache` and
+:mod:`extraction_cache` subclass it and only add what they store and how
+their keys are built.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+import os
+import tempfile
+import threading
+
+StoreT = TypeVar("StoreT", bound="ContentStore")
+
+
+def cache_root() -> Path:
+    """Return ``$VOICEBOX_CACHE_DIR`` or ``~/.cache/voicebox``."""
+    root = os.environ.get("VOICEBOX_CACHE_DIR")
+    return (Path(root) if root else Path.home() / ".cache" / "voicebox").expanduser()
+
+
+class ContentStore:
+    """Size-bounded LRU directory of files addressed by key.
+
+    Args:
+        directory: Where entries are stored.
+        max_bytes: Size limit; least recently used entries are evicted
+            after each write that exceeds it.
+    """
+
+    #: File name suffix of the entries.
+    suffix = ""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory).expanduser().resolve()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _entries(self, pattern: str = "*") -> List[Path]:
+        return list(self.directory.glob(f"*/{pattern}{self.suffix}"))
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _touch(self, key: str) -> Optional[Path]:
+        """Mark the entry of ``key`` as used and return it, or ``None`` when missing."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    @contextmanager
+    def staged(self, key: str) -> Iterator[Path]:
+        """Yield a temporary path that becomes the entry of ``key`` on success.
+
+        The entry only appears once the ``with`` block completes, so
+        readers never see a partial file; on an exception the temporary
+        file is removed.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            yield Path(temp_name)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def _write(self, key: str, write: Callable[[Path], None]) -> Path:
+        with self.staged(key) as temp:
+            write(temp)
+        return self._path(key)
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Remove least recently used entries above ``max_bytes``."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size."""
+        paths = self._entries()
+        return {
+            "directory": str(self.directory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(paths),
+            "size_bytes": sum(path.stat().st_size for path in paths if path.exists()),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_stores: Dict[Tuple[type, Path], ContentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(cls: Type[StoreT], directory: str | Path, max_mb: int) -> StoreT:
+    """Return the process-wide ``cls`` instance for ``directory``.
+
+    Instances are shared per directory so hit/miss counters cover every
+    user in the process; ``max_mb`` updates the size limit.
+    """
+    path = Path(directory).expanduser().resolve()
+    with _stores_lock:
+        store = _stores.get((cls, path))
+        if store is None:
+            store = _stores[(cls, path)] = cls(path, max_mb * 1024 * 1024)
+        store.max_bytes = max_mb * 1024 * 1024
+        return store  # type: ignore[return-value]
@@ -0,0 +1,80 @@
+"""Two-model cascade: a fast model triages, an accurate one fixes.
+
+The fast model (``Config.model_size``) transcribes the whole recording.
+Its segments carry Whisper's confidence signals (average log-probability,
+compression ratio, no-speech probability); runs of consecutive
+low-confidence segments are cut from the audio with a little padding,
+re-transcribed with the accurate model and spliced back in place of the
+original segments. Everything else keeps the fast model's output.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import CascadeConfig
+
+
+def is_uncertain(
+    segment: Dict[str, Any], cascade: CascadeConfig, no_speech_threshold: Optional[float] = None
+) -> bool:
+    """Return ``True`` when the fast model's ``segment`` should be redone."""
+    if "avg_logprob" not in segment:
+        return False
+    if no_speech_threshold is not None and segment.get("no_speech_prob", 0.0) > no_speech_threshold:
+        return False
+    return (
+        segment["avg_logprob"] < cascade.logprob_threshold
+        or segment.get("compression_ratio", 0.0) > cascade.compression_ratio_threshold
+    )
+
+
+def uncertain_runs(flags: Sequence[bool]) -> List[Tuple[int, int]]:
+    """Group flagged indices into ``(first, last + 1)`` runs."""
+    runs: List[Tuple[int, int]] = []
+    for index, flagged in enumerate(flags):
+        if not flagged:
+            continue
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
+def replacement_segments(
+    segments: List[Dict[str, Any]], offset: float, start: float, end: float
+) -> List[Dict[str, Any]]:
+    """Shift accurate-model ``segments`` by ``offset`` and keep ``[start, end)``.
+
+    Segments decoded from the padding belong to the neighbouring (kept)
+    fast-model segments and are dropped by their midpoint.
+    """
+    kept = []
+    for segment in segments:
+        shifted = {
+            **segment,
+            "start": round(segment["start"] + offset, 3),
+            "end": round(segment["end"] + offset, 3),
+        }
+        middle = (shifted["start"] + shifted["end"]) / 2
+        if start <= middle < end:
+            shifted["start"] = max(shifted["start"], start)
+            shifted["end"] = min(max(shifted["end"], shifted["start"]), end)
+            kept.append(shifted)
+    return kept
+
+
+def splice(
+    segments: List[Dict[str, Any]], replacements: Sequence[Tuple[int, int, List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """Replace ``segments[first:last]`` by each replacement and renumber."""
+    spliced: List[Dict[str, Any]] = []
+    position = 0
+    for first, last, new in replacements:
+        spliced.extend(segments[position:first])
+        spliced.extend(new)
+        position = last
+    spliced.extend(segments[position:])
+    for index, segment in enumerate(spliced):
+        segment["id"] = index
+    return spliced
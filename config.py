@@ -27,6 +27,9 @@
 
 from dataclasses import dataclass
 from typing import Optional
+import re
+
+VALID_MODELS = ['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3']
 
 
 @dataclass
@@ -49,6 +52,26 @@ class Config:
         condition_on_previous_text: Использовать ли контекст предыдущего текста
         initial_prompt: Начальная подсказка для модели
         verbose: Вывод подробной информации
+        parallel_workers: Количество процессов для параллельной транскрибации
+        chunk_seconds: Длина фрагмента для параллельной транскрибации (сек)
+        use_cache: Использовать кэш результатов транскрибации
+        cache_dir: Каталог кэша результатов
+        cache_max_mb: Максимальный размер кэша результатов (МБ)
+        quantize: Квантизация модели для CPU (None или "int8")
+        num_threads: Потоков PyTorch внутри операций (на процесс)
+        num_interop_threads: Потоков PyTorch между операциями (на процесс)
+        cpu_affinity: Привязка процессов к ядрам CPU
+        language_lock_after: Фиксировать язык пакета после N совпадений
+        mmap_model: Загружать модель из снимка с отображением в память
+        skip_silence: Пропускать тишину перед декодированием
+        silence_threshold_db: Порог тишины (дБFS, None = адаптивный)
+        min_silence_seconds: Минимальная длина пропускаемой паузы (сек)
+        adaptive_decoding: Сначала жадное декодирование, beam search по необходимости
+        adaptive_logprob_threshold: Порог avg_logprob для перехода на beam search
+        adaptive_compression_ratio_threshold: Порог сжатия для перехода на beam search
+        cascade: Каскад моделей (CascadeConfig или None)
+        draft_model: Черновая модель для спекулятивного декодирования
+        draft_tokens: Токенов, предлагаемых черновой моделью за шаг
     
     Example:
         >>> config = Config(model_size="medium", language="ru")
@@ -274,6 +297,276 @@ class Config:
     - False: Для скриптов и batch обработки
     """
     
+    # ═══════════════════════════════════════════════════════════════════
+    # ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА
+    # ═══════════════════════════════════════════════════════════════════
+    
+    parallel_workers: int = 1
+    """
+    Количество процессов для параллельной транскрибации длинных записей
+    
+    Что это:
+    - Аудио режется по паузам на фрагменты длиной ~chunk_seconds
+    - Фрагменты обрабатываются в отдельных процессах (у каждого своя модель)
+    - Сегменты склеиваются с исправленными таймкодами
+    
+    Рекомендации:
+    - 1: Обычная последовательная обработка (по умолчанию)
+    - 2-4: Для многочасовых записей на CPU
+    
+    Примечание:
+    - Каждый процесс загружает свою копию модели (память x N)
+    - Контекст предыдущего текста не переносится между фрагментами
+    """
+    
+    chunk_seconds: float = 300.0
+    """
+    Длина фрагмента для параллельной транскрибации (в секундах)
+    
+    Граница фрагмента сдвигается к ближайшей паузе.
+    Записи короче одного фрагмента обрабатываются без пула процессов.
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # КЭШ РЕЗУЛЬТАТОВ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    use_cache: bool = True
+    """
+    Использовать кэш результатов транскрибации
+    
+    Что это:
+    - Ключ кэша: SHA-256 содержимого аудио + параметры декодирования
+      (модель, язык, задача, beam_size, best_of, temperature, подсказка)
+    - Повторная обработка того же файла возвращает результат мгновенно
+    
+    Рекомендации:
+    - True: Для повторных экспортов и перегенерации субтитров
+    - False: Чтобы принудительно выполнить распознавание (CLI: --no-cache)
+    """
+    
+    cache_dir: Optional[str] = None
+    """
+    Каталог кэша результатов
+    
+    None = $VOICEBOX_CACHE_DIR/results или ~/.cache/voicebox/results
+    """
+    
+    cache_max_mb: int = 1024
+    """
+    Максимальный размер кэша результатов в мегабайтах
+    
+    При превышении удаляются давно не использованные записи.
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # ОПТИМИЗАЦИЯ ДЛЯ CPU
+    # ═══════════════════════════════════════════════════════════════════
+    
+    quantize: Optional[str] = None
+    """
+    Квантизация модели для инференса на CPU
+    
+    Варианты:
+    - None:   Полные fp32 веса (по умолчанию)
+    - "int8": Динамическая int8 квантизация линейных слоев
+    
+    Что это:
+    - Веса линейных слоев хранятся в int8, активации квантуются на лету
+    - Квантизованная модель кэшируется на диске (~/.cache/voicebox/quantized)
+    
+    Производительность:
+    - Скорость: обычно в 1.5-2.5 раза быстрее fp32 на CPU
+    - Память: веса линейных слоев меньше в ~4 раза
+    - Качество: небольшой рост WER (проверяйте benchmarks/bench_quantization.py)
+    
+    Примечание:
+    - Только для device="cpu" (или автоопределения без CUDA)
+    """
+    
+    num_threads: Optional[int] = None
+    """
+    Количество потоков PyTorch внутри операций (intra-op) на процесс
+    
+    None = автоматически: ядра делятся поровну между процессами
+    (parallel_workers), один процесс использует все доступные ядра.
+    
+    Рекомендации:
+    - Несколько задач одновременно: ядра / число задач
+    - Больше потоков чем ядер только замедляет работу
+    """
+    
+    num_interop_threads: Optional[int] = None
+    """
+    Количество потоков PyTorch между операциями (inter-op) на процесс
+    
+    None = 1 при нескольких процессах, иначе значение PyTorch по умолчанию.
+    Задается один раз за время жизни процесса.
+    """
+    
+    cpu_affinity: Optional[str] = None
+    """
+    Привязка процессов к ядрам CPU (Linux)
+    
+    Варианты:
+    - None:    Без привязки (по умолчанию)
+    - "auto":  Каждый процесс закрепляется за своей долей ядер
+    - "0-7,12": Использовать только эти ядра, поделив их между процессами
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # ОПРЕДЕЛЕНИЕ ЯЗЫКА
+    # ═══════════════════════════════════════════════════════════════════
+    
+    language_lock_after: Optional[int] = None
+    """
+    Фиксировать язык пакета после N файлов с одинаковым языком
+    
+    Работает только при language=None. Язык каждого файла определяется
+    один раз по первому окну и кэшируется по содержимому файла. Когда
+    N файлов пакета совпали по языку (и он преобладает), остальные файлы
+    обрабатываются с этим языком без повторного определения.
+    
+    None = определять язык для каждого файла.
+    
+    Рекомендации:
+    - Пакет записей из одного источника: 3-5
+    - Файлы на разных языках: None
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # ЗАГРУЗКА МОДЕЛИ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    mmap_model: bool = False
+    """
+    Загружать модель из снимка, отображаемого в память (mmap)
+    
+    При первом запуске веса сохраняются в снимок
+    ($VOICEBOX_CACHE_DIR/snapshots), далее модель загружается без
+    копирования весов. Несколько процессов на одной машине используют
+    одни и те же страницы памяти.
+    
+    Рекомендации:
+    - Короткие файлы из CLI: True (быстрый холодный старт)
+    - Параллельная обработка (parallel_workers > 1): True
+    - Снимок занимает в 2 раза больше места на диске (fp32)
+    - Не совместимо с quantize
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # ПРОПУСК ТИШИНЫ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    skip_silence: bool = False
+    """
+    Пропускать участки тишины перед декодированием
+    
+    Быстрый предварительный проход по энергии сигнала (NumPy) находит
+    участки со звуком; в модель попадают только они. Временные метки в
+    результате остаются относительно исходной записи.
+    
+    Рекомендации:
+    - Лекции, записи наблюдения, звонки с ожиданием: True
+    - Плотная речь без пауз: False (выигрыша нет)
+    
+    Примечание:
+    - no_speech_threshold продолжает работать для оставшихся участков
+    """
+    
+    silence_threshold_db: Optional[float] = None
+    """
+    Порог тишины в дБFS
+    
+    None = адаптивный: на 10 дБ выше уровня шума записи, но не выше -35.
+    
+    Примеры:
+    - -50: Тихие записи, сохранять даже очень тихую речь
+    - -35: Шумные записи
+    """
+    
+    min_silence_seconds: float = 1.0
+    """
+    Минимальная длина паузы, которая вырезается (секунды)
+    
+    Более короткие паузы остаются в аудио, чтобы не резать речь.
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # АДАПТИВНОЕ ДЕКОДИРОВАНИЕ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    adaptive_decoding: bool = False
+    """
+    Адаптивное декодирование: сначала жадный поиск, beam search — только
+    для окон с низкой уверенностью
+    
+    Каждое 30-секундное окно декодируется жадно. Если средняя
+    лог-вероятность ниже adaptive_logprob_threshold или коэффициент
+    сжатия выше adaptive_compression_ratio_threshold (зацикливание),
+    окно декодируется заново с beam_size.
+    
+    Рекомендации:
+    - CPU и чистая речь: True (в разы быстрее при том же качестве)
+    - Имеет смысл только при beam_size > 1
+    """
+    
+    adaptive_logprob_threshold: float = -0.8
+    """
+    Порог средней лог-вероятности окна для перехода на beam search
+    
+    Рекомендации:
+    - -1.0: Реже переходить на beam search (быстрее)
+    - -0.8: Стандарт
+    - -0.5: Чаще переходить на beam search (точнее)
+    """
+    
+    adaptive_compression_ratio_threshold: float = 2.2
+    """
+    Порог коэффициента сжатия текста окна для перехода на beam search
+    
+    Высокий коэффициент означает повторы ("галлюцинации" по кругу).
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # КАСКАД МОДЕЛЕЙ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    cascade: Optional["CascadeConfig"] = None
+    """
+    Каскад моделей: model_size размечает все аудио, точная модель
+    перераспознает только неуверенные сегменты
+    
+    None = каскад выключен. См. CascadeConfig и Presets.cascade().
+    """
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # СПЕКУЛЯТИВНОЕ ДЕКОДИРОВАНИЕ
+    # ═══════════════════════════════════════════════════════════════════
+    
+    draft_model: Optional[str] = None
+    """
+    Черновая модель для спекулятивного декодирования
+    
+    Маленькая модель предлагает несколько токенов, основная (model_size)
+    проверяет их за один проход декодера. Текст совпадает с жадным
+    декодированием основной модели, а проходов декодера меньше.
+    
+    Рекомендации:
+    - None: Выключено (по умолчанию)
+    - "tiny" / "base": Для medium и large (кроме large-v3)
+    - Требует beam_size=1 (жадное декодирование)
+    """
+    
+    draft_tokens: int = 4
+    """
+    Сколько токенов черновая модель предлагает за один шаг
+    
+    Рекомендации:
+    - 3-5: Стандарт
+    - Больше: Выгодно, если черновая модель часто угадывает
+    """
+    
     def __post_init__(self):
         """
         Валидация параметров после инициализации
@@ -292,11 +585,10 @@ class Config:
         # ПРОВЕРКА MODEL_SIZE
         # ═══════════════════════════════════════════════════════════════
         
-        valid_models = ['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3']
-        if self.model_size not in valid_models:
+        if self.model_size not in VALID_MODELS:
             raise ValueError(
                 f"Недопустимая модель '{self.model_size}'. "
-                f"Допустимые модели: {', '.join(valid_models)}"
+                f"Допустимые модели: {', '.join(VALID_MODELS)}"
             )
         
         # ═══════════════════════════════════════════════════════════════
@@ -339,6 +631,249 @@ class Config:
                 f"no_speech_threshold должен быть в диапазоне [0.0, 1.0], "
                 f"получено: {self.no_speech_threshold}"
             )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА ПАРАЛЛЕЛЬНОЙ ОБРАБОТКИ
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.parallel_workers < 1:
+            raise ValueError(
+                f"parallel_workers должен быть >= 1, "
+                f"получено: {self.parallel_workers}"
+            )
+        
+        if self.chunk_seconds <= 0:
+            raise ValueError(
+                f"chunk_seconds должен быть > 0, "
+                f"получено: {self.chunk_seconds}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА КЭША
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.cache_max_mb <= 0:
+            raise ValueError(
+                f"cache_max_mb должен быть > 0, "
+                f"получено: {self.cache_max_mb}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА QUANTIZE
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.quantize not in (None, "int8"):
+            raise ValueError(
+                f"quantize должен быть None или 'int8', "
+                f"получено: '{self.quantize}'"
+            )
+        
+        if self.quantize and self.device == "cuda":
+            raise ValueError(
+                "Квантизация int8 поддерживается только на CPU"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА ПОТОКОВ CPU
+        # ═══════════════════════════════════════════════════════════════
+        
+        for name in ('num_threads', 'num_interop_threads'):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(
+                    f"{name} должен быть >= 1, "
+                    f"получено: {value}"
+                )
+        
+        if self.cpu_affinity and self.cpu_affinity != "auto":
+            if not re.fullmatch(r"\d+(-\d+)?(,\d+(-\d+)?)*", self.cpu_affinity.replace(" ", "")):
+                raise ValueError(
+                    f"cpu_affinity должен быть 'auto' или списком ядер (например '0-7,12'), "
+                    f"получено: '{self.cpu_affinity}'"
+                )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА ОПРЕДЕЛЕНИЯ ЯЗЫКА
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.language_lock_after is not None and self.language_lock_after < 1:
+            raise ValueError(
+                f"language_lock_after должен быть >= 1, "
+                f"получено: {self.language_lock_after}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА ЗАГРУЗКИ МОДЕЛИ
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.mmap_model and self.quantize:
+            raise ValueError(
+                "mmap_model не совместим с квантизацией (quantize)"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА ПРОПУСКА ТИШИНЫ
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.min_silence_seconds <= 0:
+            raise ValueError(
+                f"min_silence_seconds должен быть > 0, "
+                f"получено: {self.min_silence_seconds}"
+            )
+        
+        if self.silence_threshold_db is not None and self.silence_threshold_db >= 0:
+            raise ValueError(
+                f"silence_threshold_db должен быть < 0 (дБFS), "
+                f"получено: {self.silence_threshold_db}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА АДАПТИВНОГО ДЕКОДИРОВАНИЯ
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.adaptive_logprob_threshold > 0:
+            raise ValueError(
+                f"adaptive_logprob_threshold должен быть <= 0, "
+                f"получено: {self.adaptive_logprob_threshold}"
+            )
+        
+        if self.adaptive_compression_ratio_threshold <= 0:
+            raise ValueError(
+                f"adaptive_compression_ratio_threshold должен быть > 0, "
+                f"получено: {self.adaptive_compression_ratio_threshold}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА КАСКАДА
+        # ═══════════════════════════════════════════════════════════════
+        
+        if isinstance(self.cascade, dict):
+            # asdict() превращает вложенный CascadeConfig в словарь
+            self.cascade = CascadeConfig(**self.cascade)
+        
+        if self.cascade is not None and self.cascade.accurate_model == self.model_size:
+            raise ValueError(
+                f"Точная модель каскада совпадает с model_size: '{self.model_size}'"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ПРОВЕРКА СПЕКУЛЯТИВНОГО ДЕКОДИРОВАНИЯ
+        # ═══════════════════════════════════════════════════════════════
+        
+        if self.draft_model is not None:
+            if self.draft_model not in VALID_MODELS:
+                raise ValueError(
+                    f"Недопустимая черновая модель '{self.draft_model}'. "
+                    f"Допустимые модели: {', '.join(VALID_MODELS)}"
+                )
+            if self.draft_model == self.model_size:
+                raise ValueError(
+                    f"Черновая модель совпадает с model_size: '{self.model_size}'"
+                )
+            if self.beam_size > 1:
+                raise ValueError(
+                    "Спекулятивное декодирование повторяет жадный поиск: "
+                    f"нужен beam_size=1, получено: {self.beam_size}"
+                )
+        
+        if self.draft_tokens < 1:
+            raise ValueError(
+                f"draft_tokens должен быть >= 1, "
+                f"получено: {self.draft_tokens}"
+            )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# КАСКАД МОДЕЛЕЙ
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class CascadeConfig:
+    """
+    Настройки каскада моделей
+    
+    Быстрая модель (Config.model_size, например tiny/base) распознает
+    все аудио. Сегменты с низкой уверенностью перераспознаются точной
+    моделью (например medium/large), и ее текст подставляется в результат.
+    
+    Attributes:
+        accurate_model: Точная модель для неуверенных сегментов
+        logprob_threshold: Порог avg_logprob сегмента
+        compression_ratio_threshold: Порог коэффициента сжатия сегмента
+        padding_seconds: Запас аудио вокруг перераспознаваемого участка
+        beam_size: Размер луча точной модели
+    
+    Example:
+        >>> config = Config(model_size="base", cascade=CascadeConfig(accurate_model="large-v3"))
+    """
+    
+    accurate_model: str = "medium"
+    """
+    Точная модель, которая запускается только на неуверенных сегментах
+    """
+    
+    logprob_threshold: float = -0.7
+    """
+    Сегменты быстрой модели с avg_logprob ниже порога перераспознаются
+    
+    Рекомендации:
+    - -1.0: Перераспознавать только явно плохие сегменты (дешевле)
+    - -0.7: Стандарт
+    - -0.4: Перераспознавать большую часть (дороже, точнее)
+    """
+    
+    compression_ratio_threshold: float = 2.2
+    """
+    Сегменты с коэффициентом сжатия выше порога (повторы) перераспознаются
+    """
+    
+    padding_seconds: float = 0.5
+    """
+    Запас аудио (секунды) с каждой стороны перераспознаваемого участка,
+    чтобы не обрезать слова на границах
+    """
+    
+    beam_size: int = 5
+    """
+    Размер луча для точной модели (быстрая использует Config.beam_size)
+    """
+    
+    def __post_init__(self):
+        """
+        Валидация параметров каскада
+        
+        Raises:
+            ValueError: Если какой-то параметр некорректный
+        """
+        if self.accurate_model not in VALID_MODELS:
+            raise ValueError(
+                f"Недопустимая модель '{self.accurate_model}'. "
+                f"Допустимые модели: {', '.join(VALID_MODELS)}"
+            )
+        
+        if self.logprob_threshold > 0:
+            raise ValueError(
+                f"logprob_threshold должен быть <= 0, "
+                f"получено: {self.logprob_threshold}"
+            )
+        
+        if self.compression_ratio_threshold <= 0:
+            raise ValueError(
+                f"compression_ratio_threshold должен быть > 0, "
+                f"получено: {self.compression_ratio_threshold}"
+            )
+        
+        if self.padding_seconds < 0:
+            raise ValueError(
+                f"padding_seconds должен быть >= 0, "
+                f"получено: {self.padding_seconds}"
+            )
+        
+        if self.beam_size < 1:
+            raise ValueError(
+                f"beam_size должен быть >= 1, "
+                f"получено: {self.beam_size}"
+            )
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -359,6 +894,8 @@ class Presets:
     - accurate():  Максимальное качество (медленно)
     - russian():   Оптимизировано для русского языка
     - english():   Оптимизировано для английского языка
+    - cascade():   Каскад быстрой и точной моделей
+    - speculative(): Спекулятивное декодирование с черновой моделью
     
     Example:
         >>> config = Presets.russian()
@@ -533,6 +1070,72 @@ class Presets:
             beam_size=5,
             condition_on_previous_text=True
         )
+    
+    @staticmethod
+    def cascade(fast_model: str = "base", accurate_model: str = "large-v3"):
+        """
+        Каскад моделей: быстрая размечает, точная исправляет
+        
+        Использует:
+        - Модель: base (распознает все аудио)
+        - Точная модель: large-v3 (только неуверенные сегменты)
+        - Beam size: 1 для быстрой модели (greedy)
+        
+        Подходит для:
+        - Больших объемов, где large на всем аудио слишком дорог
+        - Записей, где одной base недостаточно
+        
+        Производительность:
+        - Скорость: ⚡⚡ (зависит от доли неуверенных сегментов)
+        - Качество: ⭐⭐⭐⭐ (близко к точной модели)
+        - Память: обе модели (до 10 GB)
+        
+        Args:
+            fast_model: Быстрая модель
+            accurate_model: Точная модель
+        
+        Returns:
+            Config: Конфигурация с каскадом моделей
+        """
+        return Config(
+            model_size=fast_model,
+            beam_size=1,
+            best_of=1,
+            cascade=CascadeConfig(accurate_model=accurate_model)
+        )
+
+    @staticmethod
+    def speculative(model: str = "large-v2", draft_model: str = "base"):
+        """
+        Спекулятивное декодирование: черновая модель предлагает токены
+
+        Использует:
+        - Модель: large-v2 (проверяет и определяет текст)
+        - Черновая модель: base (предлагает по 4 токена)
+        - Beam size: 1 (greedy)
+
+        Подходит для:
+        - CPU, где декодер large работает медленно
+        - Когда нужен результат жадного декодирования большой модели
+
+        Производительность:
+        - Скорость: ⚡⚡ (зависит от доли угаданных токенов)
+        - Качество: ⭐⭐⭐⭐ (как greedy основной модели)
+        - Память: обе модели
+
+        Args:
+            model: Основная модель
+            draft_model: Черновая модель (тот же словарь и число мел-полос)
+
+        Returns:
+            Config: Конфигурация со спекулятивным декодированием
+        """
+        return Config(
+            model_size=model,
+            beam_size=1,
+            best_of=1,
+            draft_model=draft_model
+        )
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -0,0 +1,105 @@
+"""CPU thread and core-affinity policy for inference workers.
+
+PyTorch sizes its intra-op pool to every core of the machine. When
+several transcriptions run at once (parallel chunks, concurrent GUI
+jobs) each of them does so, the cores get oversubscribed and throughput
+collapses. :func:`plan_workers` splits the available cores evenly between
+workers and :func:`apply_thread_plan` applies one share to the current
+process.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import os
+
+_interop_configured = False
+
+
+@dataclass
+class ThreadPlan:
+    """Thread counts and optional core pinning for one worker process."""
+
+    intra_op: int
+    inter_op: Optional[int] = None
+    cores: Optional[List[int]] = None
+
+
+def available_cores() -> List[int]:
+    """Return the cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cores(spec: str) -> List[int]:
+    """Parse a core list such as ``"0-3,6,8-9"``."""
+    cores: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-", 1)
+            cores.extend(range(int(low), int(high) + 1))
+        else:
+            cores.append(int(part))
+    if not cores:
+        raise ValueError(f"Пустой список ядер: '{spec}'")
+    return sorted(set(cores))
+
+
+def plan_workers(
+    workers: int,
+    intra_op: Optional[int] = None,
+    inter_op: Optional[int] = None,
+    affinity: Optional[str] = None,
+) -> List[ThreadPlan]:
+    """Split the cores evenly between ``workers`` processes.
+
+    Args:
+        workers: Number of concurrent inference workers.
+        intra_op: Threads per worker; ``None`` gives each worker its share
+            of the cores.
+        inter_op: Inter-op threads per worker; ``None`` uses 1 when several
+            workers run and PyTorch's default otherwise.
+        affinity: ``None`` (no pinning), ``"auto"`` (pin each worker to its
+            share of the available cores) or an explicit core list
+            (``"0-7"``) that is split between the workers and pinned.
+    """
+    workers = max(1, workers)
+    cores: Sequence[int] = available_cores() if affinity in (None, "auto") else parse_cores(affinity)
+    share = max(1, len(cores) // workers)
+    plans = []
+    for index in range(workers):
+        start = (index * share) % len(cores)
+        worker_cores = list(cores[start:start + share]) or list(cores)
+        plans.append(
+            ThreadPlan(
+                intra_op=intra_op or len(worker_cores),
+                inter_op=inter_op if inter_op is not None else (1 if workers > 1 else None),
+                cores=worker_cores if affinity else None,
+            )
+        )
+    return plans
+
+
+def apply_thread_plan(plan: ThreadPlan) -> None:
+    """Apply ``plan`` to the current process.
+
+    PyTorch only accepts the inter-op thread count before the first
+    parallel operation, so it is set once per process and later requests
+    are ignored.
+    """
+    global _interop_configured
+    import torch
+
+    if plan.cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, plan.cores)
+    torch.set_num_threads(max(1, plan.intra_op))
+    if plan.inter_op is not None and not _interop_configured:
+        try:
+            torch.set_num_interop_threads(max(1, plan.inter_op))
+        except RuntimeError:
+            pass
+        _interop_configured = True
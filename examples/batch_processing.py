@@ -3,11 +3,14 @@ from transcriber import Transcriber
 
 
 def main() -> None:
-    transcriber = Transcriber(model_size="base")
+    transcriber = Transcriber(model_size="base", language_lock_after=3)
     files = ["audio1.wav", "audio2.wav"]
     outputs = transcriber.batch_transcribe(files, output_dir="outputs")
     for path in outputs:
         print(f"Сохранено: {path}")
+    print(f"Загрузка стадий: {transcriber.last_batch_report.utilization()}")
+    stats = transcriber.language_stats
+    print(f"Определений языка: {stats['detections']}, сэкономлено: {stats['saved_seconds']:.1f} с")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""On-disk cache of audio tracks extracted from videos.
+
+Subtitle and transcription runs on the same video used to decode its
+audio again every time. Entries are WAV files keyed by a fingerprint of
+the source (size, modification time and a hash of its first and last
+MiB) combined with the output parameters (codec, channels, rate), so a
+changed source or different parameters never hit a stale entry. The
+oldest-used entries are removed once the cache exceeds its size limit.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import os
+
+from cache_store import ContentStore, cache_root, shared_store
+
+#: Bump when the stored entry layout changes.
+CACHE_FORMAT = 1
+
+#: Default size limit of the cache directory (MiB).
+DEFAULT_CACHE_MAX_MB = 4096
+
+#: Bytes hashed at each end of the source for its fingerprint.
+FINGERPRINT_SAMPLE_BYTES = 1 << 20
+
+
+def default_cache_dir() -> Path:
+    """Return ``$VOICEBOX_CACHE_DIR/audio`` or ``~/.cache/voicebox/audio``."""
+    return cache_root() / "audio"
+
+
+def fingerprint(path: Path) -> str:
+    """Return a cheap content fingerprint of ``path``.
+
+    Hashing a multi-gigabyte video would cost nearly as much as decoding
+    it, so only the size, the modification time and both ends of the file
+    are hashed.
+    """
+    stat = Path(path).stat()
+    digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with Path(path).open("rb") as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if stat.st_size > 2 * FINGERPRINT_SAMPLE_BYTES:
+            f.seek(-FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+class ExtractionCache(ContentStore):
+    """Size-bounded LRU cache of extracted WAV files.
+
+    Args:
+        directory: Where entries are stored.
+        max_bytes: Size limit; least recently used entries are evicted
+            after each write that exceeds it.
+    """
+
+    suffix = ".wav"
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024) -> None:
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def make_key(source: Path, fields: Dict[str, Any]) -> str:
+        """Combine the source fingerprint and output fields into a cache key."""
+        payload = json.dumps({"format": CACHE_FORMAT, "fields": fields}, sort_keys=True)
+        return f"{fingerprint(source)}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file for ``key`` or ``None``."""
+        path = self._touch(key)
+        self._count(hit=path is not None)
+        return path
+
+    def put(self, key: str, write: Callable[[Path], None]) -> Path:
+        """Store the file ``write`` produces atomically and enforce the size limit.
+
+        ``write`` receives a temporary path in the cache directory; the
+        entry only appears once it returns, so readers never see a partial
+        file.
+        """
+        return self._write(key, write)
+
+    def invalidate(self, source: Path) -> int:
+        """Delete every entry of ``source``. Returns the number removed."""
+        paths = self._entries(f"{fingerprint(source)}-*")
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
+
+
+def get_extraction_cache(
+    directory: Optional[str | Path] = None, max_mb: int = DEFAULT_CACHE_MAX_MB
+) -> ExtractionCache:
+    """Return the shared :class:`ExtractionCache` for ``directory``."""
+    return shared_store(ExtractionCache, directory or default_cache_dir(), max_mb)
+
+
+def default_extraction_cache(enabled: bool = False) -> Optional[ExtractionCache]:
+    """Return the cache the CLI and GUIs use, or ``None`` when it is off.
+
+    The cache is opt-in: every miss writes a full PCM copy of the track,
+    which only pays off for sources decoded again and again (videos). It
+    is used when ``enabled`` is true or ``VOICEBOX_AUDIO_CACHE=1``.
+    """
+    if not enabled and os.environ.get("VOICEBOX_AUDIO_CACHE") != "1":
+        return None
+    return get_extraction_cache()
@@ -7,9 +7,10 @@ from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 
 from audio_analyzer import analyse_file, render_report
-from subtitle_generator import generate_subtitles
 from summarizer import summarise_to_file
-from transcriber import Transcriber
+
+# Transcription pulls in torch and Whisper; it is imported on first use so
+# the summary and analysis tabs open instantly.
 
 
 class MegaApp(tk.Tk):
@@ -96,11 +97,17 @@ class MegaApp(tk.Tk):
     def _run_transcription(self) -> None:
         try:
             self.transcribe_status.config(text="Обработка...", fg="blue")
+            from extraction_cache import default_extraction_cache
+            from transcriber import Transcriber
+            from video_processor import extract_audio_array
+
             transcriber = Transcriber(
                 model_size=self.model_var.get() or "base",
                 language=self.language_var.get() or None,
             )
-            result = transcriber.transcribe(self.input_var.get())
+            source = self.input_var.get()
+            cache = default_extraction_cache()
+            result = transcriber.transcribe(extract_audio_array(source, cache=cache) if cache is not None else source)
             output = Path(self.input_var.get()).with_suffix(".txt")
             transcriber.save_output(result, output)
             self.transcribe_status.config(text=f"Готово: {output}", fg="green")
@@ -117,6 +124,8 @@ class MegaApp(tk.Tk):
     def _run_subtitles(self) -> None:
         try:
             self.subtitle_status.config(text="Создание субтитров...", fg="blue")
+            from subtitle_generator import generate_subtitles
+
             output = generate_subtitles(self.subtitle_input.get(), format="srt", model_size=self.model_var.get() or "base")
             self.subtitle_status.config(text=f"Готово: {output}", fg="green")
         except Exception as exc:  # noqa: BLE001
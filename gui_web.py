@@ -1,20 +1,121 @@
-"""Gradio interface for VOICEBOX."""
+"""Gradio interface for VOICEBOX.
+
+The UI is mounted on a FastAPI app next to a Prometheus ``/metrics``
+endpoint (see :mod:`metrics`) exposing queue depth, running jobs,
+per-job latency, processed bytes and the model cache state.
+"""
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List
+import os
+import threading
+import time
+
 import gradio as gr
 
+from metrics import CONTENT_TYPE, get_metrics, model_registry_collector
+from model_registry import get_model_registry
 from transcriber import Transcriber
+from utils import TranscriptSegment
+from video_processor import stream_audio
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-def transcribe_file(file_path: str, model_size: str, language: str) -> tuple[str, str]:
-    if not file_path:
-        return "", "Файл не выбран"
-    transcriber = Transcriber(model_size=model_size or "base", language=language or None)
-    result = transcriber.transcribe(file_path)
+#: Transcriptions running at once; further requests wait in the queue.
+MAX_CONCURRENT_JOBS = max(1, int(os.environ.get("VOICEBOX_WEB_JOBS", "1")))
+
+_metrics = get_metrics()
+REQUESTS = _metrics.counter(
+    "voicebox_transcribe_requests_total", "transcribe_file jobs by model and outcome", ("model", "status")
+)
+LATENCY = _metrics.histogram(
+    "voicebox_transcribe_seconds", "Duration of transcribe_file jobs without queueing", ("model",)
+)
+FIRST_SEGMENT = _metrics.histogram(
+    "voicebox_transcribe_first_segment_seconds", "Time from job start to the first segment", ("model",)
+)
+QUEUE_WAIT = _metrics.histogram(
+    "voicebox_transcribe_queue_seconds",
+    "Time jobs waited for a free slot",
+    ("model",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+QUEUE_DEPTH = _metrics.gauge("voicebox_transcribe_queue_depth", "Jobs waiting for a free slot")
+ACTIVE_JOBS = _metrics.gauge("voicebox_transcribe_active_jobs", "Jobs being transcribed")
+INPUT_BYTES = _metrics.counter("voicebox_input_bytes_total", "Bytes of uploaded files processed", ("model",))
+AUDIO_SECONDS = _metrics.counter("voicebox_audio_seconds_total", "Seconds of audio transcribed", ("model",))
+MODEL_LOAD = _metrics.histogram(
+    "voicebox_model_load_seconds",
+    "Duration of model loads into the registry",
+    ("model", "device", "precision"),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+QUEUE_DEPTH.set(0)
+ACTIVE_JOBS.set(0)
+_metrics.add_collector(model_registry_collector(get_model_registry()))
+get_model_registry().load_listeners.append(
+    lambda key, seconds: MODEL_LOAD.observe(seconds, **dict(zip(("model", "device", "precision"), map(str, key))))
+)
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+
+
+def _stream(file_path: str, model_size: str, language: str) -> Iterator[tuple[str, str]]:
+    transcriber = Transcriber(model_size=model_size, language=language or None)
+    started = time.perf_counter()
+    segments: List[TranscriptSegment] = []
+    # Uploads are decoded block by block, so long videos never sit in memory whole.
+    # No audio cache: every upload is a fresh temporary copy, so its
+    # fingerprint (which includes the modification time) never repeats.
+    for segment in transcriber.transcribe_stream(stream_audio(file_path)):
+        if not segments:
+            FIRST_SEGMENT.observe(time.perf_counter() - started, model=model_size)
+        segments.append(segment)
+        yield " ".join(s.text for s in segments), f"Обработано до {segment.end:.0f} с..."
     output_path = Path(file_path).with_suffix(".txt")
-    transcriber.save_output(result, output_path)
-    return result.get("text", ""), f"Сохранено: {output_path}"
+    transcriber.save_output(segments, output_path)
+    AUDIO_SECONDS.inc(transcriber.last_stream_stats.get("audio_seconds", 0.0), model=model_size)
+    first = transcriber.last_stream_stats.get("time_to_first_segment")
+    latency = f" (первый сегмент через {first:.1f} с)" if first is not None else ""
+    yield " ".join(s.text for s in segments), f"Сохранено: {output_path}{latency}"
+
+
+def transcribe_file(file_path: str, model_size: str, language: str) -> Iterator[tuple[str, str]]:
+    """Stream partial text to the UI while segments are being decoded.
+
+    At most ``MAX_CONCURRENT_JOBS`` jobs run at once; the others wait for
+    a slot and are counted in the queue depth.
+    """
+    if not file_path:
+        yield "", "Файл не выбран"
+        return
+    model_size = model_size or "base"
+    queued = time.perf_counter()
+    QUEUE_DEPTH.inc()
+    try:
+        if not _slots.acquire(blocking=False):
+            yield "", "Ожидание в очереди..."
+            _slots.acquire()
+    finally:
+        QUEUE_DEPTH.dec()
+    QUEUE_WAIT.observe(time.perf_counter() - queued, model=model_size)
+
+    status = "error"
+    started = time.perf_counter()
+    try:
+        with ACTIVE_JOBS.track():
+            INPUT_BYTES.inc(Path(file_path).stat().st_size, model=model_size)
+            yield from _stream(file_path, model_size, language)
+        status = "ok"
+    except GeneratorExit:
+        status = "cancelled"
+        raise
+    finally:
+        _slots.release()
+        REQUESTS.inc(model=model_size, status=status)
+        LATENCY.observe(time.perf_counter() - started, model=model_size)
 
 
 def build_interface() -> gr.Blocks:
@@ -33,12 +134,38 @@ def build_interface() -> gr.Blocks:
             with gr.Column():
                 output = gr.Textbox(label="Результат", lines=12)
                 status = gr.Markdown()
-        run.click(transcribe_file, inputs=[audio, model_size, language], outputs=[output, status])
+        # Concurrency is limited by ``transcribe_file`` itself, so waiting
+        # jobs are visible in the metrics.
+        run.click(
+            transcribe_file,
+            inputs=[audio, model_size, language],
+            outputs=[output, status],
+            concurrency_limit=None,
+        )
     return demo
 
 
+def create_app() -> "FastAPI":
+    """Return the FastAPI app serving the UI on ``/`` and metrics on ``/metrics``."""
+    from fastapi import FastAPI, Response
+
+    app = FastAPI(title="VOICEBOX")
+
+    @app.get("/metrics")
+    def metrics_endpoint() -> Response:
+        return Response(get_metrics().render(), media_type=CONTENT_TYPE)
+
+    return gr.mount_gradio_app(app, build_interface(), path="/")
+
+
 def main() -> None:
-    build_interface().launch()
+    import uvicorn
+
+    uvicorn.run(
+        create_app(),
+        host=os.environ.get("GRADIO_SERVER_NAME", "127.0.0.1"),
+        port=int(os.environ.get("GRADIO_SERVER_PORT", "7860")),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+"""Per-stage timing of transcription jobs.
+
+:class:`JobTimings` is the structured timing record of one
+:meth:`transcriber.Transcriber.transcribe` call. Stages are measured
+where they happen:
+
+* ``model_load``, ``audio_decode`` (FFmpeg / in-memory decoding),
+  ``cache_lookup``, ``silence_scan``, ``language_detect``, ``cascade``
+  and ``output_write`` by :class:`~transcriber.Transcriber` itself;
+* ``mel``, ``encoder`` and ``decoder`` inside ``whisper.transcribe`` by
+  :func:`instrument_model`, which times the mel spectrogram, hooks the
+  audio encoder and wraps ``model.decode`` (decoder time is the decode
+  time minus the encoder pass, so beam search, adaptive and speculative
+  decoding are all covered);
+* ``inference`` for chunked parallel runs, whose workers are not
+  instrumented individually.
+
+Every finished measurement is also passed to the stage callbacks, e.g.
+for live progress or an external metrics sink.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
+import functools
+import importlib
+import sys
+import threading
+import time
+
+if TYPE_CHECKING:
+    import whisper
+
+#: Called with the stage name and its duration in seconds.
+StageCallback = Callable[[str, float], None]
+
+#: Display order of the known stages.
+STAGES = (
+    "model_load",
+    "audio_decode",
+    "cache_lookup",
+    "silence_scan",
+    "language_detect",
+    "mel",
+    "encoder",
+    "decoder",
+    "inference",
+    "cascade",
+    "output_write",
+)
+
+STAGE_LABELS = {
+    "model_load": "Загрузка модели",
+    "audio_decode": "Декодирование аудио",
+    "cache_lookup": "Поиск в кэше",
+    "silence_scan": "Поиск тишины",
+    "language_detect": "Определение языка",
+    "mel": "Мел-спектрограмма",
+    "encoder": "Энкодер",
+    "decoder": "Декодер",
+    "inference": "Инференс (параллельно)",
+    "cascade": "Каскад",
+    "output_write": "Запись результата",
+}
+
+_local = threading.local()
+_install_lock = threading.Lock()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the peak resident memory of this process in MB.
+
+    ``None`` where the ``resource`` module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _cuda() -> Any:
+    # torch is only consulted when it is already loaded and CUDA is in use.
+    torch = sys.modules.get("torch")
+    if torch is None or not torch.cuda.is_available() or not torch.cuda.is_initialized():
+        return None
+    return torch.cuda
+
+
+class JobTimings:
+    """Timing record of one transcription job.
+
+    Stage durations accumulate (the encoder runs once per window), so
+    ``calls`` counts how often each stage ran.
+    """
+
+    def __init__(self, callbacks: Sequence[StageCallback] = ()) -> None:
+        self.stages: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.callbacks: List[StageCallback] = list(callbacks)
+        self.audio_seconds = 0.0
+        self.tokens = 0
+        self.total_seconds = 0.0
+        self._started = time.perf_counter()
+        self._finished = False
+        cuda = _cuda()
+        if cuda is not None:
+            cuda.reset_peak_memory_stats()
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        """Record ``seconds`` spent in ``stage`` and notify the callbacks."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + calls
+        if self._finished:
+            self.total_seconds += seconds
+        for callback in self.callbacks:
+            callback(stage, seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body of the ``with`` block as stage ``name``."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - begin)
+
+    def finish(self) -> None:
+        """Stop the job clock; later stages (output writing) extend it."""
+        if not self._finished:
+            self.total_seconds = time.perf_counter() - self._started
+            self._finished = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record with real-time factor, tokens/sec and peak memory.
+
+        ``real_time_factor`` is processing time divided by audio duration
+        (below 1 is faster than real time); ``tokens_per_second`` is the
+        decoder throughput; ``other`` is time outside the measured stages.
+        """
+        total = self.total_seconds if self._finished else time.perf_counter() - self._started
+        order = [stage for stage in STAGES if stage in self.stages]
+        order += sorted(set(self.stages) - set(order))
+        stages = {stage: round(self.stages[stage], 4) for stage in order}
+        stages["other"] = round(max(0.0, total - sum(self.stages.values())), 4)
+        decoder = self.stages.get("decoder", 0.0)
+        cuda = _cuda()
+        return {
+            "total_seconds": round(total, 3),
+            "audio_seconds": round(self.audio_seconds, 3),
+            "real_time_factor": round(total / self.audio_seconds, 4) if self.audio_seconds else None,
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens / decoder, 1) if decoder else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "cuda_peak_mb": round(cuda.max_memory_allocated() / 2**20, 1) if cuda is not None else None,
+            "stages": stages,
+            "calls": {stage: self.calls[stage] for stage in order},
+        }
+
+
+def _install_mel_probe() -> None:
+    # ``whisper.transcribe`` imports ``log_mel_spectrogram`` by name; it is
+    # replaced once by a wrapper that reports to the job timed on the
+    # current thread and is a plain pass-through otherwise.
+    module = importlib.import_module("whisper.transcribe")
+    with _install_lock:
+        original = module.log_mel_spectrogram
+        if getattr(original, "_timed", False):
+            return
+
+        @functools.wraps(original)
+        def log_mel_spectrogram(*args: Any, **kwargs: Any) -> Any:
+            timings: Optional[JobTimings] = getattr(_local, "timings", None)
+            if timings is None:
+                return original(*args, **kwargs)
+            with timings.stage("mel"):
+                return original(*args, **kwargs)
+
+        log_mel_spectrogram._timed = True  # type: ignore[attr-defined]
+        module.log_mel_spectrogram = log_mel_spectrogram
+
+
+@contextmanager
+def instrument_model(model: "whisper.model.Whisper", timings: JobTimings) -> Iterator[None]:
+    """Record mel, encoder and decoder time of ``model`` into ``timings``.
+
+    Must be entered while holding the model's inference lock and after
+    other ``model.decode`` wrappers, so the decoder time covers them.
+    """
+    _install_mel_probe()
+    encoder = {"seconds": 0.0, "begin": 0.0}
+
+    def synchronize(inputs: Any) -> None:
+        # CUDA kernels run asynchronously; wait for them to get wall time.
+        tensor = inputs[0] if isinstance(inputs, tuple) else inputs
+        if getattr(tensor, "is_cuda", False):
+            _cuda().synchronize()
+
+    def before_encoder(module: Any, inputs: Any) -> None:
+        synchronize(inputs)
+        encoder["begin"] = time.perf_counter()
+
+    def after_encoder(module: Any, inputs: Any, output: Any) -> None:
+        synchronize(output)
+        elapsed = time.perf_counter() - encoder["begin"]
+        encoder["seconds"] += elapsed
+        timings.add("encoder", elapsed)
+
+    original = model.decode
+    shadowed = "decode" in vars(model)
+
+    def decode(mel: Any, options: Any) -> Any:
+        encoded = encoder["seconds"]
+        begin = time.perf_counter()
+        result = original(mel, options)
+        elapsed = time.perf_counter() - begin
+        timings.add("decoder", max(0.0, elapsed - (encoder["seconds"] - encoded)))
+        for item in result if isinstance(result, list) else [result]:
+            timings.tokens += len(item.tokens) + 1  # end-of-text included
+        return result
+
+    handles = [
+        model.encoder.register_forward_pre_hook(before_encoder),
+        model.encoder.register_forward_hook(after_encoder),
+    ]
+    previous = getattr(_local, "timings", None)
+    _local.timings = timings
+    model.decode = decode
+    try:
+        yield
+    finally:
+        _local.timings = previous
+        for handle in handles:
+            handle.remove()
+        if shadowed:
+            model.decode = original
+        else:
+            del model.decode
+
+
+def format_timings(record: Dict[str, Any]) -> str:
+    """Render :meth:`JobTimings.as_dict` as a table for the CLI."""
+    lines = ["Этапы:"]
+    total = record["total_seconds"] or 1.0
+    for stage, seconds in record["stages"].items():
+        label = STAGE_LABELS.get(stage, "Прочее" if stage == "other" else stage)
+        calls = record["calls"].get(stage, 0)
+        suffix = f"  ×{calls}" if calls > 1 else ""
+        lines.append(f"  {label:<24}{seconds:>9.3f} с  {seconds / total:>6.1%}{suffix}")
+    lines.append(f"Всего: {record['total_seconds']:.3f} с, аудио: {record['audio_seconds']:.1f} с")
+    if record["real_time_factor"] is not None:
+        lines.append(f"RTF: {record['real_time_factor']:.3f}")
+    if record["tokens_per_second"] is not None:
+        lines.append(f"Токенов: {record['tokens']} ({record['tokens_per_second']} токенов/с)")
+    if record["peak_rss_mb"] is not None:
+        lines.append(f"Пиковая память процесса: {record['peak_rss_mb']} МБ")
+    if record["cuda_peak_mb"] is not None:
+        lines.append(f"Пиковая память CUDA: {record['cuda_peak_mb']} МБ")
+    return "\n".join(lines)
@@ -0,0 +1,145 @@
+"""Persistent checkpoint manifest for resumable batch jobs.
+
+Every input of a batch is tracked in a small SQLite database with its
+state (``pending``, ``running``, ``done`` or ``failed``), output path,
+timings and last error. Each update is a single SQLite transaction, so a
+crash or kill never leaves the manifest half-written. Rerunning the same
+batch skips inputs that are ``done`` (and whose output still exists) and
+retries everything else.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import sqlite3
+import threading
+import time
+
+#: File name used when the manifest lives next to the batch outputs.
+MANIFEST_NAME = "voicebox_manifest.sqlite3"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    input TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    output TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started REAL,
+    finished REAL,
+    timings TEXT,
+    error TEXT
+)
+"""
+
+
+class JobManifest:
+    """SQLite-backed record of batch item states.
+
+    The manifest may be updated from several pipeline threads; access is
+    serialised with a lock.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> "JobManifest":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def register(self, inputs: List[str]) -> None:
+        """Add inputs as ``pending`` unless they are already tracked."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (input, state) VALUES (?, ?)",
+                [(item, PENDING) for item in inputs],
+            )
+
+    def get(self, item: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record of ``item`` or ``None``."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT input, state, output, attempts, started, finished, timings, error "
+                "FROM items WHERE input = ?",
+                (item,),
+            )
+            row = cursor.fetchone()
+        return self._record(row) if row else None
+
+    def completed_output(self, item: str) -> Optional[Path]:
+        """Return the output of a finished item if it still exists on disk."""
+        record = self.get(item)
+        if record is None or record["state"] != DONE or not record["output"]:
+            return None
+        output = Path(record["output"])
+        return output if output.is_file() else None
+
+    def mark_running(self, item: str) -> None:
+        self._execute(
+            "INSERT INTO items (input, state, attempts, started) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT(input) DO UPDATE SET state = excluded.state, "
+            "attempts = items.attempts + 1, started = excluded.started, "
+            "finished = NULL, error = NULL",
+            (item, RUNNING, time.time()),
+        )
+
+    def mark_done(self, item: str, output: str | Path, timings: Dict[str, Any]) -> None:
+        self._execute(
+            "UPDATE items SET state = ?, output = ?, finished = ?, timings = ?, error = NULL "
+            "WHERE input = ?",
+            (DONE, str(output), time.time(), json.dumps(timings), item),
+        )
+
+    def mark_failed(self, item: str, error: str, timings: Optional[Dict[str, Any]] = None) -> None:
+        self._execute(
+            "UPDATE items SET state = ?, finished = ?, timings = ?, error = ? WHERE input = ?",
+            (FAILED, time.time(), json.dumps(timings or {}), error, item),
+        )
+
+    def items(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return every record, optionally filtered by ``state``."""
+        query = "SELECT input, state, output, attempts, started, finished, timings, error FROM items"
+        params: tuple = ()
+        if state is not None:
+            query += " WHERE state = ?"
+            params = (state,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def summary(self) -> Dict[str, int]:
+        """Return the number of items per state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    @staticmethod
+    def _record(row: tuple) -> Dict[str, Any]:
+        keys = ("input", "state", "output", "attempts", "started", "finished", "timings", "error")
+        record = dict(zip(keys, row))
+        record["timings"] = json.loads(record["timings"]) if record["timings"] else {}
+        return record
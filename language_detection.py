@@ -0,0 +1,128 @@
+"""Language detection fast path for repeated and batched inputs.
+
+With ``language=None`` Whisper detects the language of every file from its
+first 30-second window: one encoder pass plus a decoder step per file.
+This module runs that detection itself so the answer can be reused:
+
+* :class:`LanguageCache` remembers the detected language per model and
+  content hash, so a file seen again (re-run, different output format)
+  skips detection;
+* :class:`BatchLanguagePolicy` locks a batch to its dominant language once
+  ``agree_after`` files agreed on it, so the remaining files skip
+  detection entirely.
+"""
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+import threading
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import whisper
+
+#: Detected languages kept in the process-wide cache.
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def detect_language(model: "whisper.model.Whisper", audio: np.ndarray) -> Tuple[str, float]:
+    """Detect the language of the first window of ``audio``.
+
+    Mirrors what ``whisper.transcribe`` does when no language is given and
+    returns the language code with its probability.
+    """
+    import whisper
+    from whisper.audio import N_FRAMES, N_SAMPLES
+
+    mel = whisper.log_mel_spectrogram(audio[:N_SAMPLES], model.dims.n_mels, padding=N_SAMPLES)
+    mel = whisper.pad_or_trim(mel, N_FRAMES).to(model.device)
+    _, probs = model.detect_language(mel)
+    language = max(probs, key=probs.get)
+    return language, float(probs[language])
+
+
+@dataclass
+class DetectedLanguage:
+    language: str
+    probability: float
+
+
+class LanguageCache:
+    """Thread-safe LRU map from ``(model, content digest)`` to detected language.
+
+    Models of different sizes can disagree on a language, so the model is
+    part of the key.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], DetectedLanguage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: str, digest: str) -> Optional[DetectedLanguage]:
+        key = (model, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, model: str, digest: str, language: str, probability: float) -> None:
+        key = (model, digest)
+        with self._lock:
+            self._entries[key] = DetectedLanguage(language, probability)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class BatchLanguagePolicy:
+    """Reuse the dominant language of a batch after ``agree_after`` files.
+
+    The language is locked once it was detected at least ``agree_after``
+    times and more often than all other languages together, so a single
+    misdetection does not lock the wrong language.
+    """
+
+    def __init__(self, agree_after: int) -> None:
+        self.agree_after = max(1, agree_after)
+        self.counts: Counter = Counter()
+        self.language: Optional[str] = None
+
+    def observe(self, language: Optional[str]) -> None:
+        if self.language is not None or not language:
+            return
+        self.counts[language] += 1
+        dominant, count = self.counts.most_common(1)[0]
+        if count >= self.agree_after and count > sum(self.counts.values()) - count:
+            self.language = dominant
+
+
+def new_language_stats() -> Dict[str, Any]:
+    """Return zeroed counters for :attr:`transcriber.Transcriber.language_stats`."""
+    return {
+        "detections": 0,
+        "detect_seconds": 0.0,
+        "cache_hits": 0,
+        "policy_hits": 0,
+        "saved_seconds": 0.0,
+    }
+
+
+_cache = LanguageCache()
+
+
+def get_language_cache() -> LanguageCache:
+    """Return the process-wide :class:`LanguageCache`."""
+    return _cache
@@ -4,8 +4,6 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from transcriber import Transcriber
-
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="VOICEBOX - транскрибация аудио и видео")
@@ -16,18 +14,56 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--device", default=None, help="Устройство (cpu или cuda)")
     parser.add_argument("--output-format", default="txt", choices=["txt", "json", "srt", "vtt", "tsv"], help="Формат вывода")
     parser.add_argument("--output", default=None, help="Путь для сохранения результата")
+    parser.add_argument("--workers", type=int, default=1, help="Количество процессов для параллельной транскрибации")
+    parser.add_argument("--chunk-seconds", type=float, default=300.0, help="Длина фрагмента для параллельной транскрибации (сек)")
+    parser.add_argument("--no-cache", action="store_true", help="Не использовать кэш результатов транскрибации")
+    parser.add_argument("--audio-cache", action="store_true", help="Кэшировать аудиодорожку, извлеченную FFmpeg (для повторной обработки видео)")
+    parser.add_argument("--quantize", default=None, choices=["int8"], help="Квантизация модели для CPU")
+    parser.add_argument("--threads", type=int, default=None, help="Потоков PyTorch внутри операций на процесс")
+    parser.add_argument("--interop-threads", type=int, default=None, help="Потоков PyTorch между операциями на процесс")
+    parser.add_argument("--cpu-affinity", default=None, help="Привязка к ядрам: auto или список (например 0-7)")
+    parser.add_argument("--mmap-model", action="store_true", help="Загружать модель из снимка в памяти (быстрый старт)")
+    parser.add_argument("--skip-silence", action="store_true", help="Пропускать тишину перед декодированием")
+    parser.add_argument("--silence-threshold-db", type=float, default=None, help="Порог тишины в дБFS (по умолчанию адаптивный)")
+    parser.add_argument("--adaptive", action="store_true", help="Жадное декодирование, beam search только для неуверенных окон")
+    parser.add_argument("--cascade", default=None, metavar="MODEL", help="Точная модель для неуверенных сегментов (каскад)")
+    parser.add_argument("--stats", action="store_true", help="Показать время по этапам, RTF, токены/с и пиковую память")
+    parser.add_argument("--draft-model", default=None, metavar="MODEL", help="Черновая модель для спекулятивного декодирования (greedy)")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    from config import CascadeConfig
+    from extraction_cache import default_extraction_cache
+    from transcriber import Transcriber
+    from video_processor import extract_audio_array
+
     transcriber = Transcriber(
         model_size=args.model,
         language=args.language,
         task=args.task,
         device=args.device,
+        # Speculative decoding reproduces greedy decoding of the main model.
+        beam_size=1 if args.draft_model else 5,
+        best_of=1 if args.draft_model else 5,
+        parallel_workers=args.workers,
+        chunk_seconds=args.chunk_seconds,
+        use_cache=not args.no_cache,
+        quantize=args.quantize,
+        num_threads=args.threads,
+        num_interop_threads=args.interop_threads,
+        cpu_affinity=args.cpu_affinity,
+        mmap_model=args.mmap_model,
+        skip_silence=args.skip_silence,
+        silence_threshold_db=args.silence_threshold_db,
+        adaptive_decoding=args.adaptive,
+        cascade=CascadeConfig(accurate_model=args.cascade) if args.cascade else None,
+        draft_model=args.draft_model,
     )
-    result = transcriber.transcribe(args.input)
+    audio_cache = default_extraction_cache(args.audio_cache)
+    source = extract_audio_array(args.input, cache=audio_cache) if audio_cache is not None else args.input
+    result = transcriber.transcribe(source)
     output_path = (
         Path(args.output)
         if args.output
@@ -35,6 +71,35 @@ def main() -> None:
     )
     saved = transcriber.save_output(result, output_path, format=args.output_format)
     print(f"Готово! Результат сохранен в {saved}")
+    if transcriber.last_silence_stats:
+        stats = transcriber.last_silence_stats
+        print(
+            f"Пропущено тишины: {stats['skipped_fraction']:.0%} "
+            f"(сэкономлено ~{stats['saved_seconds']:.1f} с)"
+        )
+    if transcriber.last_cascade_stats:
+        cascade = transcriber.last_cascade_stats
+        print(
+            f"Каскад: {cascade['escalated_segments']} из {cascade['segments']} сегментов "
+            f"({cascade['escalated_fraction']:.0%} аудио) перераспознано моделью {cascade['accurate_model']}"
+        )
+    if args.adaptive:
+        decoding = transcriber.last_decoding_stats.as_dict()
+        speedup = decoding["estimated_speedup"]
+        print(
+            f"Адаптивное декодирование: beam search в {decoding['escalated']} из {decoding['windows']} окон"
+            + (f", ускорение ~{speedup}x" if speedup else "")
+        )
+    if args.draft_model:
+        speculative = transcriber.last_speculative_stats.as_dict()
+        print(
+            f"Спекулятивное декодирование: {speculative['tokens_per_second']} токенов/с, "
+            f"принято {speculative['acceptance_rate']:.0%} токенов черновой модели"
+        )
+    if args.stats:
+        from instrumentation import format_timings
+
+        print(format_timings(result["timings"]))
 
 
 if __name__ == "__main__":
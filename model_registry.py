@@ -0,0 +1,208 @@
+"""Process-wide registry of loaded Whisper models.
+
+Every entry point (CLI, desktop GUIs, web UI, subtitle generator) creates
+a fresh :class:`transcriber.Transcriber` per job. Loading Whisper weights
+takes seconds to minutes, so models are kept in a shared registry keyed
+by ``(model_size, device, precision)``. Entries are reference counted: models in use
+are never evicted, idle ones stay cached until the memory budget is
+exceeded and are then dropped in least-recently-used order.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import os
+import threading
+import time
+
+ModelKey = Tuple[Hashable, ...]
+
+#: Default memory budget for cached models (MiB), overridable with the
+#: ``VOICEBOX_MODEL_CACHE_MB`` environment variable.
+DEFAULT_MEMORY_BUDGET_MB = 4096
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """Return the memory footprint of a ``torch.nn.Module`` in bytes.
+
+    The state dict is used rather than ``parameters()`` so that packed
+    weights of quantized layers are counted too.
+    """
+    state_dict = getattr(model, "state_dict", None)
+    if state_dict is None:
+        return 0
+
+    def size(value: Any) -> int:
+        if isinstance(value, (tuple, list)):
+            return sum(size(item) for item in value)
+        if hasattr(value, "element_size") and hasattr(value, "numel"):
+            return value.numel() * value.element_size()
+        return 0
+
+    return sum(size(value) for value in state_dict().values())
+
+
+def _budget_from_env() -> int:
+    raw = os.environ.get("VOICEBOX_MODEL_CACHE_MB")
+    megabytes = int(raw) if raw else DEFAULT_MEMORY_BUDGET_MB
+    return megabytes * 1024 * 1024
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_bytes: int
+    refcount: int = 0
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded models with reference counting.
+
+    Args:
+        memory_budget: Maximum bytes kept by idle models. ``None`` reads
+            ``VOICEBOX_MODEL_CACHE_MB`` (default 4096 MiB). Models in use
+            are never evicted, so the budget may be exceeded temporarily.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None) -> None:
+        self._memory_budget = memory_budget if memory_budget is not None else _budget_from_env()
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        #: Called with the key and load time in seconds after each load.
+        self.load_listeners: List[Callable[[ModelKey, float], None]] = []
+
+    @property
+    def memory_budget(self) -> int:
+        return self._memory_budget
+
+    def set_memory_budget(self, memory_budget: int) -> None:
+        """Change the budget (bytes) and evict idle models above it."""
+        with self._lock:
+            self._memory_budget = memory_budget
+            self._evict_idle()
+
+    @property
+    def memory_in_use(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def acquire(self, key: ModelKey, loader: Callable[[], Any]) -> Any:
+        """Return the model for ``key`` loading it with ``loader`` if needed.
+
+        Each call increments the reference count; pair it with
+        :meth:`release`. Concurrent callers asking for the same key wait
+        for a single load instead of loading the weights twice. After a
+        load every ``load_listeners`` callback gets the key and duration.
+        """
+        with self._lock:
+            entry = self._take(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.model
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._take(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry.model
+            begin = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - begin
+            with self._lock:
+                entry = _Entry(model=model, size_bytes=estimate_model_bytes(model), refcount=1)
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self.loads += 1
+                self._evict_idle()
+        for listener in list(self.load_listeners):
+            listener(key, elapsed)
+        return model
+
+    def release(self, key: ModelKey) -> None:
+        """Drop one reference to ``key``; idle models stay cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+            self._evict_idle()
+
+    def inference_lock(self, key: ModelKey) -> threading.RLock:
+        """Return the lock serialising inference on the shared model.
+
+        Whisper installs key/value cache hooks on the module for every
+        decode, so two threads must not run the same instance at once.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Модель не загружена: {key}")
+            return entry.lock
+
+    def evict(self, key: ModelKey) -> bool:
+        """Remove an idle model from the cache. Returns ``True`` on success."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount > 0:
+                return False
+            del self._entries[key]
+            self.evictions += 1
+            return True
+
+    def clear(self) -> None:
+        """Evict every idle model."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry.refcount == 0]:
+                del self._entries[key]
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the registry state."""
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {"key": list(key), "size_bytes": entry.size_bytes, "refcount": entry.refcount}
+                for key, entry in self._entries.items()
+            ]
+            return {
+                "models": models,
+                "memory_in_use": sum(entry.size_bytes for entry in self._entries.values()),
+                "memory_budget": self._memory_budget,
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+    def _take(self, key: ModelKey) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.refcount += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def _evict_idle(self) -> None:
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self._memory_budget:
+                break
+            entry = self._entries[key]
+            if entry.refcount > 0:
+                continue
+            total -= entry.size_bytes
+            del self._entries[key]
+            self.evictions += 1
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide :class:`ModelRegistry`."""
+    return _registry
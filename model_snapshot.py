@@ -0,0 +1,143 @@
+"""Memory-mapped model snapshots for fast cold starts.
+
+``whisper.load_model`` reads the fp16 checkpoint, allocates a randomly
+initialised model and copies every tensor into it - on each process
+start. A snapshot stores the ready fp32 state dict once in PyTorch's zip
+format; later loads ``torch.load(..., mmap=True)`` it and assign the
+mapped tensors to a model built without weight initialisation, so no
+weight bytes are copied. Pages are read from the OS page cache on first
+use and shared between all processes that map the same snapshot
+(parallel workers, concurrent CLI runs).
+
+Snapshots are used on CPU; for CUDA the mapped weights are copied to the
+device once, which still skips the checkpoint conversion. Memory mapping
+needs torch 2.1 (``mmap`` and ``assign``); older versions read the
+snapshot into memory and copy it into the model, which still skips the
+checkpoint conversion but not the copy.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+import os
+import tempfile
+import threading
+
+import torch
+import whisper
+from torch import nn
+from whisper.model import ModelDimensions, Whisper
+
+#: Bumped whenever the snapshot layout changes; older files are rebuilt.
+SNAPSHOT_FORMAT = 1
+
+#: ``torch.load(mmap=True)`` and ``load_state_dict(assign=True)`` appeared in torch 2.1.
+MMAP_SUPPORTED = tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2]) >= (2, 1)
+
+_init_lock = threading.Lock()
+
+
+def default_snapshot_dir() -> Path:
+    """Return ``$VOICEBOX_CACHE_DIR/snapshots`` or ``~/.cache/voicebox/snapshots``."""
+    root = os.environ.get("VOICEBOX_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "voicebox"
+    return base.expanduser() / "snapshots"
+
+
+@contextmanager
+def _skip_weight_init() -> Iterator[None]:
+    # Parameters are replaced by the mapped tensors right away, so the
+    # random initialisation (seconds for large models) is wasted work.
+    # ``torch.empty`` storage that is never written costs no resident memory.
+    layers = (nn.Linear, nn.Embedding, nn.LayerNorm, nn.modules.conv._ConvNd)
+    with _init_lock:
+        saved = {layer: layer.reset_parameters for layer in layers}
+        for layer in layers:
+            layer.reset_parameters = lambda self: None
+        try:
+            yield
+        finally:
+            for layer, reset in saved.items():
+                layer.reset_parameters = reset
+
+
+def save_snapshot(model: "whisper.model.Whisper", path: Path) -> None:
+    """Write ``model`` as a snapshot to ``path`` atomically."""
+    state_dict = {name: tensor.detach().cpu().contiguous() for name, tensor in model.state_dict().items()}
+    buffers: Dict[str, torch.Tensor] = {}
+    sparse = []
+    for name, buffer in model.named_buffers():
+        if name in state_dict:
+            continue
+        if buffer.is_sparse:
+            buffer = buffer.to_dense()
+            sparse.append(name)
+        buffers[name] = buffer.detach().cpu().contiguous()
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "dims": asdict(model.dims),
+        "state_dict": state_dict,
+        "buffers": buffers,
+        "sparse": sparse,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        torch.save(payload, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def map_snapshot(path: Path, device: str = "cpu") -> "whisper.model.Whisper":
+    """Build a model whose weights are memory-mapped from ``path``.
+
+    Without :data:`MMAP_SUPPORTED` the snapshot is loaded into memory instead.
+    """
+    if MMAP_SUPPORTED:
+        snapshot: Dict[str, Any] = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    else:
+        snapshot = torch.load(path, map_location="cpu", weights_only=True)
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Неподдерживаемый формат снимка модели: {path}")
+    with _skip_weight_init():
+        model = Whisper(ModelDimensions(**snapshot["dims"]))
+    if MMAP_SUPPORTED:
+        model.load_state_dict(snapshot["state_dict"], assign=True)
+    else:
+        model.load_state_dict(snapshot["state_dict"])
+    for name, buffer in snapshot["buffers"].items():
+        module_name, _, leaf = name.rpartition(".")
+        module = model.get_submodule(module_name)
+        module._buffers[leaf] = buffer.to_sparse() if name in snapshot["sparse"] else buffer
+    return model.to(device)
+
+
+def load_snapshot(
+    model_size: str,
+    loader: Callable[[], "whisper.model.Whisper"],
+    device: str = "cpu",
+    cache_dir: Optional[Path] = None,
+) -> "whisper.model.Whisper":
+    """Map the snapshot of ``model_size`` or create it with ``loader``.
+
+    Args:
+        model_size: Whisper model name, used for the snapshot file name.
+        loader: Returns the fp32 model (on CPU) when no snapshot exists.
+        device: Device of the returned model.
+        cache_dir: Snapshot directory (see :func:`default_snapshot_dir`).
+    """
+    directory = cache_dir or default_snapshot_dir()
+    path = directory / f"{model_size}.pt"
+    if path.is_file():
+        try:
+            return map_snapshot(path, device)
+        except Exception:  # noqa: BLE001 - stale or truncated file, rebuild it
+            path.unlink(missing_ok=True)
+
+    save_snapshot(loader(), path)
+    return map_snapshot(path, device)
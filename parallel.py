@@ -0,0 +1,173 @@
+"""Chunked parallel transcription of long recordings.
+
+Whisper decodes a file window by window on a single core-bound path. For
+multi-hour recordings on CPU-only machines the audio is instead cut at
+pauses (see :mod:`vad`) into overlapping chunks which are transcribed in a
+:class:`~concurrent.futures.ProcessPoolExecutor`. Each worker process
+holds its own model. Segments are shifted back to absolute time and the
+overlaps are deduplicated when stitching. Without a language it is
+detected once, by the first free worker, and shared by all chunks.
+
+Context is not carried across chunk boundaries, so
+``condition_on_previous_text`` only applies within a chunk.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+import multiprocessing
+import time
+
+import numpy as np
+
+from cpu_threads import apply_thread_plan, plan_workers
+from vad import SAMPLE_RATE, chunk_spans, find_split_points
+
+#: Seconds of audio shared by neighbouring chunks.
+DEFAULT_OVERLAP_SECONDS = 2.0
+
+#: Seconds of audio sent to the worker for language detection (one window).
+DETECT_SECONDS = 30
+
+_worker_transcriber: Optional[Any] = None
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """Return split points and overlapping sample spans for ``audio``."""
+    points = find_split_points(audio, chunk_seconds)
+    return points, chunk_spans(points, overlap_seconds, len(audio))
+
+
+def _init_worker(options: Dict[str, Any], plans: Any) -> None:
+    global _worker_transcriber
+    from transcriber import load_config_from_dict
+
+    apply_thread_plan(plans.get())
+    _worker_transcriber = load_config_from_dict(
+        {**options, "parallel_workers": 1, "num_threads": None, "num_interop_threads": None, "cpu_affinity": None}
+    )
+    _worker_transcriber._load_model()
+
+
+def _detect_language(audio: np.ndarray) -> Dict[str, Any]:
+    from language_detection import detect_language
+
+    assert _worker_transcriber is not None, "worker is not initialised"
+    begin = time.perf_counter()
+    language, probability = detect_language(_worker_transcriber._load_model(), audio)
+    return {"language": language, "probability": probability, "seconds": time.perf_counter() - begin}
+
+
+def _transcribe_chunk(audio: np.ndarray, offset: float, decode_options: Dict[str, Any]) -> Dict[str, Any]:
+    assert _worker_transcriber is not None, "worker is not initialised"
+    result = _worker_transcriber._run_model(audio, decode_options)
+    segments = []
+    for segment in result.get("segments", []):
+        shifted = dict(segment)
+        shifted["start"] = round(segment["start"] + offset, 3)
+        shifted["end"] = round(segment["end"] + offset, 3)
+        segments.append(shifted)
+    return {"language": result.get("language"), "segments": segments}
+
+
+def stitch_segments(
+    boundaries: Sequence[float], chunk_segments: Sequence[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Merge per-chunk segments (already in absolute time) into one list.
+
+    ``boundaries`` are the split points in seconds. A segment belongs to
+    the chunk whose own region (between its split points, without the
+    overlap) contains the segment midpoint; repeated text decoded from the
+    overlap of both neighbours is dropped.
+    """
+    stitched: List[Dict[str, Any]] = []
+    last = len(chunk_segments) - 1
+    for index, segments in enumerate(chunk_segments):
+        own_start = -math.inf if index == 0 else boundaries[index]
+        own_end = math.inf if index == last else boundaries[index + 1]
+        for segment in segments:
+            middle = (segment["start"] + segment["end"]) / 2
+            if not own_start <= middle < own_end:
+                continue
+            if stitched:
+                previous = stitched[-1]
+                if segment["start"] < previous["end"]:
+                    if segment["text"].strip() == previous["text"].strip():
+                        continue
+                    segment = {**segment, "start": previous["end"]}
+                    if segment["end"] <= segment["start"]:
+                        continue
+            stitched.append(segment)
+    for index, segment in enumerate(stitched):
+        segment["id"] = index
+    return stitched
+
+
+def transcribe_chunks(
+    audio: np.ndarray,
+    points: Sequence[int],
+    spans: Sequence[Tuple[int, int]],
+    options: Dict[str, Any],
+    decode_options: Dict[str, Any],
+    workers: int,
+) -> Dict[str, Any]:
+    """Transcribe ``spans`` of ``audio`` in ``workers`` processes.
+
+    Args:
+        audio: Mono 16 kHz float32 waveform.
+        points: Split points returned by :func:`plan_chunks`.
+        spans: Overlapping chunk spans returned by :func:`plan_chunks`.
+        options: ``Config`` fields used to build the worker ``Transcriber``.
+        decode_options: Keyword arguments for ``model.transcribe``.
+        workers: Number of worker processes. Cores are split evenly
+            between them (see :mod:`cpu_threads`).
+
+    Returns:
+        A Whisper-like result dictionary with ``text``, ``segments`` and
+        ``language`` keys. When ``decode_options`` has no language, the
+        one detected in a worker is reported under ``language_detection``
+        (``language``, ``probability``, ``seconds``).
+    """
+    workers = max(1, min(workers, len(spans)))
+    context = multiprocessing.get_context("spawn")
+    plans = context.Queue()
+    for plan in plan_workers(
+        workers,
+        options.get("num_threads"),
+        options.get("num_interop_threads"),
+        options.get("cpu_affinity"),
+    ):
+        plans.put(plan)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(options, plans),
+    ) as pool:
+        detection = None
+        if decode_options.get("language") is None:
+            detection = pool.submit(_detect_language, audio[: DETECT_SECONDS * SAMPLE_RATE]).result()
+            decode_options = {**decode_options, "language": detection["language"]}
+        futures = [
+            pool.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE, decode_options)
+            for start, end in spans
+        ]
+        parts = [future.result() for future in futures]
+
+    boundaries = [point / SAMPLE_RATE for point in points]
+    segments = stitch_segments(boundaries, [part["segments"] for part in parts])
+    languages = Counter(part["language"] for part in parts if part["language"])
+    result = {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": languages.most_common(1)[0][0] if languages else decode_options.get("language"),
+    }
+    if detection is not None:
+        result["language_detection"] = detection
+    return result
@@ -0,0 +1,81 @@
+"""Int8 dynamic quantization of Whisper models for CPU inference.
+
+The linear layers (attention projections and MLPs, where almost all the
+weights live) are converted to ``torch.ao.nn.quantized.dynamic.Linear``:
+weights are stored as int8 and activations are quantized on the fly. The
+quantized model is pickled to disk so later runs skip both the fp32 load
+and the conversion.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Optional
+import os
+import tempfile
+
+import torch
+import whisper
+from torch import nn
+
+QUANTIZE_MODES = ("int8",)
+
+
+def default_quantized_dir() -> Path:
+    """Return ``$VOICEBOX_CACHE_DIR/quantized`` or ``~/.cache/voicebox/quantized``."""
+    root = os.environ.get("VOICEBOX_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "voicebox"
+    return base.expanduser() / "quantized"
+
+
+def _use_plain_linear(module: nn.Module) -> None:
+    # Whisper subclasses nn.Linear to cast weights to the input dtype;
+    # quantize_dynamic only converts exact nn.Linear instances.
+    for name, child in module.named_children():
+        if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+            plain = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            plain.weight = child.weight
+            plain.bias = child.bias
+            setattr(module, name, plain)
+        else:
+            _use_plain_linear(child)
+
+
+def quantize_int8(model: "whisper.model.Whisper") -> "whisper.model.Whisper":
+    """Return ``model`` with int8 dynamically quantized linear layers (CPU)."""
+    model = model.cpu().float().eval()
+    _use_plain_linear(model)
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def load_quantized(
+    model_size: str,
+    loader: Callable[[], "whisper.model.Whisper"],
+    cache_dir: Optional[Path] = None,
+) -> "whisper.model.Whisper":
+    """Load the int8 model for ``model_size`` from disk or build and store it.
+
+    Args:
+        model_size: Whisper model name, used for the cache file name.
+        loader: Returns the fp32 model when no cached copy exists.
+        cache_dir: Directory of quantized models (see
+            :func:`default_quantized_dir`).
+    """
+    directory = cache_dir or default_quantized_dir()
+    path = directory / f"{model_size}-int8.pt"
+    if path.is_file():
+        try:
+            return torch.load(path, map_location="cpu", weights_only=False).eval()
+        except Exception:  # noqa: BLE001 - stale or truncated file, rebuild it
+            path.unlink(missing_ok=True)
+
+    model = quantize_int8(loader())
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        torch.save(model, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return model
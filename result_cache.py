@@ -0,0 +1,95 @@
+"""Content-addressed on-disk cache of transcription results.
+
+Results are keyed by the SHA-256 of the audio file content combined with
+the decoding-relevant configuration, so re-exports, subtitle re-renders
+and format changes of the same recording skip inference entirely. Each
+entry is a JSON file; the oldest-used entries are removed once the cache
+exceeds its size limit.
+
+Paths are keyed by the digest of the file bytes (:func:`utils.file_digest`)
+so a hit needs no decoding; decoded arrays are keyed by the digest of
+their float32 samples (:func:`audio_io.audio_digest`). The same recording
+passed once as a path and once as an array therefore gets two entries.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+
+from cache_store import ContentStore, cache_root, shared_store
+
+#: Bump when the stored result layout changes.
+CACHE_FORMAT = 1
+
+#: Default size limit of the cache directory (MiB).
+DEFAULT_CACHE_MAX_MB = 1024
+
+
+def default_cache_dir() -> Path:
+    """Return ``$VOICEBOX_CACHE_DIR/results`` or ``~/.cache/voicebox/results``."""
+    return cache_root() / "results"
+
+
+class ResultCache(ContentStore):
+    """Size-bounded LRU cache of Whisper result dictionaries.
+
+    Args:
+        directory: Where entries are stored.
+        max_bytes: Size limit; least recently used entries are evicted
+            after each write that exceeds it.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024) -> None:
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def make_key(content_digest: str, fields: Dict[str, Any]) -> str:
+        """Combine an audio digest and decoding fields into a cache key.
+
+        ``content_digest`` is :func:`utils.file_digest` for paths and
+        :func:`audio_io.audio_digest` for arrays; the two never match.
+        """
+        payload = json.dumps(
+            {"format": CACHE_FORMAT, "audio": content_digest, "fields": fields},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key`` or ``None``."""
+        try:
+            with self._path(key).open("r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+        self._touch(key)
+        self._count(hit=True)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store ``result`` atomically and enforce the size limit."""
+        payload = json.dumps(result, ensure_ascii=False)
+        self._write(key, lambda temp: temp.write_text(payload, encoding="utf-8"))
+
+    def invalidate(self, key: str) -> bool:
+        """Delete a single entry. Returns ``True`` if it existed."""
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def get_result_cache(directory: Optional[str | Path] = None, max_mb: int = DEFAULT_CACHE_MAX_MB) -> ResultCache:
+    """Return the shared :class:`ResultCache` for ``directory``.
+
+    Instances are shared per directory so hit/miss counters cover every
+    ``Transcriber`` in the process.
+    """
+    return shared_store(ResultCache, directory or default_cache_dir(), max_mb)
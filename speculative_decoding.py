@@ -0,0 +1,294 @@
+"""Speculative greedy decoding with a small draft model.
+
+For medium and large models most CPU time is spent generating tokens one
+decoder pass at a time. In speculative mode a small draft model of the
+same family (``tiny``/``base``) greedily proposes a few tokens, and the
+target model checks all of them in a single decoder pass: proposals are
+kept up to the first one the target would not have chosen, which is
+replaced by the target's own choice. Every emitted token is therefore the
+target's greedy choice, so the text equals greedy decoding on the target
+model; accepted proposals only save target passes.
+
+Whisper's decoder cannot run several new tokens against a filled key/value
+cache (its causal mask assumes an empty cache), so this module runs the
+decoder layers itself with an offset-aware mask and keeps per-model
+self-attention caches that can be rolled back after a rejection.
+
+Only greedy windows (``temperature == 0`` and no beam search) are
+decoded speculatively; temperature fallback runs the target alone. Like
+:mod:`adaptive_decoding` the hook wraps ``model.decode`` for the duration
+of one call.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+import math
+import time
+
+if TYPE_CHECKING:
+    import torch
+    import whisper
+
+#: Tokens proposed by the draft model per target pass.
+DEFAULT_DRAFT_TOKENS = 4
+
+
+@dataclass
+class SpeculativeStats:
+    """Counters of speculative decoding runs."""
+
+    windows: int = 0
+    tokens: int = 0
+    drafted: int = 0
+    accepted: int = 0
+    target_passes: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters with throughput and acceptance rate."""
+        return {
+            "windows": self.windows,
+            "tokens": self.tokens,
+            "drafted": self.drafted,
+            "accepted": self.accepted,
+            "acceptance_rate": round(self.accepted / self.drafted, 3) if self.drafted else 0.0,
+            "target_passes": self.target_passes,
+            "tokens_per_pass": round(self.tokens / self.target_passes, 2) if self.target_passes else 0.0,
+            "seconds": round(self.seconds, 3),
+            "tokens_per_second": round(self.tokens / self.seconds, 1) if self.seconds else 0.0,
+        }
+
+
+def check_compatible(target: "whisper.model.Whisper", draft: "whisper.model.Whisper") -> None:
+    """Raise ``ValueError`` unless ``draft`` can propose tokens for ``target``.
+
+    Both models must share the vocabulary and read the same mel
+    spectrogram (e.g. ``large-v3`` uses 128 mel bins and needs
+    ``large-v3``-family draft weights).
+    """
+    for field in ("n_vocab", "n_mels"):
+        if getattr(target.dims, field) != getattr(draft.dims, field):
+            raise ValueError(
+                f"Черновая модель несовместима с основной: {field} "
+                f"{getattr(draft.dims, field)} != {getattr(target.dims, field)}"
+            )
+
+
+def _attend(
+    attn: Any, x: "torch.Tensor", k: "torch.Tensor", v: "torch.Tensor", offset: Optional[int] = None
+) -> "torch.Tensor":
+    # Same computation as ``MultiHeadAttention.qkv_attention``, but the
+    # causal mask is shifted by the cache length ``offset`` so that query
+    # ``i`` sees keys ``0 .. offset + i``; ``None`` attends to all keys.
+    import torch
+    import torch.nn.functional as F
+    import whisper.model
+
+    q = attn.query(x)
+    n_batch, n_ctx, n_state = q.shape
+    q = q.view(n_batch, n_ctx, attn.n_head, -1).permute(0, 2, 1, 3)
+    k = k.view(*k.shape[:2], attn.n_head, -1).permute(0, 2, 1, 3)
+    v = v.view(*v.shape[:2], attn.n_head, -1).permute(0, 2, 1, 3)
+    allowed = None
+    if offset is not None and n_ctx > 1:
+        positions = torch.arange(k.shape[2], device=q.device)
+        allowed = positions[None, :] <= positions[offset:offset + n_ctx, None]
+
+    # Whisper releases before SDPA support have neither flag.
+    use_sdpa = getattr(whisper.model, "SDPA_AVAILABLE", False) and getattr(
+        whisper.model.MultiHeadAttention, "use_sdpa", False
+    )
+    if use_sdpa:
+        out = F.scaled_dot_product_attention(q, k, v, attn_mask=allowed)
+    else:
+        scale = (n_state // attn.n_head) ** -0.25
+        qk = (q * scale) @ (k * scale).transpose(-1, -2)
+        if allowed is not None:
+            qk = qk.masked_fill(~allowed, -math.inf)
+        out = F.softmax(qk.float(), dim=-1).to(q.dtype) @ v
+    return attn.out(out.permute(0, 2, 1, 3).flatten(start_dim=2))
+
+
+class DecoderCache:
+    """Decoder of one model bound to one window, with rollback.
+
+    Keeps the cross-attention keys/values of the encoded audio and the
+    self-attention keys/values of the tokens fed so far.
+    """
+
+    def __init__(self, decoder: Any, audio_features: "torch.Tensor") -> None:
+        self.decoder = decoder
+        self.dtype = audio_features.dtype
+        self.cross = [
+            (block.cross_attn.key(audio_features), block.cross_attn.value(audio_features))
+            for block in decoder.blocks
+        ]
+        self.keys: List[Optional["torch.Tensor"]] = [None] * len(self.cross)
+        self.values: List[Optional["torch.Tensor"]] = [None] * len(self.cross)
+        self.length = 0
+
+    def feed(self, tokens: List[int]) -> "torch.Tensor":
+        """Append ``tokens`` and return their logits, shape ``(len(tokens), n_vocab)``."""
+        import torch
+
+        decoder = self.decoder
+        offset = self.length
+        ids = torch.tensor([tokens], device=decoder.token_embedding.weight.device)
+        x = decoder.token_embedding(ids) + decoder.positional_embedding[offset:offset + len(tokens)]
+        x = x.to(self.dtype)
+        for index, block in enumerate(decoder.blocks):
+            h = block.attn_ln(x)
+            k, v = block.attn.key(h), block.attn.value(h)
+            if self.keys[index] is not None:
+                k = torch.cat([self.keys[index], k], dim=1)
+                v = torch.cat([self.values[index], v], dim=1)
+            self.keys[index], self.values[index] = k, v
+            x = x + _attend(block.attn, h, k, v, offset)
+            cross_k, cross_v = self.cross[index]
+            x = x + _attend(block.cross_attn, block.cross_attn_ln(x), cross_k, cross_v)
+            x = x + block.mlp(block.mlp_ln(x))
+        x = decoder.ln(x)
+        self.length += len(tokens)
+        return (x @ decoder.token_embedding.weight.to(x.dtype).T).float()[0]
+
+    def truncate(self, length: int) -> None:
+        """Forget every token after the first ``length``."""
+        if length >= self.length:
+            return
+        self.keys = [k[:, :length] for k in self.keys]
+        self.values = [v[:, :length] for v in self.values]
+        self.length = length
+
+
+def speculative_decode(
+    target: "whisper.model.Whisper",
+    draft: "whisper.model.Whisper",
+    mel: "torch.Tensor",
+    options: "whisper.DecodingOptions",
+    draft_tokens: int = DEFAULT_DRAFT_TOKENS,
+    stats: Optional[SpeculativeStats] = None,
+) -> "whisper.DecodingResult":
+    """Greedily decode one window ``mel`` of shape ``(n_mels, n_frames)``.
+
+    Returns the ``DecodingResult`` that ``target.decode(mel, options)``
+    returns for greedy ``options``; ``options.language`` must be set.
+    """
+    import torch
+    import torch.nn.functional as F
+    from whisper.decoding import DecodingResult, DecodingTask
+    from whisper.utils import compression_ratio
+
+    begin = time.perf_counter()
+    task = DecodingTask(target, options)
+    tokenizer = task.tokenizer
+    eot = tokenizer.eot
+    mel = mel.unsqueeze(0)
+    if options.fp16:
+        mel = mel.half()
+
+    with torch.no_grad():
+        audio_features = target.embed_audio(mel.to(target.device))
+        target_cache = DecoderCache(target.decoder, audio_features)
+        draft_cache = DecoderCache(draft.decoder, draft.embed_audio(mel.to(draft.device)))
+
+        def choose(logits: "torch.Tensor", tokens: List[int]) -> "torch.Tensor":
+            logits = logits.clone()[None]
+            for logit_filter in task.logit_filters:
+                logit_filter.apply(logits, torch.tensor([tokens], device=logits.device))
+            return logits[0]
+
+        sequence = list(task.initial_tokens)
+        limit = min(task.sample_begin + task.sample_len, task.n_ctx + 1)
+        sum_logprobs = torch.zeros((), device=audio_features.device)
+        no_speech_prob = math.nan
+        drafted = accepted = passes = 0
+        while sequence[-1] != eot and len(sequence) < limit:
+            proposals: List[int] = []
+            budget = min(draft_tokens, limit - len(sequence) - 1)
+            pending = sequence[draft_cache.length:]
+            while len(proposals) < budget:
+                logits = choose(draft_cache.feed(pending)[-1], sequence + proposals)
+                proposals.append(int(logits.argmax()))
+                if proposals[-1] == eot:
+                    break
+                pending = proposals[-1:]
+
+            pending = sequence[target_cache.length:]
+            logits = target_cache.feed(pending + proposals)
+            if passes == 0 and tokenizer.no_speech is not None:
+                no_speech_prob = logits[task.sot_index].softmax(dim=-1)[tokenizer.no_speech].item()
+            passes += 1
+
+            # Row ``first + i`` predicts the token after ``proposals[:i]``;
+            # keep proposals while they match the target's greedy choice.
+            first = len(pending) - 1
+            for index in range(len(proposals) + 1):
+                scores = choose(logits[first + index], sequence)
+                token = int(scores.argmax())
+                sum_logprobs += F.log_softmax(scores, dim=-1)[token]
+                sequence.append(token)
+                if index < len(proposals) and token == proposals[index]:
+                    accepted += 1
+                    if token != eot:
+                        continue
+                break
+            drafted += len(proposals)
+            target_cache.truncate(len(sequence) - 1)
+            draft_cache.truncate(min(draft_cache.length, len(sequence) - 1))
+
+    tokens = sequence[task.sample_begin:]
+    if eot in tokens:
+        tokens = tokens[:tokens.index(eot)]
+    text = tokenizer.decode(tokens).strip()
+    if stats is not None:
+        stats.windows += 1
+        stats.tokens += len(sequence) - task.sample_begin
+        stats.drafted += drafted
+        stats.accepted += accepted
+        stats.target_passes += passes
+        stats.seconds += time.perf_counter() - begin
+    return DecodingResult(
+        audio_features=audio_features[0],
+        language=options.language,
+        tokens=tokens,
+        text=text,
+        avg_logprob=(sum_logprobs / (len(tokens) + 1)).item(),
+        no_speech_prob=no_speech_prob,
+        temperature=options.temperature,
+        compression_ratio=compression_ratio(text),
+    )
+
+
+@contextmanager
+def speculative_decoding(
+    model: "whisper.model.Whisper",
+    draft: "whisper.model.Whisper",
+    stats: SpeculativeStats,
+    draft_tokens: int = DEFAULT_DRAFT_TOKENS,
+) -> Iterator[None]:
+    """Decode greedy windows of ``model`` speculatively with ``draft`` while active."""
+    check_compatible(model, draft)
+    original = model.decode
+    shadowed = "decode" in vars(model)
+
+    def decode(mel: Any, options: Any) -> Any:
+        if (
+            options.temperature > 0
+            or (options.beam_size or 1) > 1
+            or options.language is None
+            or options.task == "lang_id"
+            or mel.ndim != 2
+        ):
+            return original(mel, options)
+        return speculative_decode(model, draft, mel, options, draft_tokens, stats)
+
+    model.decode = decode
+    try:
+        yield
+    finally:
+        if shadowed:
+            model.decode = original
+        else:
+            del model.decode
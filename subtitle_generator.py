@@ -4,8 +4,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
+from extraction_cache import default_extraction_cache
 from transcriber import Transcriber
 from utils import ensure_directory
+from video_processor import extract_audio_array
 
 
 def generate_subtitles(
@@ -15,10 +17,17 @@ def generate_subtitles(
     language: Optional[str] = None,
     format: str = "srt",
     model_size: str = "base",
+    audio_cache: bool = False,
 ) -> Path:
-    """Transcribe ``audio_path`` and save subtitles to ``output``."""
+    """Transcribe ``audio_path`` and save subtitles to ``output``.
+
+    With ``audio_cache`` (or ``VOICEBOX_AUDIO_CACHE=1``) the audio track
+    is read from (or extracted into) the default :mod:`extraction_cache`,
+    so re-rendering subtitles of the same video does not decode it again.
+    """
     transcriber = Transcriber(model_size=model_size, language=language, task="transcribe")
-    result = transcriber.transcribe(audio_path)
+    cache = default_extraction_cache(audio_cache)
+    result = transcriber.transcribe(extract_audio_array(audio_path, cache=cache) if cache is not None else audio_path)
 
     output_path = (
         Path(output).expanduser().resolve()
@@ -0,0 +1,5 @@
+"""Make the top-level modules of the repository importable from the tests."""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,185 @@
+"""Тесты конвейера декодирование → инференс → запись (:mod:`batch_pipeline`)."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List, Optional
+import threading
+import time
+
+import pytest
+
+from batch_pipeline import run_pipeline
+
+PATHS = [Path(f"file{index}.wav") for index in range(6)]
+
+
+def slow_decode(delays: dict):
+    """decode, который ждет ``delays[path.name]`` секунд."""
+    def decode(path: Path) -> str:
+        time.sleep(delays.get(path.name, 0.0))
+        return f"audio:{path.name}"
+    return decode
+
+
+def write_output(path: Path, result: Optional[str]) -> Optional[Path]:
+    return None if result is None else path.with_suffix(".txt")
+
+
+def writer_threads() -> List[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name == "voicebox-writer"]
+
+
+class TestOrdering:
+    """Тесты порядка обработки"""
+
+    def test_preserve_order(self):
+        """Инференс и результаты идут в порядке входа, даже если декодирование обгоняет"""
+        inferred: List[str] = []
+        decode = slow_decode({"file0.wav": 0.1, "file1.wav": 0.05})
+
+        def infer(path: Path, audio: str) -> str:
+            inferred.append(path.name)
+            return audio
+
+        saved, report = run_pipeline(PATHS, decode, infer, write_output, decode_workers=3, preserve_order=True)
+
+        assert inferred == [path.name for path in PATHS]
+        assert saved == [path.with_suffix(".txt") for path in PATHS]
+        assert {name: stats.items for name, stats in report.stages.items()} == {
+            "decode": 6, "inference": 6, "write": 6,
+        }
+
+    def test_completion_order(self):
+        """Без preserve_order первым обрабатывается файл, декодированный первым"""
+        inferred: List[str] = []
+        decode = slow_decode({"file0.wav": 0.3})
+
+        def infer(path: Path, audio: str) -> str:
+            inferred.append(path.name)
+            return audio
+
+        saved, _ = run_pipeline(PATHS[:3], decode, infer, write_output, decode_workers=3, preserve_order=False)
+
+        assert inferred[-1] == "file0.wav"
+        assert sorted(inferred) == [path.name for path in PATHS[:3]]
+        assert saved == [Path(name).with_suffix(".txt") for name in inferred]
+
+
+class TestErrors:
+    """Тесты обработки ошибок"""
+
+    def test_failed_file_does_not_stop_batch(self):
+        """Файл, на котором стадия вернула None, не мешает остальным"""
+        def decode(path: Path) -> Optional[str]:
+            return None if path.name == "file2.wav" else f"audio:{path.name}"
+
+        def infer(path: Path, audio: Optional[str]) -> Optional[str]:
+            return None if audio is None or path.name == "file4.wav" else audio
+
+        saved, _ = run_pipeline(PATHS, decode, infer, write_output)
+
+        expected = [None if path.name in ("file2.wav", "file4.wav") else path.with_suffix(".txt") for path in PATHS]
+        assert saved == expected
+
+    def test_inference_error_stops_pipeline(self):
+        """Исключение инференса выходит наружу, поток записи завершается"""
+        written: List[str] = []
+
+        def infer(path: Path, audio: str) -> str:
+            if path.name == "file2.wav":
+                raise RuntimeError("model failed")
+            return audio
+
+        def write(path: Path, result: str) -> Path:
+            written.append(path.name)
+            return path
+
+        with pytest.raises(RuntimeError, match="model failed"):
+            run_pipeline(PATHS, slow_decode({}), infer, write, queue_size=2)
+
+        assert written == ["file0.wav", "file1.wav"]
+        assert writer_threads() == []
+
+    def test_write_error_is_raised(self):
+        """Исключение записи выходит наружу, следующие результаты не пишутся"""
+        written: List[str] = []
+
+        def write(path: Path, result: str) -> Path:
+            if path.name == "file1.wav":
+                raise OSError("disk full")
+            written.append(path.name)
+            return path
+
+        with pytest.raises(OSError, match="disk full"):
+            run_pipeline(PATHS, slow_decode({}), lambda path, audio: audio, write)
+
+        assert written == ["file0.wav"]
+        assert writer_threads() == []
+
+
+class TestBoundedQueues:
+    """Тесты ограничения очередей"""
+
+    def test_decoding_runs_at_most_queue_size_ahead(self):
+        """Впереди инференса декодируется не больше queue_size файлов"""
+        consumed: List[int] = []
+        ahead: List[int] = []
+        inferred = 0
+        lock = threading.Lock()
+
+        def paths() -> Iterator[Path]:
+            for index in range(20):
+                consumed.append(index)
+                yield Path(f"file{index}.wav")
+
+        def decode(path: Path) -> str:
+            with lock:
+                ahead.append(len(consumed) - inferred)
+            return path.name
+
+        def infer(path: Path, audio: str) -> str:
+            nonlocal inferred
+            with lock:
+                inferred += 1
+            return audio
+
+        saved, _ = run_pipeline(paths(), decode, infer, write_output, decode_workers=2, queue_size=3)
+
+        assert len(saved) == 20
+        # queue_size ожидающих файлов плюс тот, что сейчас на инференсе.
+        assert max(ahead) <= 3 + 1
+
+    def test_slow_writer_blocks_inference(self):
+        """Медленная запись ограничивает число результатов в очереди"""
+        release = threading.Event()
+        inferred: List[str] = []
+
+        def write(path: Path, result: str) -> Path:
+            release.wait(5)
+            return path
+
+        def infer(path: Path, audio: str) -> str:
+            inferred.append(path.name)
+            return audio
+
+        worker = threading.Thread(
+            target=run_pipeline, args=(PATHS, slow_decode({}), infer, write), kwargs={"queue_size": 2}
+        )
+        worker.start()
+        time.sleep(0.3)
+        # Один результат пишется, два ждут в очереди, один ждет места в ней.
+        blocked = len(inferred)
+        release.set()
+        worker.join(5)
+
+        assert blocked == 4
+        assert len(inferred) == len(PATHS)
+        assert not worker.is_alive()
+
+    def test_empty_input(self):
+        """Пустой список файлов"""
+        saved, report = run_pipeline([], slow_decode({}), lambda path, audio: audio, write_output)
+
+        assert saved == []
+        assert report.stages["inference"].items == 0
+        assert writer_threads() == []
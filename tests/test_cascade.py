@@ -0,0 +1,129 @@
+"""Тесты выбора и подстановки сегментов каскада в :mod:`cascade`."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from cascade import replacement_segments, splice, uncertain_runs
+
+
+def segment(index: int, start: float, end: float, text: str) -> Dict[str, Any]:
+    """Сегмент Whisper."""
+    return {"id": index, "start": start, "end": end, "text": text}
+
+
+def fast_segments() -> List[Dict[str, Any]]:
+    """Сегменты быстрой модели по две секунды."""
+    return [segment(index, 2.0 * index, 2.0 * index + 2.0, f" f{index}") for index in range(5)]
+
+
+def cascade_run(
+    segments: List[Dict[str, Any]], first: int, last: int, padding: float, accurate: List[Tuple[float, float, str]]
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """Замена для ``segments[first:last]`` так, как ее строит Transcriber.
+
+    ``accurate`` задает сегменты точной модели во времени вырезанного
+    фрагмента, который начинается за ``padding`` секунд до участка.
+    """
+    start, end = segments[first]["start"], segments[last - 1]["end"]
+    low = max(0.0, start - padding)
+    part = [segment(index, begin, finish, text) for index, (begin, finish, text) in enumerate(accurate)]
+    return first, last, replacement_segments(part, low, start, end)
+
+
+def spans(segments: List[Dict[str, Any]]) -> List[Tuple[float, float, str]]:
+    return [(item["start"], item["end"], item["text"]) for item in segments]
+
+
+class TestUncertainRuns:
+    """Тесты uncertain_runs"""
+
+    def test_groups_adjacent_flags(self):
+        """Соседние неуверенные сегменты объединяются в один участок"""
+        assert uncertain_runs([True, True, False, True, False, False, True]) == [(0, 2), (3, 4), (6, 7)]
+
+    def test_no_flags(self):
+        """Без неуверенных сегментов участков нет"""
+        assert uncertain_runs([]) == []
+        assert uncertain_runs([False, False]) == []
+
+
+class TestReplacementSegments:
+    """Тесты replacement_segments"""
+
+    def test_shift_and_drop_padding(self):
+        """Сегменты сдвигаются на начало фрагмента, распознанные в запасе отбрасываются"""
+        accurate = [segment(0, 0.0, 0.9, " pad"), segment(1, 1.0, 2.5, " a"), segment(2, 2.5, 3.0, " b"),
+                    segment(3, 3.1, 3.9, " pad")]
+
+        kept = replacement_segments(accurate, 3.0, 4.0, 6.0)
+
+        assert spans(kept) == [(4.0, 5.5, " a"), (5.5, 6.0, " b")]
+
+    def test_clamped_to_escalated_span(self):
+        """Сегмент, выходящий в запас, обрезается по границам участка"""
+        kept = replacement_segments([segment(0, 0.6, 2.2, " a")], 3.0, 4.0, 6.0)
+
+        assert spans(kept) == [(4.0, 5.2, " a")]
+
+    def test_input_not_modified(self):
+        """Исходные сегменты точной модели не меняются"""
+        accurate = [segment(0, 1.0, 2.0, " a")]
+
+        replacement_segments(accurate, 3.0, 4.0, 6.0)
+
+        assert accurate == [segment(0, 1.0, 2.0, " a")]
+
+
+class TestSplice:
+    """Тесты splice"""
+
+    def test_middle_run(self):
+        """Замена в середине записи"""
+        segments = fast_segments()
+        replacement = cascade_run(segments, 2, 3, 0.5, [(0.1, 0.5, " pad"), (0.5, 1.5, " m1"), (1.5, 2.5, " m2")])
+
+        spliced = splice(segments, [replacement])
+
+        assert [item["text"] for item in spliced] == [" f0", " f1", " m1", " m2", " f3", " f4"]
+        assert spans(spliced)[2:4] == [(4.0, 5.0, " m1"), (5.0, 6.0, " m2")]
+
+    def test_first_and_last_segments(self):
+        """Замены на краях записи, где запас обрезан началом аудио"""
+        segments = fast_segments()
+        replacements = [
+            cascade_run(segments, 0, 1, 0.5, [(0.0, 2.0, " start")]),
+            cascade_run(segments, 4, 5, 0.5, [(0.2, 0.4, " pad"), (0.5, 2.5, " end")]),
+        ]
+
+        spliced = splice(segments, replacements)
+
+        assert spans(spliced) == [
+            (0.0, 2.0, " start"), (2.0, 4.0, " f1"), (4.0, 6.0, " f2"), (6.0, 8.0, " f3"), (8.0, 10.0, " end"),
+        ]
+
+    def test_adjacent_escalated_segments(self):
+        """Соседние неуверенные сегменты заменяются одним участком"""
+        segments = fast_segments()
+        (first, last), = uncertain_runs([False, True, True, False, False])
+        replacement = cascade_run(segments, first, last, 0.5, [(0.5, 2.0, " x"), (2.0, 4.5, " y")])
+
+        spliced = splice(segments, [replacement])
+
+        assert spans(spliced) == [
+            (0.0, 2.0, " f0"), (2.0, 3.5, " x"), (3.5, 6.0, " y"), (6.0, 8.0, " f3"), (8.0, 10.0, " f4"),
+        ]
+
+    def test_ids_and_times_are_consistent(self):
+        """После подстановки номера идут подряд, а время не убывает"""
+        segments = fast_segments()
+        replacements = [
+            cascade_run(segments, 1, 2, 0.5, [(0.5, 1.5, " a"), (1.5, 2.2, " b"), (2.2, 2.5, " c")]),
+            cascade_run(segments, 3, 4, 0.5, []),
+        ]
+
+        spliced = splice(segments, replacements)
+
+        assert [item["id"] for item in spliced] == list(range(len(spliced)))
+        assert [item["text"] for item in spliced] == [" f0", " a", " b", " c", " f2", " f4"]
+        for previous, current in zip(spliced, spliced[1:]):
+            assert previous["start"] <= previous["end"] <= current["start"] <= current["end"]
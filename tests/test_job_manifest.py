@@ -0,0 +1,168 @@
+"""Тесты манифеста пакетной задачи и возобновления ``batch_transcribe``."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+import transcriber as transcriber_module
+from job_manifest import DONE, FAILED, MANIFEST_NAME, PENDING, RUNNING, JobManifest
+from transcriber import Transcriber
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """Пустой манифест во временной папке"""
+    with JobManifest(tmp_path / MANIFEST_NAME) as manifest:
+        yield manifest
+
+
+class TestJobManifest:
+    """Тесты состояний JobManifest"""
+
+    def test_state_transitions(self, journal):
+        """pending → running → failed → running → done"""
+        journal.register(["a.wav"])
+        assert journal.get("a.wav")["state"] == PENDING
+
+        journal.mark_running("a.wav")
+        assert (journal.get("a.wav")["state"], journal.get("a.wav")["attempts"]) == (RUNNING, 1)
+
+        journal.mark_failed("a.wav", "RuntimeError: boom", {"decode": 0.5})
+        record = journal.get("a.wav")
+        assert (record["state"], record["error"], record["timings"]) == (FAILED, "RuntimeError: boom", {"decode": 0.5})
+
+        journal.mark_running("a.wav")
+        record = journal.get("a.wav")
+        assert (record["state"], record["attempts"], record["error"], record["finished"]) == (RUNNING, 2, None, None)
+
+        journal.mark_done("a.wav", "out/a.txt", {"inference": 1.0})
+        record = journal.get("a.wav")
+        assert (record["state"], record["output"], record["error"]) == (DONE, "out/a.txt", None)
+        assert record["timings"] == {"inference": 1.0}
+        assert record["finished"] >= record["started"]
+
+    def test_register_keeps_existing_state(self, journal):
+        """Повторная регистрация не сбрасывает состояние"""
+        journal.register(["a.wav", "b.wav"])
+        journal.mark_running("a.wav")
+        journal.mark_done("a.wav", "a.txt", {})
+
+        journal.register(["a.wav", "b.wav", "c.wav"])
+
+        assert [(item["input"], item["state"]) for item in journal.items()] == [
+            ("a.wav", DONE), ("b.wav", PENDING), ("c.wav", PENDING),
+        ]
+        assert journal.summary() == {PENDING: 2, RUNNING: 0, DONE: 1, FAILED: 0}
+        assert [item["input"] for item in journal.items(PENDING)] == ["b.wav", "c.wav"]
+
+    def test_completed_output(self, journal, tmp_path):
+        """Готовый результат возвращается, только если файл существует"""
+        output = tmp_path / "a.txt"
+        journal.register(["a.wav", "b.wav"])
+        journal.mark_running("a.wav")
+        journal.mark_done("a.wav", output, {})
+        journal.mark_running("b.wav")
+        journal.mark_failed("b.wav", "error")
+
+        assert journal.completed_output("a.wav") is None
+        output.write_text("text", encoding="utf-8")
+        assert journal.completed_output("a.wav") == output
+        assert journal.completed_output("b.wav") is None
+        assert journal.completed_output("missing.wav") is None
+
+    def test_state_survives_reopen(self, tmp_path):
+        """Состояние сохраняется между запусками"""
+        path = tmp_path / MANIFEST_NAME
+        with JobManifest(path) as manifest:
+            manifest.register(["a.wav"])
+            manifest.mark_running("a.wav")
+
+        with JobManifest(path) as manifest:
+            assert manifest.get("a.wav")["state"] == RUNNING
+            assert manifest.get("a.wav")["attempts"] == 1
+
+
+class FakeTranscriber(Transcriber):
+    """Transcriber без модели: текст результата - имя файла."""
+
+    def __init__(self) -> None:
+        super().__init__(model_size="tiny", language="ru", use_cache=False)
+        self.processed: List[str] = []
+
+    def _transcribe_waveform(self, waveform: np.ndarray, decode_options: Dict[str, Any], timings, *args, **kwargs):
+        name = bytes(waveform.astype(np.uint8)).decode("utf-8")
+        self.processed.append(name)
+        return {"text": name, "segments": [], "language": "ru", "timings": {"stages": {}}}
+
+
+class TestBatchResume:
+    """Тесты возобновления batch_transcribe по манифесту"""
+
+    @pytest.fixture
+    def inputs(self, tmp_path, monkeypatch) -> List[Path]:
+        """Три входных файла; файлы с текстом bad не декодируются"""
+        def load_audio(path: Path) -> np.ndarray:
+            content = Path(path).read_text(encoding="utf-8")
+            if content.startswith("bad"):
+                raise RuntimeError("cannot decode")
+            return np.frombuffer(content.encode("utf-8"), dtype=np.uint8).astype(np.float32)
+
+        monkeypatch.setattr(transcriber_module, "load_audio", load_audio)
+        paths = []
+        for name, content in (("one", "one"), ("two", "bad two"), ("three", "three")):
+            path = tmp_path / "in" / f"{name}.wav"
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def run(self, inputs: List[Path], output: Path, **kwargs: Any) -> Tuple[FakeTranscriber, List[Path]]:
+        transcriber = FakeTranscriber()
+        return transcriber, transcriber.batch_transcribe(inputs, output, **kwargs)
+
+    def test_failed_file_is_recorded(self, inputs, tmp_path):
+        """Ошибка одного файла записывается в манифест, остальные обрабатываются"""
+        first, outputs = self.run(inputs, tmp_path / "out")
+
+        assert sorted(first.processed) == ["one", "three"]
+        assert [path.name for path in outputs] == ["one.txt", "three.txt"]
+        assert first.last_batch_failures == [(inputs[1].resolve(), "RuntimeError: cannot decode")]
+        with JobManifest(tmp_path / "out" / MANIFEST_NAME) as journal:
+            assert journal.summary() == {PENDING: 0, RUNNING: 0, DONE: 2, FAILED: 1}
+
+    def test_resume_retries_only_failed(self, inputs, tmp_path):
+        """Повторный запуск пропускает готовые файлы и повторяет упавшие"""
+        self.run(inputs, tmp_path / "out")
+        inputs[1].write_text("two", encoding="utf-8")
+
+        second, outputs = self.run(inputs, tmp_path / "out")
+
+        assert second.processed == ["two"]
+        assert [path.name for path in outputs] == ["one.txt", "two.txt", "three.txt"]
+        with JobManifest(tmp_path / "out" / MANIFEST_NAME) as journal:
+            assert journal.summary()[DONE] == 3
+            assert journal.get(str(inputs[1].resolve()))["attempts"] == 2
+
+    def test_resume_redoes_missing_output(self, inputs, tmp_path):
+        """Файл, чей результат удален, обрабатывается заново"""
+        self.run(inputs, tmp_path / "out")
+        (tmp_path / "out" / "one.txt").unlink()
+
+        second, _ = self.run(inputs, tmp_path / "out")
+
+        assert second.processed == ["one"]
+        assert (tmp_path / "out" / "one.txt").read_text(encoding="utf-8") == "one\n"
+
+    def test_no_resume_reprocesses_everything(self, inputs, tmp_path):
+        """resume=False обрабатывает все файлы заново"""
+        self.run(inputs, tmp_path / "out")
+        inputs[1].write_text("two", encoding="utf-8")
+
+        second, _ = self.run(inputs, tmp_path / "out", resume=False)
+
+        assert sorted(second.processed) == ["one", "three", "two"]
+        with JobManifest(tmp_path / "out" / MANIFEST_NAME) as journal:
+            assert [item["attempts"] for item in journal.items()] == [2, 2, 2]
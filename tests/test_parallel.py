@@ -0,0 +1,88 @@
+"""Тесты планирования фрагментов и склейки сегментов в :mod:`parallel`."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from parallel import plan_chunks, stitch_segments
+from vad import SAMPLE_RATE
+
+
+def segment(start: float, end: float, text: str) -> Dict[str, Any]:
+    """Сегмент Whisper в абсолютном времени."""
+    return {"id": -1, "start": start, "end": end, "text": text}
+
+
+def texts(segments: List[Dict[str, Any]]) -> List[str]:
+    return [item["text"] for item in segments]
+
+
+class TestStitchSegments:
+    """Тесты stitch_segments"""
+
+    def test_midpoint_selects_chunk(self):
+        """Сегмент принадлежит фрагменту, в чьей области лежит его середина"""
+        chunks = [
+            [segment(0.0, 4.0, " a"), segment(4.0, 9.0, " b"), segment(9.0, 11.5, " c")],
+            [segment(8.5, 9.8, " b"), segment(9.0, 11.5, " c"), segment(11.5, 20.0, " d")],
+        ]
+
+        stitched = stitch_segments([0.0, 10.0, 20.0], chunks)
+
+        assert texts(stitched) == [" a", " b", " c", " d"]
+        assert [item["id"] for item in stitched] == [0, 1, 2, 3]
+
+    def test_repeated_overlap_text_is_dropped(self):
+        """Текст, распознанный в перекрытии обоими соседями, остается один раз"""
+        chunks = [[segment(4.0, 10.4, " same")], [segment(10.1, 11.0, "same "), segment(11.0, 14.0, " next")]]
+
+        stitched = stitch_segments([0.0, 10.0, 14.0], chunks)
+
+        assert texts(stitched) == [" same", " next"]
+
+    def test_overlapping_new_text_is_trimmed(self):
+        """Новый текст в перекрытии начинается с конца предыдущего; пустой выбрасывается"""
+        chunks = [[segment(4.0, 10.4, " one")], [segment(10.1, 12.0, " two"), segment(10.1, 10.3, " gone")]]
+
+        stitched = stitch_segments([0.0, 10.0, 14.0], chunks)
+
+        assert texts(stitched) == [" one", " two"]
+        assert (stitched[1]["start"], stitched[1]["end"]) == (10.4, 12.0)
+
+    def test_chunks_shorter_than_overlap(self):
+        """Фрагменты короче перекрытия: каждый сегмент попадает один раз"""
+        segments = [segment(0.0, 0.8, " x"), segment(1.2, 1.8, " y"), segment(2.2, 2.9, " z")]
+
+        stitched = stitch_segments([0.0, 1.0, 2.0, 3.0], [list(segments) for _ in range(3)])
+
+        assert texts(stitched) == [" x", " y", " z"]
+
+    def test_no_segments(self):
+        """Фрагменты без сегментов (тишина)"""
+        assert stitch_segments([0.0, 5.0], [[]]) == []
+        assert stitch_segments([0.0, 5.0, 10.0], [[], []]) == []
+
+    def test_single_chunk_keeps_everything(self):
+        """Единственный фрагмент сохраняет все сегменты"""
+        segments = [segment(0.0, 1.0, " a"), segment(1.0, 2.0, " b")]
+
+        assert texts(stitch_segments([0.0, 2.0], [segments])) == [" a", " b"]
+
+
+class TestPlanChunks:
+    """Тесты plan_chunks"""
+
+    def test_empty_audio(self):
+        """Пустое аудио дает один пустой фрагмент"""
+        assert plan_chunks(np.zeros(0, dtype=np.float32), 10.0) == ([0, 0], [(0, 0)])
+
+    def test_all_silence(self):
+        """Тишина покрывается фрагментами от начала до конца"""
+        silence = np.zeros(25 * SAMPLE_RATE, dtype=np.float32)
+
+        points, spans = plan_chunks(silence, 10.0, overlap_seconds=1.0)
+
+        assert points[0] == 0 and points[-1] == len(silence)
+        assert len(spans) == len(points) - 1
+        assert spans[0][0] == 0 and spans[-1][1] == len(silence)
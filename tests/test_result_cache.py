@@ -0,0 +1,160 @@
+"""Тесты дискового кэша результатов (:mod:`result_cache`, :mod:`cache_store`)."""
+from __future__ import annotations
+
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from audio_io import audio_digest
+from cache_store import shared_store
+from result_cache import ResultCache, get_result_cache
+from utils import file_digest
+
+FIELDS = {"model": "base", "language": "ru", "task": "transcribe", "beam_size": 5, "temperature": [0.0, 0.2]}
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResultCache:
+    """Пустой кэш во временной папке"""
+    return ResultCache(tmp_path / "results", max_bytes=1 << 20)
+
+
+def entry_files(cache: ResultCache) -> list:
+    return sorted(path.name for path in cache.directory.rglob("*") if path.is_file())
+
+
+class TestMakeKey:
+    """Тесты ResultCache.make_key"""
+
+    def test_key_is_stable(self):
+        """Ключ не зависит от порядка полей и совпадает между вызовами"""
+        reordered = dict(reversed(list(FIELDS.items())))
+
+        assert ResultCache.make_key("abc", FIELDS) == ResultCache.make_key("abc", reordered)
+        assert len(ResultCache.make_key("abc", FIELDS)) == 64
+
+    def test_key_depends_on_audio_and_fields(self):
+        """Другое аудио или другой параметр декодирования дают другой ключ"""
+        key = ResultCache.make_key("abc", FIELDS)
+
+        assert ResultCache.make_key("abd", FIELDS) != key
+        assert ResultCache.make_key("abc", {**FIELDS, "language": "en"}) != key
+        assert ResultCache.make_key("abc", {**FIELDS, "language": None}) != key
+
+    def test_path_and_array_digests_differ(self, tmp_path):
+        """Один и тот же звук, переданный файлом и массивом, дает разные ключи"""
+        samples = (np.linspace(-0.5, 0.5, 1600) * 32767).astype(np.int16)
+        path = tmp_path / "audio.wav"
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(samples.tobytes())
+        decoded = samples.astype(np.float32) / 32768.0
+
+        assert file_digest(path) == file_digest(path)
+        assert audio_digest(decoded) == audio_digest(decoded.astype(np.float64))
+        assert ResultCache.make_key(file_digest(path), FIELDS) != ResultCache.make_key(audio_digest(decoded), FIELDS)
+
+
+class TestGetPut:
+    """Тесты get/put/invalidate"""
+
+    def test_round_trip(self, cache):
+        """Сохраненный результат читается обратно и считается попаданием"""
+        key = ResultCache.make_key("abc", FIELDS)
+        result = {"text": " Привет", "language": "ru", "segments": [{"id": 0, "start": 0.0, "end": 1.0}]}
+
+        assert cache.get(key) is None
+        cache.put(key, result)
+
+        assert cache.get(key) == result
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.stats()["entries"] == 1
+
+    def test_overwrite_and_invalidate(self, cache):
+        """Повторная запись заменяет результат, invalidate удаляет его"""
+        key = ResultCache.make_key("abc", FIELDS)
+        cache.put(key, {"text": " old"})
+        cache.put(key, {"text": " new"})
+
+        assert cache.get(key) == {"text": " new"}
+        assert cache.invalidate(key) is True
+        assert cache.invalidate(key) is False
+        assert cache.get(key) is None
+
+    def test_corrupt_entry_is_a_miss(self, cache):
+        """Поврежденная запись считается промахом"""
+        key = ResultCache.make_key("abc", FIELDS)
+        cache.put(key, {"text": " x"})
+        cache._path(key).write_text("{", encoding="utf-8")
+
+        assert cache.get(key) is None
+
+    def test_clear(self, cache):
+        """clear удаляет все записи"""
+        for digest in ("a", "b", "c"):
+            cache.put(ResultCache.make_key(digest, FIELDS), {"text": digest})
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+
+
+class TestEviction:
+    """Тесты вытеснения по размеру"""
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """При превышении max_bytes удаляются давно неиспользуемые записи"""
+        payload = {"text": "x" * 1000}
+        cache = ResultCache(tmp_path / "results", max_bytes=3500)
+        keys = [ResultCache.make_key(str(index), FIELDS) for index in range(3)]
+        for age, key in zip((300, 200, 100), keys):
+            cache.put(key, payload)
+            os.utime(cache._path(key), (1_000_000 - age, 1_000_000 - age))
+        # Чтение обновляет время использования самой старой записи.
+        assert cache.get(keys[0]) == payload
+
+        cache.put(ResultCache.make_key("new", FIELDS), payload)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == payload
+        assert cache.get(keys[2]) == payload
+        assert cache.stats()["size_bytes"] <= 3500
+
+    def test_limit_from_megabytes(self, tmp_path):
+        """get_result_cache возвращает общий для папки кэш, max_mb обновляет предел"""
+        cache = get_result_cache(tmp_path / "shared", max_mb=2)
+
+        assert cache is get_result_cache(tmp_path / "shared", max_mb=3)
+        assert cache is shared_store(ResultCache, tmp_path / "shared", 3)
+        assert cache.max_bytes == 3 * 1024 * 1024
+
+
+class TestStaged:
+    """Тесты атомарной записи"""
+
+    def test_failed_write_leaves_nothing(self, cache):
+        """Ошибка во время записи не оставляет ни записи, ни временного файла"""
+        key = ResultCache.make_key("abc", FIELDS)
+
+        with pytest.raises(RuntimeError):
+            with cache.staged(key) as temp:
+                temp.write_text('{"text": ', encoding="utf-8")
+                raise RuntimeError("boom")
+
+        assert entry_files(cache) == []
+        assert cache.get(key) is None
+
+    def test_failed_put_keeps_previous_entry(self, cache):
+        """Несериализуемый результат не портит прежнюю запись"""
+        key = ResultCache.make_key("abc", FIELDS)
+        cache.put(key, {"text": " old"})
+
+        with pytest.raises(TypeError):
+            cache.put(key, {"text": object()})
+
+        assert cache.get(key) == {"text": " old"}
+        assert entry_files(cache) == [f"{key}.json"]
@@ -0,0 +1,191 @@
+"""Тесты поиска пауз в :mod:`vad` на синтетическом аудио."""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from vad import (
+    SAMPLE_RATE,
+    SpeechOffsets,
+    chunk_spans,
+    compact_speech,
+    find_split_points,
+    restore_segments,
+    restore_time,
+    speech_regions,
+)
+
+
+def speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Громкий шум вместо речи."""
+    return np.random.default_rng(seed).uniform(-0.5, 0.5, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+
+def with_pauses(seconds: float, pauses: List[Tuple[float, float]]) -> np.ndarray:
+    """Шум с тишиной в интервалах ``pauses`` (секунды)."""
+    audio = speech(seconds)
+    for start, end in pauses:
+        audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0.0
+    return audio
+
+
+def compact_time(seconds: float, offsets: SpeechOffsets) -> float:
+    """Время исходной записи в сжатом аудио (обратное restore_time)."""
+    sample = seconds * SAMPLE_RATE
+    for compact_start, original_start, length in offsets:
+        if original_start <= sample <= original_start + length:
+            return (compact_start + sample - original_start) / SAMPLE_RATE
+    raise ValueError(seconds)
+
+
+class TestFindSplitPoints:
+    """Тесты find_split_points"""
+
+    def test_points_land_in_pauses(self):
+        """Границы переносятся в паузы рядом с номинальным разрезом"""
+        pauses = [(9.3, 10.3), (19.6, 20.6)]
+        audio = with_pauses(30.0, pauses)
+
+        points = find_split_points(audio, chunk_seconds=10.0, search_seconds=2.0)
+
+        assert points[0] == 0 and points[-1] == len(audio)
+        assert len(points) == 4
+        for point, (start, end) in zip(points[1:-1], pauses):
+            assert start * SAMPLE_RATE <= point <= end * SAMPLE_RATE
+
+    def test_points_stay_near_nominal_cut_without_pauses(self):
+        """Без пауз граница не уходит дальше радиуса поиска"""
+        audio = speech(65.0)
+
+        points = find_split_points(audio, chunk_seconds=20.0, search_seconds=2.0)
+
+        assert points == sorted(set(points))
+        assert points[0] == 0 and points[-1] == len(audio)
+        for previous, point in zip(points[:-2], points[1:-1]):
+            assert abs(point - previous - 20 * SAMPLE_RATE) <= 2 * SAMPLE_RATE + 320
+
+    def test_empty_and_short_audio(self):
+        """Пустое и короткое аудио не режется"""
+        assert find_split_points(np.zeros(0, dtype=np.float32), 10.0) == [0, 0]
+        assert find_split_points(speech(5.0), 10.0) == [0, 5 * SAMPLE_RATE]
+        assert find_split_points(speech(5.0), 0.0) == [0, 5 * SAMPLE_RATE]
+
+    def test_all_silence(self):
+        """Тишина режется на возрастающие границы от начала до конца"""
+        audio = np.zeros(45 * SAMPLE_RATE, dtype=np.float32)
+
+        points = find_split_points(audio, chunk_seconds=10.0)
+
+        assert points[0] == 0 and points[-1] == len(audio)
+        assert all(later > earlier for earlier, later in zip(points, points[1:]))
+
+    def test_short_tail_is_not_split_off(self):
+        """Хвост короче четверти фрагмента присоединяется к последнему"""
+        points = find_split_points(speech(21.0), chunk_seconds=10.0, search_seconds=1.0)
+
+        assert len(points) == 3
+
+
+class TestChunkSpans:
+    """Тесты chunk_spans"""
+
+    def test_overlap_and_clamp(self):
+        """Фрагменты расширяются на перекрытие и обрезаются по краям"""
+        total = 30 * SAMPLE_RATE
+        points = [0, 10 * SAMPLE_RATE, 20 * SAMPLE_RATE, total]
+
+        assert chunk_spans(points, 2.0, total) == [
+            (0, 12 * SAMPLE_RATE),
+            (8 * SAMPLE_RATE, 22 * SAMPLE_RATE),
+            (18 * SAMPLE_RATE, total),
+        ]
+
+    def test_chunks_shorter_than_overlap(self):
+        """Перекрытие длиннее фрагмента дает всю запись"""
+        total = 3 * SAMPLE_RATE
+        points = [0, SAMPLE_RATE, 2 * SAMPLE_RATE, total]
+
+        assert chunk_spans(points, 5.0, total) == [(0, total)] * 3
+        assert chunk_spans([0, 0], 2.0, 0) == [(0, 0)]
+
+
+class TestSpeechCompaction:
+    """Тесты speech_regions, compact_speech и restore_segments"""
+
+    @pytest.fixture
+    def audio(self) -> np.ndarray:
+        """Речь на 1-3 и 6-8 с, тишина вокруг"""
+        return with_pauses(10.0, [(0.0, 1.0), (3.0, 6.0), (8.0, 10.0)])
+
+    def test_regions_cover_speech(self, audio):
+        """Каждая область содержит свой участок речи с отступами"""
+        regions = speech_regions(audio, padding_seconds=0.25)
+
+        assert len(regions) == 2
+        for (start, end), (speech_start, speech_end) in zip(regions, [(1.0, 3.0), (6.0, 8.0)]):
+            assert start <= speech_start * SAMPLE_RATE <= start + 0.3 * SAMPLE_RATE
+            assert end - 0.3 * SAMPLE_RATE <= speech_end * SAMPLE_RATE <= end
+
+    def test_silence_and_empty_audio(self):
+        """Тишина и пустое аудио не дают областей"""
+        assert speech_regions(np.zeros(5 * SAMPLE_RATE, dtype=np.float32)) == []
+        assert speech_regions(np.zeros(0, dtype=np.float32)) == []
+
+    def test_compact_keeps_regions(self, audio):
+        """Сжатое аудио состоит из исходных областей, разделенных паузами"""
+        regions = speech_regions(audio)
+
+        compact, offsets = compact_speech(audio, regions, gap_seconds=0.2)
+
+        gap = int(0.2 * SAMPLE_RATE)
+        assert len(compact) == sum(end - start for start, end in regions) + gap
+        for (compact_start, original_start, length), (start, end) in zip(offsets, regions):
+            assert (original_start, length) == (start, end - start)
+            np.testing.assert_array_equal(compact[compact_start:compact_start + length], audio[start:end])
+
+    def test_restore_round_trip(self, audio):
+        """Время сегментов внутри областей возвращается к исходному"""
+        regions = speech_regions(audio)
+        _, offsets = compact_speech(audio, regions)
+        originals = [(1.5, 2.5), (6.5, 7.75)]
+        segments = [
+            {"id": index, "start": compact_time(start, offsets), "end": compact_time(end, offsets), "text": " x"}
+            for index, (start, end) in enumerate(originals)
+        ]
+
+        restored = restore_segments(segments, offsets)
+
+        assert [(item["start"], item["end"]) for item in restored] == originals
+        assert [item["text"] for item in restored] == [" x", " x"]
+
+    def test_segment_crossing_removed_gap(self, audio):
+        """Сегмент через вырезанную паузу начинается в первой области и кончается во второй"""
+        regions = speech_regions(audio)
+        _, offsets = compact_speech(audio, regions)
+        words = [
+            {"word": " a", "start": compact_time(2.5, offsets), "end": compact_time(2.9, offsets)},
+            {"word": " b", "start": compact_time(6.2, offsets), "end": compact_time(6.6, offsets)},
+        ]
+        segment = {"id": 0, "start": words[0]["start"], "end": words[1]["end"], "words": words}
+
+        (restored,) = restore_segments([segment], offsets)
+
+        assert (restored["start"], restored["end"]) == (2.5, 6.6)
+        assert [(word["start"], word["end"]) for word in restored["words"]] == [(2.5, 2.9), (6.2, 6.6)]
+        assert segment["end"] - segment["start"] < 6.6 - 2.5
+
+    def test_time_inside_inserted_gap_clamps(self, audio):
+        """Время во вставленной паузе прижимается к концу области"""
+        regions = speech_regions(audio)
+        _, offsets = compact_speech(audio, regions, gap_seconds=0.2)
+        first_end = (offsets[0][0] + offsets[0][2]) / SAMPLE_RATE
+
+        assert restore_time(first_end + 0.1, offsets) == round(regions[0][1] / SAMPLE_RATE, 3)
+
+    def test_no_offsets_is_identity(self):
+        """Без смещений время не меняется"""
+        segments = [{"id": 0, "start": 1.25, "end": 2.5, "text": " x"}]
+
+        assert restore_segments(segments, []) == segments
@@ -7,23 +7,54 @@ TSV).
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json
+import time
+import weakref
 
-import torch
-import whisper
+import numpy as np
 
-from config import Config
+from adaptive_decoding import DecodingStats, adaptive_decoding
+from audio_io import AudioBlocks, AudioInput, audio_digest, is_block_stream, is_path, load_audio
+from batch_pipeline import PipelineReport, run_pipeline
+from cascade import is_uncertain, replacement_segments, splice, uncertain_runs
+from config import CascadeConfig, Config
+from cpu_threads import apply_thread_plan, plan_workers
+from instrumentation import JobTimings, StageCallback, instrument_model
+from language_detection import BatchLanguagePolicy, get_language_cache, new_language_stats
+from job_manifest import MANIFEST_NAME, JobManifest
+from model_registry import get_model_registry
+from parallel import plan_chunks, transcribe_chunks
+from result_cache import ResultCache, get_result_cache
+from speculative_decoding import SpeculativeStats, speculative_decoding
 from utils import (
     TranscriptSegment,
     ensure_directory,
     ensure_file_exists,
+    file_digest,
     segments_to_srt,
     segments_to_vtt,
+    srt_block,
+    vtt_block,
     write_text,
     save_json,
 )
+from vad import SAMPLE_RATE, compact_speech, find_split_points, restore_segments, speech_regions, split_stream
+
+if TYPE_CHECKING:
+    import whisper
+
+# torch and whisper take seconds to import; they are only imported once a
+# model is actually needed, so CLI parsing and the non-inference tools
+# start instantly.
+
+#: Characters of already decoded text passed as prompt to the next
+#: streaming window (roughly Whisper's 224 prompt tokens).
+STREAM_PROMPT_CHARS = 600
 
 
 class Transcriber:
@@ -32,6 +63,12 @@ class Transcriber:
     Parameters mirror :class:`config.Config` to keep configuration
     discoverable for GUI and CLI layers. The device is automatically
     selected: CUDA is used when available unless explicitly overridden.
+
+    Models come from the process-wide :mod:`model_registry`, so creating
+    a new instance per job does not reload the weights. Call
+    :meth:`close` (or use the instance as a context manager) to release
+    the model early; otherwise it is released when the instance is
+    garbage collected.
     """
 
     def __init__(
@@ -47,6 +84,26 @@ class Transcriber:
         condition_on_previous_text: bool = True,
         initial_prompt: Optional[str] = None,
         verbose: bool = False,
+        parallel_workers: int = 1,
+        chunk_seconds: float = 300.0,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        cache_max_mb: int = 1024,
+        quantize: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        num_interop_threads: Optional[int] = None,
+        cpu_affinity: Optional[str] = None,
+        language_lock_after: Optional[int] = None,
+        mmap_model: bool = False,
+        skip_silence: bool = False,
+        silence_threshold_db: Optional[float] = None,
+        min_silence_seconds: float = 1.0,
+        adaptive_decoding: bool = False,
+        adaptive_logprob_threshold: float = -0.8,
+        adaptive_compression_ratio_threshold: float = 2.2,
+        cascade: Optional[CascadeConfig] = None,
+        draft_model: Optional[str] = None,
+        draft_tokens: int = 4,
     ) -> None:
         self.config = Config(
             model_size=model_size,
@@ -60,46 +117,719 @@ class Transcriber:
             condition_on_previous_text=condition_on_previous_text,
             initial_prompt=initial_prompt,
             verbose=verbose,
+            parallel_workers=parallel_workers,
+            chunk_seconds=chunk_seconds,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_max_mb=cache_max_mb,
+            quantize=quantize,
+            num_threads=num_threads,
+            num_interop_threads=num_interop_threads,
+            cpu_affinity=cpu_affinity,
+            language_lock_after=language_lock_after,
+            mmap_model=mmap_model,
+            skip_silence=skip_silence,
+            silence_threshold_db=silence_threshold_db,
+            min_silence_seconds=min_silence_seconds,
+            adaptive_decoding=adaptive_decoding,
+            adaptive_logprob_threshold=adaptive_logprob_threshold,
+            adaptive_compression_ratio_threshold=adaptive_compression_ratio_threshold,
+            cascade=cascade,
+            draft_model=draft_model,
+            draft_tokens=draft_tokens,
         )
-        self._model: Optional[whisper.model.Whisper] = None
+        self._model: Optional["whisper.model.Whisper"] = None
+        self._model_key: Optional[Tuple[str, str, str]] = None
+        self._release: Optional[weakref.finalize] = None
+        self.last_stream_stats: Dict[str, Any] = {}
+        self.last_batch_report: Optional[PipelineReport] = None
+        self.last_batch_failures: List[Tuple[Path, str]] = []
+        self.language_stats: Dict[str, Any] = new_language_stats()
+        self.last_silence_stats: Dict[str, Any] = {}
+        self.last_decoding_stats = DecodingStats()
+        self.last_cascade_stats: Dict[str, Any] = {}
+        self._accurate: Optional["Transcriber"] = None
+        self.last_speculative_stats = SpeculativeStats()
+        self._draft: Optional["Transcriber"] = None
+        self.stage_callbacks: List[StageCallback] = []
+        self.last_timings: Optional[JobTimings] = None
+
+    def __enter__(self) -> "Transcriber":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     @property
     def device(self) -> str:
         """Return the selected compute device."""
         if self.config.device:
             return self.config.device
+        if self.config.quantize:
+            return "cpu"
+        import torch
+
         return "cuda" if torch.cuda.is_available() else "cpu"
 
-    def _load_model(self) -> whisper.model.Whisper:
+    def _load_model(self) -> "whisper.model.Whisper":
         if self._model is None:
-            self._model = whisper.load_model(self.config.model_size, device=self.device)
+            if self.config.num_threads or self.config.num_interop_threads or self.config.cpu_affinity:
+                apply_thread_plan(
+                    plan_workers(
+                        1,
+                        self.config.num_threads,
+                        self.config.num_interop_threads,
+                        self.config.cpu_affinity,
+                    )[0]
+                )
+            registry = get_model_registry()
+            key = (self.config.model_size, self.device, self._precision())
+            self._model = registry.acquire(key, lambda: self._build_model(key[1]))
+            self._model_key = key
+            self._release = weakref.finalize(self, registry.release, key)
         return self._model
 
+    def _precision(self) -> str:
+        """Return the precision part of the model registry key."""
+        return self.config.quantize or "fp32"
+
+    def _build_model(self, device: str) -> "whisper.model.Whisper":
+        import whisper
+
+        if self.config.quantize == "int8":
+            from quantization import load_quantized
+
+            return load_quantized(
+                self.config.model_size,
+                lambda: whisper.load_model(self.config.model_size, device="cpu"),
+            )
+        if self.config.mmap_model:
+            from model_snapshot import load_snapshot
+
+            return load_snapshot(
+                self.config.model_size,
+                lambda: whisper.load_model(self.config.model_size, device="cpu"),
+                device=device,
+            )
+        return whisper.load_model(self.config.model_size, device=device)
+
+    def close(self) -> None:
+        """Release the shared model; it stays cached for other instances."""
+        if self._release is not None:
+            self._release()
+        self._release = None
+        self._model = None
+        self._model_key = None
+        if self._accurate is not None:
+            self._accurate.close()
+            self._accurate = None
+        if self._draft is not None:
+            self._draft.close()
+            self._draft = None
+
+    def _decode_options(
+        self,
+        language: Optional[str] = None,
+        task: Optional[str] = None,
+        temperature: Optional[float] = None,
+        beam_size: Optional[int] = None,
+        best_of: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "language": language or self.config.language,
+            "task": task or self.config.task,
+            "temperature": temperature if temperature is not None else self.config.temperature,
+            "beam_size": beam_size if beam_size is not None else self.config.beam_size,
+            "best_of": best_of if best_of is not None else self.config.best_of,
+            "no_speech_threshold": self.config.no_speech_threshold,
+            "condition_on_previous_text": self.config.condition_on_previous_text,
+            "initial_prompt": self.config.initial_prompt,
+            "verbose": self.config.verbose,
+        }
+
+    def _run_model(
+        self,
+        audio: str | np.ndarray,
+        decode_options: Dict[str, Any],
+        timings: Optional[JobTimings] = None,
+    ) -> Dict[str, Any]:
+        model = self._load_model()
+        registry = get_model_registry()
+        with ExitStack() as stack:
+            stack.enter_context(registry.inference_lock(self._model_key))
+            if self.config.adaptive_decoding:
+                stack.enter_context(
+                    adaptive_decoding(
+                        model,
+                        self.last_decoding_stats,
+                        self.config.adaptive_logprob_threshold,
+                        self.config.adaptive_compression_ratio_threshold,
+                        decode_options.get("no_speech_threshold"),
+                    )
+                )
+            if self.config.draft_model:
+                draft = self._draft_transcriber()
+                draft_model = draft._load_model()
+                stack.enter_context(registry.inference_lock(draft._model_key))
+                stack.enter_context(
+                    speculative_decoding(model, draft_model, self.last_speculative_stats, self.config.draft_tokens)
+                )
+            if timings is not None:
+                stack.enter_context(instrument_model(model, timings))
+            return model.transcribe(audio, **decode_options)
+
+    def _draft_transcriber(self) -> "Transcriber":
+        if self._draft is None:
+            options = {
+                **asdict(self.config),
+                "model_size": self.config.draft_model,
+                "draft_model": None,
+                "cascade": None,
+                "parallel_workers": 1,
+                "use_cache": False,
+                "skip_silence": False,
+                "adaptive_decoding": False,
+                "num_threads": None,
+                "num_interop_threads": None,
+                "cpu_affinity": None,
+            }
+            self._draft = load_config_from_dict(options)
+        return self._draft
+
+    def _resolve_language(
+        self,
+        audio: np.ndarray,
+        digest: Optional[str],
+        decode_options: Dict[str, Any],
+        policy: Optional[BatchLanguagePolicy] = None,
+        detect: bool = True,
+    ) -> Dict[str, float]:
+        """Fill in ``decode_options["language"]`` before inference.
+
+        The language comes from the batch ``policy`` once it is locked,
+        from the per-model and per-content :mod:`language_detection`
+        cache, or from a detection on the first window. With ``detect``
+        false a cache miss leaves the language unset (the parallel path
+        detects it in a worker instead). Returns per-file timings: the
+        detection time or the estimated time saved by skipping it.
+        """
+        if decode_options["language"]:
+            return {}
+        stats = self.language_stats
+        average = stats["detect_seconds"] / stats["detections"] if stats["detections"] else 0.0
+        if policy is not None and policy.language:
+            decode_options["language"] = policy.language
+            stats["policy_hits"] += 1
+            stats["saved_seconds"] += average
+            return {"language_saved": round(average, 3)}
+
+        cache = get_language_cache()
+        cached = cache.get(self.config.model_size, digest) if digest else None
+        if cached is not None:
+            language = cached.language
+            stats["cache_hits"] += 1
+            stats["saved_seconds"] += average
+            timings = {"language_saved": round(average, 3)}
+        elif not detect:
+            return {}
+        else:
+            from language_detection import detect_language
+
+            model = self._load_model()
+            begin = time.perf_counter()
+            with get_model_registry().inference_lock(self._model_key):
+                language, probability = detect_language(model, audio)
+            elapsed = time.perf_counter() - begin
+            self._remember_language(digest, language, probability, elapsed)
+            timings = {"language_detect": round(elapsed, 3)}
+        if policy is not None:
+            policy.observe(language)
+        decode_options["language"] = language
+        return timings
+
+    def _remember_language(self, digest: Optional[str], language: str, probability: float, seconds: float) -> None:
+        if digest:
+            get_language_cache().put(self.config.model_size, digest, language, probability)
+        self.language_stats["detections"] += 1
+        self.language_stats["detect_seconds"] += seconds
+
     def transcribe(
         self,
-        audio_path: str | Path,
+        audio: AudioInput,
         *,
+        sample_rate: Optional[int] = None,
         language: Optional[str] = None,
         task: Optional[str] = None,
         temperature: Optional[float] = None,
         beam_size: Optional[int] = None,
         best_of: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Transcribe ``audio_path`` returning Whisper's raw result."""
-        audio_file = ensure_file_exists(audio_path)
+        """Transcribe ``audio`` returning Whisper's raw result.
+
+        ``audio`` is a file path or in-memory audio: a sample array, raw
+        PCM bytes (with ``sample_rate``), encoded bytes or a binary
+        file-like object (see :mod:`audio_io`). In-memory input is decoded
+        without a temporary file.
+
+        With ``parallel_workers > 1`` long recordings are split at pauses
+        and transcribed in a process pool (see :mod:`parallel`). When
+        ``use_cache`` is enabled a previous result for the same audio
+        content and decoding options is returned without inference.
+
+        With ``skip_silence`` silent stretches are removed before decoding
+        and segment timestamps are mapped back to the original recording;
+        ``last_silence_stats`` reports the skipped fraction and the
+        estimated wall-clock time saved. With ``adaptive_decoding`` windows
+        are decoded greedily and re-decoded with beam search only when
+        unreliable; ``last_decoding_stats`` counts the escalations. With
+        ``cascade`` low-confidence segments are re-transcribed by the
+        accurate model (see :mod:`cascade`, ``last_cascade_stats``). With
+        ``draft_model`` greedy windows are decoded speculatively (see
+        :mod:`speculative_decoding`); ``last_speculative_stats`` reports
+        the throughput in tokens per second.
+
+        The result carries a ``timings`` record (see :mod:`instrumentation`,
+        also kept as ``last_timings``): seconds per stage, real-time
+        factor, decoder tokens/sec and peak memory. Callables appended to
+        ``stage_callbacks`` receive ``(stage, seconds)`` as stages finish.
+        """
+        self.last_decoding_stats = DecodingStats()
+        self.last_speculative_stats = SpeculativeStats()
+        timings = JobTimings(self.stage_callbacks)
+        self.last_timings = timings
+        if is_path(audio):
+            source: Path | np.ndarray = ensure_file_exists(Path(audio))
+        else:
+            with timings.stage("audio_decode"):
+                source = load_audio(audio, sample_rate)
+        decode_options = self._decode_options(language, task, temperature, beam_size, best_of)
+        cache = self.result_cache
+        cache_key = None
+        digest = None
+        if cache is not None:
+            with timings.stage("cache_lookup"):
+                digest = file_digest(source) if isinstance(source, Path) else audio_digest(source)
+                cache_key = cache.make_key(digest, self._cache_fields(decode_options))
+                cached = cache.get(cache_key)
+            if cached is not None:
+                timings.finish()
+                return {**cached, "timings": timings.as_dict()}
+
+        if isinstance(source, Path):
+            # Decoded here rather than inside ``whisper.transcribe`` (which
+            # runs the same loader) so decoding is timed on its own.
+            if self.config.skip_silence or decode_options["language"] is None:
+                digest = digest or file_digest(source)
+            with timings.stage("audio_decode"):
+                source = load_audio(source)
+        if self.config.parallel_workers > 1 and decode_options["language"] is None:
+            digest = digest or audio_digest(source)
+            self._resolve_language(source, digest, decode_options, detect=False)
+        return self._transcribe_waveform(source, decode_options, timings, digest, cache_key)
+
+    def _transcribe_waveform(
+        self,
+        waveform: np.ndarray,
+        decode_options: Dict[str, Any],
+        timings: JobTimings,
+        digest: Optional[str] = None,
+        cache_key: Optional[str] = None,
+        policy: Optional[BatchLanguagePolicy] = None,
+    ) -> Dict[str, Any]:
+        """Run everything :meth:`transcribe` does after decoding and the cache lookup.
+
+        ``digest`` identifies the content for language detection (computed
+        from the samples when missing); the result is stored in the result
+        cache under ``cache_key`` when given. With ``parallel_workers > 1``
+        no model is loaded in this process: a missing language is detected
+        by the first pool worker and reported to ``policy``.
+        """
+        cache = self.result_cache if cache_key is not None else None
+        source = waveform
+        timings.audio_seconds = len(waveform) / SAMPLE_RATE
+
+        offsets = None
+        if self.config.skip_silence:
+            digest = digest or audio_digest(source)
+            with timings.stage("silence_scan"):
+                source, offsets = self._drop_silence(source)
+            if not offsets:
+                result = {"text": "", "segments": [], "language": decode_options["language"]}
+                if cache is not None:
+                    cache.put(cache_key, result)
+                timings.finish()
+                return {**result, "timings": timings.as_dict()}
+
+        parallel = self.config.parallel_workers > 1
+        if self._model is None and not parallel:
+            with timings.stage("model_load"):
+                self._load_model()
+                if self.config.draft_model:
+                    self._draft_transcriber()._load_model()
+        if decode_options["language"] is None and not parallel:
+            detected = self._resolve_language(source, digest or audio_digest(source), decode_options)
+            if "language_detect" in detected:
+                timings.add("language_detect", detected["language_detect"])
+
+        begin = time.perf_counter()
+        if parallel:
+            with timings.stage("inference"):
+                result = self.transcribe_parallel(source, decode_options=decode_options)
+            detection = result.pop("language_detection", None)
+            if detection is not None:
+                timings.add("language_detect", detection["seconds"])
+                self._remember_language(
+                    digest or audio_digest(waveform), detection["language"], detection["probability"], detection["seconds"]
+                )
+                if policy is not None:
+                    policy.observe(detection["language"])
+        else:
+            result = self._run_model(source, decode_options, timings)
+        if offsets is not None:
+            result = self._restore_silence(result, offsets, time.perf_counter() - begin)
+        if self.config.cascade is not None:
+            with timings.stage("cascade"):
+                result = self._cascade(result, waveform, decode_options, time.perf_counter() - begin)
+
+        if cache is not None:
+            cache.put(cache_key, result)
+        timings.finish()
+        return {**result, "timings": timings.as_dict()}
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Return the shared result cache or ``None`` when disabled."""
+        if not self.config.use_cache:
+            return None
+        return get_result_cache(self.config.cache_dir, self.config.cache_max_mb)
+
+    def _cache_fields(self, decode_options: Dict[str, Any]) -> Dict[str, Any]:
+        fields = {
+            "model_size": self.config.model_size,
+            "language": decode_options["language"],
+            "task": decode_options["task"],
+            "beam_size": decode_options["beam_size"],
+            "best_of": decode_options["best_of"],
+            "temperature": decode_options["temperature"],
+            "initial_prompt": decode_options["initial_prompt"],
+            "no_speech_threshold": decode_options["no_speech_threshold"],
+            "condition_on_previous_text": decode_options["condition_on_previous_text"],
+        }
+        if self.config.parallel_workers > 1:
+            fields["chunk_seconds"] = self.config.chunk_seconds
+        if self.config.quantize:
+            fields["quantize"] = self.config.quantize
+        if self.config.skip_silence:
+            fields["skip_silence"] = [self.config.silence_threshold_db, self.config.min_silence_seconds]
+        if self.config.adaptive_decoding:
+            fields["adaptive"] = [
+                self.config.adaptive_logprob_threshold,
+                self.config.adaptive_compression_ratio_threshold,
+            ]
+        if self.config.cascade is not None:
+            fields["cascade"] = asdict(self.config.cascade)
+        return fields
+
+    def _drop_silence(self, audio: np.ndarray) -> Tuple[np.ndarray, List[Tuple[int, int, int]]]:
+        """Cut silent stretches out of ``audio`` (see :mod:`vad`).
+
+        Returns the compacted speech and the offsets mapping it back;
+        ``last_silence_stats`` records how much audio was skipped.
+        """
+        begin = time.perf_counter()
+        regions = speech_regions(
+            audio,
+            threshold_db=self.config.silence_threshold_db,
+            min_silence_seconds=self.config.min_silence_seconds,
+        )
+        speech, offsets = compact_speech(audio, regions)
+        total = len(audio) / SAMPLE_RATE
+        kept = sum(end - start for start, end in regions) / SAMPLE_RATE
+        self.last_silence_stats = {
+            "audio_seconds": round(total, 3),
+            "speech_seconds": round(kept, 3),
+            "regions": len(regions),
+            "skipped_fraction": round(1 - kept / total, 4) if total else 0.0,
+            "prepass_seconds": round(time.perf_counter() - begin, 4),
+            "inference_seconds": 0.0,
+            "saved_seconds": 0.0,
+        }
+        return speech, offsets
+
+    def _accurate_transcriber(self) -> "Transcriber":
+        if self._accurate is None:
+            cascade = self.config.cascade
+            options = {
+                **asdict(self.config),
+                "model_size": cascade.accurate_model,
+                "beam_size": cascade.beam_size,
+                "best_of": max(self.config.best_of, cascade.beam_size),
+                "cascade": None,
+                "draft_model": None,
+                "parallel_workers": 1,
+                "use_cache": False,
+                "skip_silence": False,
+            }
+            self._accurate = load_config_from_dict(options)
+        return self._accurate
+
+    def _cascade(
+        self,
+        result: Dict[str, Any],
+        audio: np.ndarray,
+        decode_options: Dict[str, Any],
+        fast_seconds: float,
+    ) -> Dict[str, Any]:
+        """Re-transcribe low-confidence segments with the accurate model.
+
+        ``last_cascade_stats`` reports how many segments and which fraction
+        of the audio were escalated and the time spent by each model.
+        """
+        cascade = self.config.cascade
+        segments = result.get("segments", [])
+        flags = [is_uncertain(segment, cascade, self.config.no_speech_threshold) for segment in segments]
+        runs = uncertain_runs(flags)
+        total = len(audio) / SAMPLE_RATE
+        stats: Dict[str, Any] = {
+            "fast_model": self.config.model_size,
+            "accurate_model": cascade.accurate_model,
+            "segments": len(segments),
+            "escalated_segments": sum(flags),
+            "audio_seconds": round(total, 3),
+            "escalated_seconds": 0.0,
+            "escalated_fraction": 0.0,
+            "fast_seconds": round(fast_seconds, 3),
+            "accurate_seconds": 0.0,
+        }
+        self.last_cascade_stats = stats
+        if not runs:
+            return result
+
+        accurate = self._accurate_transcriber()
+        options = {
+            **decode_options,
+            "language": decode_options["language"] or result.get("language"),
+            "beam_size": cascade.beam_size,
+            "best_of": max(self.config.best_of, cascade.beam_size),
+        }
+        begin = time.perf_counter()
+        replacements = []
+        for first, last in runs:
+            start, end = segments[first]["start"], segments[last - 1]["end"]
+            low = max(0.0, start - cascade.padding_seconds)
+            high = min(total, end + cascade.padding_seconds)
+            run_options = dict(options)
+            if self.config.condition_on_previous_text and first:
+                previous = "".join(segment["text"] for segment in segments[:first])
+                run_options["initial_prompt"] = previous[-STREAM_PROMPT_CHARS:]
+            part = accurate._run_model(audio[int(low * SAMPLE_RATE):int(high * SAMPLE_RATE)], run_options)
+            replacements.append((first, last, replacement_segments(part.get("segments", []), low, start, end)))
+            stats["escalated_seconds"] += end - start
+        stats["accurate_seconds"] = round(time.perf_counter() - begin, 3)
+        stats["escalated_seconds"] = round(stats["escalated_seconds"], 3)
+        stats["escalated_fraction"] = round(stats["escalated_seconds"] / total, 4) if total else 0.0
+
+        spliced = splice([dict(segment) for segment in segments], replacements)
+        return {**result, "segments": spliced, "text": "".join(segment["text"] for segment in spliced)}
+
+    def _restore_silence(
+        self, result: Dict[str, Any], offsets: List[Tuple[int, int, int]], inference_seconds: float
+    ) -> Dict[str, Any]:
+        """Map ``result`` back to original time and record the time saved."""
+        stats = self.last_silence_stats
+        speech = stats["speech_seconds"]
+        # Inference time grows linearly with audio length, so the skipped
+        # part would have cost proportionally as much as the decoded one.
+        stats["inference_seconds"] = round(inference_seconds, 3)
+        if speech:
+            skipped = stats["audio_seconds"] - stats["speech_seconds"]
+            stats["saved_seconds"] = round(inference_seconds * skipped / speech - stats["prepass_seconds"], 3)
+        return {**result, "segments": restore_segments(result.get("segments", []), offsets)}
+
+    def transcribe_parallel(
+        self,
+        audio: AudioInput,
+        *,
+        sample_rate: Optional[int] = None,
+        workers: Optional[int] = None,
+        decode_options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Transcribe a long recording in chunks across worker processes.
+
+        ``audio`` accepts the same inputs as :meth:`transcribe`. Recordings
+        shorter than one chunk are transcribed in-process.
+        """
+        audio = load_audio(audio, sample_rate)
+        decode_options = decode_options or self._decode_options()
+        points, spans = plan_chunks(audio, self.config.chunk_seconds)
+        if len(spans) == 1:
+            return self._run_model(audio, decode_options)
+        return transcribe_chunks(
+            audio,
+            points,
+            spans,
+            asdict(self.config),
+            decode_options,
+            workers=workers or self.config.parallel_workers,
+        )
+
+    def transcribe_batch(
+        self,
+        paths: Iterable[str | Path],
+        *,
+        batch_size: int = 8,
+        decode_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Transcribe many short files, packing their windows into batches.
+
+        Clips that fit one 30-second window are decoded ``batch_size`` at a
+        time with a single encoder/decoder pass (see
+        :mod:`batched_inference`); longer files, and every file when
+        ``skip_silence``, ``adaptive_decoding``, ``cascade`` or
+        ``draft_model`` is set, go through the regular per-file path. The
+        next group is decoded from disk while the current one runs. Results are returned in input order. With
+        ``language_lock_after`` the batch language is fixed once enough
+        clips agreed on it.
+        """
+        files = [ensure_file_exists(path) for path in paths]
+        decode_options = self._decode_options()
+        cache = self.result_cache
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        keys: List[Optional[str]] = [None] * len(files)
+        digests: List[Optional[str]] = [None] * len(files)
+        if cache is not None:
+            fields = self._cache_fields(decode_options)
+            for index, path in enumerate(files):
+                digests[index] = file_digest(path)
+                keys[index] = cache.make_key(digests[index], fields)
+                results[index] = cache.get(keys[index])
+
+        from batched_inference import decode_batch, fits_single_window
+
+        todo = [index for index, result in enumerate(results) if result is None]
+        groups = [todo[start:start + max(1, batch_size)] for start in range(0, len(todo), max(1, batch_size))]
+        if not groups:
+            return results  # type: ignore[return-value]
+
         model = self._load_model()
-        return model.transcribe(
-            str(audio_file),
-            language=language or self.config.language,
-            task=task or self.config.task,
-            temperature=temperature if temperature is not None else self.config.temperature,
-            beam_size=beam_size if beam_size is not None else self.config.beam_size,
-            best_of=best_of if best_of is not None else self.config.best_of,
-            no_speech_threshold=self.config.no_speech_threshold,
-            condition_on_previous_text=self.config.condition_on_previous_text,
-            initial_prompt=self.config.initial_prompt,
-            verbose=self.config.verbose,
+        policy = BatchLanguagePolicy(self.config.language_lock_after) if self.config.language_lock_after else None
+        # decode_batch only batches the decoding; clips needing the rest of
+        # the pipeline take the regular per-file path.
+        batchable = not (
+            self.config.skip_silence
+            or self.config.adaptive_decoding
+            or self.config.cascade is not None
+            or self.config.draft_model
         )
+        with ThreadPoolExecutor(max_workers=max(1, decode_workers)) as pool:
+            upcoming = [pool.submit(load_audio, files[index]) for index in groups[0]]
+            for position, group in enumerate(groups):
+                audios = [future.result() for future in upcoming]
+                if position + 1 < len(groups):
+                    upcoming = [pool.submit(load_audio, files[index]) for index in groups[position + 1]]
+
+                options = dict(decode_options)
+                if policy is not None and policy.language and not options["language"]:
+                    options["language"] = policy.language
+                    self.language_stats["policy_hits"] += len(group)
+                    if cache is not None:
+                        # The locked language was not detected for these
+                        # files: store them under the language they were
+                        # decoded with, not as the answer for ``language=None``.
+                        fields = self._cache_fields(options)
+                        for index in group:
+                            keys[index] = cache.make_key(digests[index], fields)
+                short = [
+                    (index, audio) for index, audio in zip(group, audios) if batchable and fits_single_window(audio)
+                ]
+                batched = {index for index, _ in short}
+                for index, audio in zip(group, audios):
+                    if index not in batched:
+                        result = self._transcribe_waveform(audio, dict(options), JobTimings(self.stage_callbacks))
+                        results[index] = {key: value for key, value in result.items() if key != "timings"}
+                if short:
+                    with get_model_registry().inference_lock(self._model_key):
+                        decoded = decode_batch(model, [audio for _, audio in short], options)
+                    for (index, _), result in zip(short, decoded):
+                        results[index] = result
+                if policy is not None:
+                    for index in group:
+                        policy.observe(results[index].get("language"))
+
+                if cache is not None:
+                    for index in group:
+                        cache.put(keys[index], results[index])
+        return results  # type: ignore[return-value]
+
+    def transcribe_stream(
+        self,
+        audio: Union[AudioInput, AudioBlocks],
+        *,
+        sample_rate: Optional[int] = None,
+        language: Optional[str] = None,
+        task: Optional[str] = None,
+        temperature: Optional[float] = None,
+        beam_size: Optional[int] = None,
+        best_of: Optional[int] = None,
+        window_seconds: float = 30.0,
+    ) -> Iterator[TranscriptSegment]:
+        """Yield transcript segments window by window as they are decoded.
+
+        ``audio`` accepts the same inputs as :meth:`transcribe` or an
+        iterable of sample blocks such as
+        :func:`video_processor.stream_audio`; blocks are consumed as
+        windows fill, so memory stays bounded for arbitrarily long input.
+        The audio is cut at pauses into ~``window_seconds`` windows that
+        are decoded one at a time; the language detected in the first
+        window is reused for the rest. ``last_stream_stats`` records the
+        audio duration, time-to-first-segment, window/segment counts and
+        total time.
+        """
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {
+            "time_to_first_segment": None,
+            "windows": 0,
+            "segments": 0,
+            "elapsed": 0.0,
+            "audio_seconds": 0.0,
+        }
+        self.last_stream_stats = stats
+        self.last_decoding_stats = DecodingStats()
+        decode_options = self._decode_options(language, task, temperature, beam_size, best_of)
+        search_seconds = window_seconds / 6
+        if is_block_stream(audio):
+            blocks = (load_audio(block, sample_rate) for block in audio)
+            windows = split_stream(blocks, window_seconds, search_seconds=search_seconds)
+        else:
+            audio = load_audio(audio, sample_rate)
+            stats["audio_seconds"] = len(audio) / SAMPLE_RATE
+            if decode_options["language"] is None:
+                self._resolve_language(audio, audio_digest(audio), decode_options)
+            points = find_split_points(audio, window_seconds, search_seconds=search_seconds)
+            windows = ((start, audio[start:end]) for start, end in zip(points[:-1], points[1:]))
+        previous_text = ""
+        for start, window in windows:
+            if decode_options["language"] is None:
+                self._resolve_language(window, None, decode_options)
+            options = dict(decode_options)
+            if self.config.condition_on_previous_text and previous_text:
+                options["initial_prompt"] = previous_text
+            result = self._run_model(window, options)
+            decode_options["language"] = decode_options["language"] or result.get("language")
+            stats["windows"] += 1
+            stats["audio_seconds"] = max(stats["audio_seconds"], (start + len(window)) / SAMPLE_RATE)
+            offset = start / SAMPLE_RATE
+            for segment in result.get("segments", []):
+                if stats["time_to_first_segment"] is None:
+                    stats["time_to_first_segment"] = time.perf_counter() - started
+                stats["segments"] += 1
+                yield TranscriptSegment(
+                    start=segment["start"] + offset,
+                    end=segment["end"] + offset,
+                    text=segment["text"].strip(),
+                )
+            previous_text = (previous_text + result.get("text", ""))[-STREAM_PROMPT_CHARS:]
+            stats["elapsed"] = time.perf_counter() - started
 
     def _segments_from_result(self, result: Dict[str, Any]) -> List[TranscriptSegment]:
         return [
@@ -107,11 +837,28 @@ class Transcriber:
             for segment in result.get("segments", [])
         ]
 
-    def save_output(self, result: Dict[str, Any], output: str | Path, format: str = "txt") -> Path:
-        """Persist a transcription result in a human friendly format."""
+    def save_output(
+        self,
+        result: Union[Dict[str, Any], Iterable[TranscriptSegment]],
+        output: str | Path,
+        format: str = "txt",
+    ) -> Path:
+        """Persist a transcription result in a human friendly format.
+
+        ``result`` is either Whisper's result dictionary or an iterable of
+        :class:`TranscriptSegment` (e.g. :meth:`transcribe_stream`), which
+        is written to disk incrementally as segments arrive. The write time
+        is added to the ``timings`` of a result from :meth:`transcribe`.
+        """
         output_path = Path(output)
         ensure_directory(output_path.parent)
         format_lower = format.lower()
+        if format_lower not in {"txt", "json", "srt", "vtt", "tsv"}:
+            raise ValueError(f"Неизвестный формат вывода: {format}")
+        if not isinstance(result, dict):
+            return self._save_stream(result, output_path, format_lower)
+
+        begin = time.perf_counter()
         segments = self._segments_from_result(result)
 
         if format_lower == "txt":
@@ -127,21 +874,178 @@ class Transcriber:
             for segment in segments:
                 lines.append(f"{segment.start}\t{segment.end}\t{segment.text}")
             write_text(output_path, "\n".join(lines) + "\n")
-        else:
-            raise ValueError(f"Неизвестный формат вывода: {format}")
 
+        if self.last_timings is not None and "timings" in result:
+            self.last_timings.add("output_write", time.perf_counter() - begin)
+            result["timings"] = self.last_timings.as_dict()
         return output_path
 
-    def batch_transcribe(self, paths: Iterable[str | Path], output_dir: str | Path) -> List[Path]:
-        """Transcribe multiple files saving TXT outputs in ``output_dir``."""
+    def _save_stream(self, segments: Iterable[TranscriptSegment], output_path: Path, format_lower: str) -> Path:
+        with output_path.open("w", encoding="utf-8") as f:
+            if format_lower == "vtt":
+                f.write("WEBVTT\n")
+            elif format_lower == "tsv":
+                f.write("start\tend\ttext\n")
+            elif format_lower == "json":
+                f.write('{"segments": [')
+            texts: List[str] = []
+            for index, segment in enumerate(segments, start=1):
+                if format_lower == "txt":
+                    f.write(("" if index == 1 else " ") + segment.text.strip())
+                elif format_lower == "json":
+                    f.write(("\n  " if index == 1 else ",\n  ") + json.dumps(asdict(segment), ensure_ascii=False))
+                    texts.append(segment.text.strip())
+                elif format_lower == "srt":
+                    f.write(("" if index == 1 else "\n") + srt_block(index, segment))
+                elif format_lower == "vtt":
+                    f.write("\n" + vtt_block(segment))
+                else:
+                    f.write(f"{segment.start}\t{segment.end}\t{segment.text.strip()}\n")
+                f.flush()
+            if format_lower == "txt":
+                f.write("\n")
+            elif format_lower == "json":
+                f.write("\n], " + json.dumps({"text": " ".join(texts)}, ensure_ascii=False)[1:] + "\n")
+        return output_path
+
+    def batch_transcribe(
+        self,
+        paths: Iterable[str | Path],
+        output_dir: str | Path,
+        *,
+        decode_workers: int = 2,
+        queue_size: int = 4,
+        preserve_order: bool = True,
+        manifest: Optional[str | Path] = None,
+        resume: bool = True,
+    ) -> List[Path]:
+        """Transcribe multiple files saving TXT outputs in ``output_dir``.
+
+        Decoding of upcoming files, inference and writing run as an
+        overlapped pipeline (see :mod:`batch_pipeline`); per-stage
+        utilisation is stored in ``last_batch_report``.
+
+        Progress is checkpointed in a :class:`job_manifest.JobManifest`
+        (``manifest`` or ``output_dir/voicebox_manifest.sqlite3``). With
+        ``resume`` a rerun skips files already done and retries failed or
+        interrupted ones. A failing file does not stop the batch: its error
+        is recorded in the manifest and in ``last_batch_failures``.
+
+        Without a configured language it is detected once per file content
+        (cached) and, with ``language_lock_after``, fixed for the rest of
+        the batch after that many files agreed. The detection time or the
+        time saved is stored in the per-file manifest timings
+        (``language_detect`` / ``language_saved``); totals are in
+        ``language_stats``.
+
+        Every file goes through the same steps as :meth:`transcribe`
+        (result cache, ``skip_silence``, ``parallel_workers``, cascade);
+        its stage timings are stored under ``stages`` in the manifest.
+        """
         output_root = ensure_directory(output_dir)
-        saved: List[Path] = []
-        for path in paths:
-            audio_path = ensure_file_exists(path)
-            result = self.transcribe(audio_path)
-            output_path = output_root / f"{audio_path.stem}.txt"
-            saved.append(self.save_output(result, output_path, format="txt"))
-        return saved
+        decode_options = self._decode_options()
+        self.last_decoding_stats = DecodingStats()
+        inputs = [Path(path).expanduser().resolve() for path in paths]
+        outputs: Dict[str, Path] = {}
+        policy = BatchLanguagePolicy(self.config.language_lock_after) if self.config.language_lock_after else None
+        parallel = self.config.parallel_workers > 1
+        cache = self.result_cache
+        timings: Dict[str, Dict[str, Any]] = {}
+        failures: List[Tuple[Path, str]] = []
+        self.last_batch_failures = failures
+
+        def fail(path: Path, exc: Exception) -> None:
+            message = f"{type(exc).__name__}: {exc}"
+            journal.mark_failed(str(path), message, timings.get(str(path)))
+            failures.append((path, message))
+
+        # (audio, content digest, result-cache key, cached result)
+        Decoded = Tuple[Optional[np.ndarray], Optional[str], Optional[str], Optional[Dict[str, Any]]]
+
+        def decode(path: Path) -> Optional[Decoded]:
+            journal.mark_running(str(path))
+            begin = time.perf_counter()
+            key = None
+            try:
+                digest = file_digest(path) if cache is not None or decode_options["language"] is None else None
+                if cache is not None:
+                    key = cache.make_key(digest, self._cache_fields(decode_options))
+                    cached = cache.get(key)
+                    if cached is not None:
+                        timings[str(path)] = {"cache_lookup": round(time.perf_counter() - begin, 3)}
+                        return None, digest, key, cached
+                audio = load_audio(path)
+            except Exception as exc:  # noqa: BLE001 - recorded in the manifest
+                fail(path, exc)
+                return None
+            timings[str(path)] = {"decode": round(time.perf_counter() - begin, 3)}
+            return audio, digest, key, None
+
+        def infer(path: Path, decoded: Optional[Decoded]) -> Optional[Dict[str, Any]]:
+            if decoded is None:
+                return None
+            audio, digest, key, cached = decoded
+            if audio is None:
+                return cached
+            options = dict(decode_options)
+            job = JobTimings(self.stage_callbacks)
+            job.add("audio_decode", timings[str(path)]["decode"])
+            begin = time.perf_counter()
+            try:
+                locked = policy is not None and policy.language is not None and not options["language"]
+                detected = self._resolve_language(audio, digest, options, policy, detect=not parallel)
+                if locked and key is not None and digest is not None:
+                    # Same as in ``transcribe_batch``: a language taken from
+                    # the batch policy must not answer ``language=None``.
+                    key = cache.make_key(digest, self._cache_fields(options))
+                timings[str(path)].update(detected)
+                if "language_detect" in detected:
+                    job.add("language_detect", detected["language_detect"])
+                result = self._transcribe_waveform(audio, options, job, digest, key, policy)
+            except Exception as exc:  # noqa: BLE001 - recorded in the manifest
+                fail(path, exc)
+                return None
+            timings[str(path)]["inference"] = round(time.perf_counter() - begin, 3)
+            timings[str(path)]["stages"] = result["timings"]["stages"]
+            return result
+
+        def write(path: Path, result: Optional[Dict[str, Any]]) -> Optional[Path]:
+            if result is None:
+                return None
+            begin = time.perf_counter()
+            try:
+                output = self.save_output(result, output_root / f"{path.stem}.txt", format="txt")
+            except Exception as exc:  # noqa: BLE001 - recorded in the manifest
+                fail(path, exc)
+                return None
+            timings[str(path)]["write"] = round(time.perf_counter() - begin, 3)
+            journal.mark_done(str(path), output, timings[str(path)])
+            outputs[str(path)] = output
+            return output
+
+        # The stages above write to ``journal``; it is only bound (and its
+        # connection only open) inside this block.
+        with JobManifest(manifest or output_root / MANIFEST_NAME) as journal:
+            journal.register([str(path) for path in inputs])
+            if resume:
+                for path in inputs:
+                    finished = journal.completed_output(str(path))
+                    if finished is not None:
+                        outputs[str(path)] = finished
+            skipped = dict(outputs)
+            todo = [path for path in inputs if str(path) not in skipped]
+            saved, self.last_batch_report = run_pipeline(
+                todo,
+                decode,
+                infer,
+                write,
+                decode_workers=decode_workers,
+                queue_size=queue_size,
+                preserve_order=preserve_order,
+            )
+        if preserve_order:
+            return [outputs[str(path)] for path in inputs if str(path) in outputs]
+        return list(skipped.values()) + [path for path in saved if path is not None]
 
 
 def load_config_from_dict(options: Dict[str, Any]) -> Transcriber:
@@ -159,4 +1063,24 @@ def load_config_from_dict(options: Dict[str, Any]) -> Transcriber:
         condition_on_previous_text=config.condition_on_previous_text,
         initial_prompt=config.initial_prompt,
         verbose=config.verbose,
+        parallel_workers=config.parallel_workers,
+        chunk_seconds=config.chunk_seconds,
+        use_cache=config.use_cache,
+        cache_dir=config.cache_dir,
+        cache_max_mb=config.cache_max_mb,
+        quantize=config.quantize,
+        num_threads=config.num_threads,
+        num_interop_threads=config.num_interop_threads,
+        cpu_affinity=config.cpu_affinity,
+        language_lock_after=config.language_lock_after,
+        mmap_model=config.mmap_model,
+        skip_silence=config.skip_silence,
+        silence_threshold_db=config.silence_threshold_db,
+        min_silence_seconds=config.min_silence_seconds,
+        adaptive_decoding=config.adaptive_decoding,
+        adaptive_logprob_threshold=config.adaptive_logprob_threshold,
+        adaptive_compression_ratio_threshold=config.adaptive_compression_ratio_threshold,
+        cascade=config.cascade,
+        draft_model=config.draft_model,
+        draft_tokens=config.draft_tokens,
     )
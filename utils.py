@@ -7,8 +7,10 @@ simple so they work in offline environments and are easy to unit test.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Sequence
+import hashlib
 import json
 import shutil
 
@@ -56,29 +58,30 @@ class TranscriptSegment:
     text: str
 
 
+def srt_block(index: int, segment: TranscriptSegment) -> str:
+    """Render a single numbered SRT cue (terminated by a newline)."""
+    start_ts = format_timestamp(segment.start)
+    end_ts = format_timestamp(segment.end)
+    return f"{index}\n{start_ts} --> {end_ts}\n{segment.text.strip()}\n"
+
+
+def vtt_block(segment: TranscriptSegment) -> str:
+    """Render a single VTT cue (terminated by a newline)."""
+    start_ts = format_timestamp(segment.start).replace(",", ".")
+    end_ts = format_timestamp(segment.end).replace(",", ".")
+    return f"{start_ts} --> {end_ts}\n{segment.text.strip()}\n"
+
+
 def segments_to_srt(segments: Sequence[TranscriptSegment]) -> str:
     """Render transcript segments into SRT formatted text."""
-    lines: List[str] = []
-    for index, segment in enumerate(segments, start=1):
-        start_ts = format_timestamp(segment.start)
-        end_ts = format_timestamp(segment.end)
-        lines.append(str(index))
-        lines.append(f"{start_ts} --> {end_ts}")
-        lines.append(segment.text.strip())
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+    blocks = [srt_block(index, segment) for index, segment in enumerate(segments, start=1)]
+    return "\n".join(blocks) if blocks else "\n"
 
 
 def segments_to_vtt(segments: Sequence[TranscriptSegment]) -> str:
     """Render transcript segments into VTT formatted text."""
-    lines: List[str] = ["WEBVTT", ""]
-    for segment in segments:
-        start_ts = format_timestamp(segment.start).replace(",", ".")
-        end_ts = format_timestamp(segment.end).replace(",", ".")
-        lines.append(f"{start_ts} --> {end_ts}")
-        lines.append(segment.text.strip())
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+    blocks = [vtt_block(segment) for segment in segments]
+    return "WEBVTT\n\n" + "\n".join(blocks) if blocks else "WEBVTT\n"
 
 
 def save_json(path: Path, payload: object) -> None:
@@ -87,6 +90,15 @@ def save_json(path: Path, payload: object) -> None:
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def read_text(path: Path) -> str:
     """Read a UTF-8 text file."""
     return Path(path).read_text(encoding="utf-8")
@@ -98,8 +110,13 @@ def write_text(path: Path, content: str) -> None:
     Path(path).write_text(content, encoding="utf-8")
 
 
+@lru_cache(maxsize=None)
 def detect_ffmpeg() -> str:
-    """Return the detected ffmpeg binary path or raise an error."""
+    """Return the detected ffmpeg binary path or raise an error.
+
+    The lookup is cached; a failed lookup is not, so installing FFmpeg
+    while the application runs is picked up on the next call.
+    """
     executable = shutil.which("ffmpeg")
     if not executable:
         raise EnvironmentError(
@@ -108,6 +125,17 @@ def detect_ffmpeg() -> str:
     return executable
 
 
+@lru_cache(maxsize=None)
+def detect_ffprobe() -> str:
+    """Return the detected ffprobe binary path or raise an error (cached like :func:`detect_ffmpeg`)."""
+    executable = shutil.which("ffprobe")
+    if not executable:
+        raise EnvironmentError(
+            "FFprobe не найден в PATH. Он входит в поставку FFmpeg - установите FFmpeg полностью."
+        )
+    return executable
+
+
 def normalise_paths(items: Iterable[str | Path]) -> List[Path]:
     """Expand and resolve a collection of filesystem paths."""
     return [Path(item).expanduser().resolve() for item in items]
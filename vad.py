@@ -0,0 +1,223 @@
+"""Cheap energy-based helpers for locating pauses in 16 kHz audio.
+
+The functions only depend on NumPy so they can run before any model is
+loaded. They are used to cut long recordings at natural pauses for
+parallel and streaming transcription and to drop long silent stretches before decoding
+(:func:`speech_regions`, :func:`compact_speech`).
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16_000
+FRAME_SECONDS = 0.02
+
+#: Bounds of the adaptive silence threshold (dBFS). The threshold sits
+#: 10 dB above the noise floor but never above the ceiling, so noisy
+#: recordings are kept rather than cut into.
+SILENCE_DB_FLOOR = -60.0
+SILENCE_DB_CEILING = -35.0
+
+#: ``(compact_start, original_start, length)`` in samples for every kept region.
+SpeechOffsets = List[Tuple[int, int, int]]
+
+
+def frame_energy_db(audio: np.ndarray, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """Return the RMS energy (dBFS) of consecutive non-overlapping frames."""
+    frame = max(1, int(frame_seconds * SAMPLE_RATE))
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[: count * frame], dtype=np.float32).reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+    return (20.0 * np.log10(rms)).astype(np.float32)
+
+
+def _smooth(values: np.ndarray, width: int) -> np.ndarray:
+    if width <= 1 or len(values) < width:
+        return values
+    kernel = np.ones(width, dtype=np.float32) / width
+    return np.convolve(values, kernel, mode="same")
+
+
+def find_split_points(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    search_seconds: float = 30.0,
+    pause_seconds: float = 0.5,
+) -> List[int]:
+    """Return sample offsets splitting ``audio`` into ~``chunk_seconds`` pieces.
+
+    Every boundary is moved to the quietest point (energy averaged over
+    ``pause_seconds``) within ``search_seconds`` of the nominal cut, so
+    chunks end in pauses instead of mid-word.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    if chunk <= 0 or total <= chunk:
+        return [0, total]
+
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    energy = _smooth(frame_energy_db(audio), int(pause_seconds / FRAME_SECONDS))
+    search = min(int(search_seconds / FRAME_SECONDS), int(chunk_seconds / FRAME_SECONDS) // 4)
+
+    points = [0]
+    nominal = chunk
+    while nominal < total - chunk // 4:
+        centre = nominal // frame
+        low = max(points[-1] // frame + 1, centre - search)
+        high = min(len(energy), centre + search + 1)
+        if low < high:
+            split = (low + int(np.argmin(energy[low:high]))) * frame
+        else:
+            split = nominal
+        points.append(split)
+        nominal = split + chunk
+    points.append(total)
+    return points
+
+
+def split_stream(
+    blocks: Iterable[np.ndarray],
+    chunk_seconds: float,
+    search_seconds: float = 30.0,
+    pause_seconds: float = 0.5,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Cut a stream of sample blocks into ``(offset, piece)`` pairs at pauses.
+
+    Streaming counterpart of :func:`find_split_points`: it yields the same
+    pieces as a scan of the whole recording while buffering only about
+    1.25 x ``chunk_seconds`` of audio plus one incoming block.
+    """
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    # Enough audio after the nominal cut for the search radius, the energy
+    # smoothing window and the short tail find_split_points leaves uncut.
+    lookahead = chunk + chunk // 4 + int(pause_seconds * SAMPLE_RATE) + 2 * frame
+    pending: List[np.ndarray] = []
+    buffered = 0
+    offset = 0
+    for block in blocks:
+        if not len(block):
+            continue
+        pending.append(block)
+        buffered += len(block)
+        if chunk <= 0 or buffered < lookahead:
+            continue
+        buffer = np.concatenate(pending)
+        while len(buffer) >= lookahead:
+            split = find_split_points(buffer[:lookahead], chunk_seconds, search_seconds, pause_seconds)[1]
+            yield offset, buffer[:split]
+            offset += split
+            buffer = buffer[split:]
+        pending, buffered = [buffer], len(buffer)
+    if buffered:
+        buffer = np.concatenate(pending)
+        points = find_split_points(buffer, chunk_seconds, search_seconds, pause_seconds)
+        for start, end in zip(points[:-1], points[1:]):
+            yield offset + start, buffer[start:end]
+
+
+def chunk_spans(points: List[int], overlap_seconds: float, total: int) -> List[Tuple[int, int]]:
+    """Expand consecutive split points into overlapping ``(start, end)`` spans."""
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    return [
+        (max(0, start - overlap), min(total, end + overlap))
+        for start, end in zip(points[:-1], points[1:])
+    ]
+
+
+def speech_regions(
+    audio: np.ndarray,
+    threshold_db: Optional[float] = None,
+    min_silence_seconds: float = 1.0,
+    padding_seconds: float = 0.25,
+    min_speech_seconds: float = 0.1,
+) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` sample spans of ``audio`` that contain sound.
+
+    Frames louder than ``threshold_db`` (adaptive when ``None``) are
+    voiced. Pauses shorter than ``min_silence_seconds`` are kept, voiced
+    runs shorter than ``min_speech_seconds`` are dropped and every region is
+    padded by ``padding_seconds`` so word onsets are not clipped.
+    """
+    energy = _smooth(frame_energy_db(audio), 3)
+    if not len(energy):
+        return [(0, len(audio))] if len(audio) else []
+    if threshold_db is None:
+        noise_floor = float(np.percentile(energy, 10))
+        threshold_db = min(SILENCE_DB_CEILING, max(noise_floor + 10.0, SILENCE_DB_FLOOR))
+
+    voiced = np.flatnonzero(energy > threshold_db)
+    if not len(voiced):
+        return []
+    breaks = np.flatnonzero(np.diff(voiced) > int(min_silence_seconds / FRAME_SECONDS))
+    starts = np.concatenate(([voiced[0]], voiced[breaks + 1]))
+    ends = np.concatenate((voiced[breaks], [voiced[-1]])) + 1
+
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    padding = int(padding_seconds * SAMPLE_RATE)
+    min_frames = int(min_speech_seconds / FRAME_SECONDS)
+    regions: List[Tuple[int, int]] = []
+    for start, end in zip(starts, ends):
+        if end - start < min_frames:
+            continue
+        span = (max(0, int(start) * frame - padding), min(len(audio), int(end) * frame + padding))
+        if regions and span[0] <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], span[1])
+        else:
+            regions.append(span)
+    return regions
+
+
+def compact_speech(
+    audio: np.ndarray, regions: Sequence[Tuple[int, int]], gap_seconds: float = 0.2
+) -> Tuple[np.ndarray, SpeechOffsets]:
+    """Concatenate ``regions`` of ``audio`` separated by short silent gaps.
+
+    Returns the compacted waveform and the offsets needed by
+    :func:`restore_segments` to map its timestamps back.
+    """
+    gap = np.zeros(int(gap_seconds * SAMPLE_RATE), dtype=np.float32)
+    pieces: List[np.ndarray] = []
+    offsets: SpeechOffsets = []
+    position = 0
+    for start, end in regions:
+        if pieces:
+            pieces.append(gap)
+            position += len(gap)
+        pieces.append(np.asarray(audio[start:end], dtype=np.float32))
+        offsets.append((position, start, end - start))
+        position += end - start
+    compact = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    return compact, offsets
+
+
+def restore_time(seconds: float, offsets: SpeechOffsets) -> float:
+    """Map a timestamp of the compacted audio to the original recording."""
+    if not offsets:
+        return seconds
+    sample = seconds * SAMPLE_RATE
+    index = max(0, bisect_right([offset[0] for offset in offsets], sample) - 1)
+    compact_start, original_start, length = offsets[index]
+    # Times inside an inserted gap are clamped to the end of the region.
+    return round((original_start + min(max(sample - compact_start, 0), length)) / SAMPLE_RATE, 3)
+
+
+def restore_segments(segments: List[Dict[str, Any]], offsets: SpeechOffsets) -> List[Dict[str, Any]]:
+    """Return Whisper segments (and their words) in original-recording time."""
+    restored = []
+    for segment in segments:
+        segment = dict(segment)
+        segment["start"] = restore_time(segment["start"], offsets)
+        segment["end"] = max(segment["start"], restore_time(segment["end"], offsets))
+        if segment.get("words"):
+            segment["words"] = [
+                {**word, "start": restore_time(word["start"], offsets), "end": restore_time(word["end"], offsets)}
+                for word in segment["words"]
+            ]
+        restored.append(segment)
+    return restored
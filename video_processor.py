@@ -1,36 +1,545 @@
-"""Video helpers built on top of ``ffmpeg-python``."""
+"""Video helpers built on top of ``ffmpeg-python``.
+
+:func:`stream_audio` and :func:`extract_audio_array` decode the audio
+track through FFmpeg's stdout (``pipe:1``) straight into NumPy, so a
+video can be transcribed without writing a WAV file next to it;
+:func:`extract_audio` is kept for callers that need the file and
+:func:`extract_audio_many` writes many files with concurrent FFmpeg
+processes. Given an :class:`~extraction_cache.ExtractionCache`, every
+helper reuses a WAV already extracted from the unchanged source.
+
+:func:`add_subtitles` adds subtitles as a separate track by default
+(stream copy, no re-encode); burning them into the picture re-encodes
+the whole video and is only done on request, optionally split at
+keyframes into segments encoded by parallel FFmpeg processes.
+"""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+
 import ffmpeg
+import numpy as np
+
+from cpu_threads import available_cores
+from extraction_cache import ExtractionCache
+from utils import detect_ffmpeg, detect_ffprobe, ensure_directory, ensure_file_exists
+from vad import SAMPLE_RATE
+
+#: Default duration of the blocks yielded by :func:`stream_audio`.
+STREAM_CHUNK_SECONDS = 30.0
+
+#: Ways :func:`add_subtitles` can attach subtitles.
+SUBTITLE_MODES = ("mux", "burn")
 
-from utils import detect_ffmpeg, ensure_directory, ensure_file_exists
+#: Subtitle codec per output container for ``mode="mux"``; ``None``
+#: keeps the subtitle file's own format (SRT or WebVTT).
+SOFT_SUBTITLE_CODECS: Dict[str, Optional[str]] = {
+    ".mp4": "mov_text",
+    ".m4v": "mov_text",
+    ".mov": "mov_text",
+    ".mkv": None,
+    ".webm": "webvtt",
+}
 
+#: FFmpeg output options of extracted WAV files (part of the cache key).
+WAV_FIELDS: Dict[str, Any] = {"acodec": "pcm_s16le", "ac": 1, "ar": SAMPLE_RATE}
 
-def extract_audio(video_path: str | Path, output_path: Optional[str | Path] = None) -> Path:
-    """Extract audio track from ``video_path`` using FFmpeg."""
+_BYTES_PER_SAMPLE = 2  # s16le
+
+
+def _open_pcm_pipe(video_path: str | Path) -> subprocess.Popen:
     input_path = ensure_file_exists(video_path)
+    return (
+        ffmpeg
+        .input(str(input_path))
+        .output("pipe:1", format="s16le", acodec="pcm_s16le", ac=1, ar=SAMPLE_RATE, vn=None)
+        .global_args("-nostdin", "-hide_banner", "-loglevel", "error")
+        .run_async(cmd=detect_ffmpeg(), pipe_stdout=True, pipe_stderr=True)
+    )
+
+
+def _drain(stream: IO[bytes], sink: List[bytes]) -> threading.Thread:
+    # FFmpeg blocks once the stderr pipe buffer is full, so it is read
+    # concurrently with stdout.
+    thread = threading.Thread(target=lambda: sink.append(stream.read()), daemon=True)
+    thread.start()
+    return thread
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    parts = []
+    while size > 0:
+        part = stream.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b"".join(parts)
+
+
+def _check_exit(process: subprocess.Popen, stderr: bytes, failure: str = "Не удалось извлечь аудио") -> None:
+    if process.returncode:
+        message = stderr.decode(errors="ignore").strip() or f"код возврата {process.returncode}"
+        raise RuntimeError(f"{failure}: {message}")
+
+
+def _run(stream: Any, executable: Optional[str] = None, failure: str = "Не удалось извлечь аудио") -> None:
+    process = (
+        stream
+        .overwrite_output()
+        .global_args("-nostdin", "-hide_banner", "-loglevel", "error")
+        .run_async(cmd=executable or detect_ffmpeg(), pipe_stderr=True)
+    )
+    _, stderr = process.communicate()
+    _check_exit(process, stderr, failure)
+
+
+def _wav_blocks(path: Path, frames: int) -> Iterator[np.ndarray]:
+    with wave.open(str(path), "rb") as f:
+        for data in iter(lambda: f.readframes(frames), b""):
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def _pcm_chunks(video_path: str | Path, block_bytes: int) -> Iterator[bytes]:
+    process = _open_pcm_pipe(video_path)
+    stderr: List[bytes] = []
+    errors = _drain(process.stderr, stderr)
+    complete = False
+    try:
+        while True:
+            data = _read_exact(process.stdout, block_bytes)
+            data = data[: len(data) - len(data) % _BYTES_PER_SAMPLE]
+            if not data:
+                break
+            yield data
+        complete = True
+    finally:
+        process.stdout.close()
+        if not complete:
+            process.kill()
+        process.wait()
+        errors.join()
+    _check_exit(process, b"".join(stderr))
+
+
+def stream_audio(
+    video_path: str | Path,
+    chunk_seconds: float = STREAM_CHUNK_SECONDS,
+    cache: Optional[ExtractionCache] = None,
+) -> Iterator[np.ndarray]:
+    """Yield the audio track of ``video_path`` as mono 16 kHz float32 blocks.
+
+    FFmpeg writes 16-bit PCM to its stdout, which is read
+    ``chunk_seconds`` at a time, so memory stays bounded however long the
+    video is. Closing the generator early stops FFmpeg. The samples are
+    the ones Whisper decodes from the file path. A ``cache`` entry is read
+    instead when there is one; on a miss the blocks are also written to
+    the cache, and the entry is kept once the stream was read to the end.
+    """
+    if chunk_seconds <= 0:
+        raise ValueError("Длительность блока должна быть положительной")
+    frames = max(1, int(chunk_seconds * SAMPLE_RATE))
+    block_bytes = frames * _BYTES_PER_SAMPLE
+    if cache is None:
+        for data in _pcm_chunks(video_path, block_bytes):
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+        return
+    input_path = ensure_file_exists(video_path)
+    key = cache.make_key(input_path, WAV_FIELDS)
+    cached = cache.get(key)
+    if cached is not None:
+        yield from _wav_blocks(cached, frames)
+        return
+    with cache.staged(key) as temp, wave.open(str(temp), "wb") as sink:
+        sink.setnchannels(WAV_FIELDS["ac"])
+        sink.setsampwidth(_BYTES_PER_SAMPLE)
+        sink.setframerate(SAMPLE_RATE)
+        for data in _pcm_chunks(input_path, block_bytes):
+            sink.writeframes(data)
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def extract_audio_array(video_path: str | Path, cache: Optional[ExtractionCache] = None) -> np.ndarray:
+    """Return the audio track of ``video_path`` as one mono 16 kHz float32 array.
+
+    Reads FFmpeg's stdout into memory without an intermediate file; the
+    result can be passed to :meth:`transcriber.Transcriber.transcribe`.
+    Use :func:`stream_audio` to keep memory bounded for long videos. With
+    a ``cache`` the track is extracted into (or read from) the cache.
+    """
+    if cache is not None:
+        path, _ = _cached_wav(ensure_file_exists(video_path), cache)
+        with wave.open(str(path), "rb") as f:
+            pcm = f.readframes(f.getnframes())
+        return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+    process = _open_pcm_pipe(video_path)
+    pcm, stderr = process.communicate()
+    _check_exit(process, stderr)
+    return np.frombuffer(pcm[: len(pcm) - len(pcm) % _BYTES_PER_SAMPLE], np.int16).astype(np.float32) / 32768.0
+
+
+def _run_wav(input_path: Path, output_file: Path, executable: Optional[str] = None) -> None:
+    _run(ffmpeg.input(str(input_path)).output(str(output_file), format="wav", **WAV_FIELDS), executable)
+
+
+def _cached_wav(input_path: Path, cache: ExtractionCache, executable: Optional[str] = None) -> Tuple[Path, bool]:
+    """Return the cached WAV of ``input_path`` (extracting it on a miss) and whether it was a hit."""
+    key = cache.make_key(input_path, WAV_FIELDS)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+    return cache.put(key, lambda temp: _run_wav(input_path, temp, executable)), False
+
+
+def _wav_seconds(path: Path) -> float:
+    with wave.open(str(path), "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def extract_audio(
+    video_path: str | Path,
+    output_path: Optional[str | Path] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> Path:
+    """Extract audio track from ``video_path`` using FFmpeg.
+
+    With a ``cache`` an up-to-date entry is reused; the cached file itself
+    is returned unless ``output_path`` asks for a copy.
+    """
+    input_path = ensure_file_exists(video_path)
+    if cache is not None:
+        cached, _ = _cached_wav(input_path, cache)
+        if not output_path:
+            return cached
     output_file = (
         Path(output_path).expanduser().resolve()
         if output_path
         else input_path.with_suffix(".wav")
     )
     ensure_directory(output_file.parent)
-    detect_ffmpeg()
+    if cache is not None:
+        shutil.copyfile(cached, output_file)
+    else:
+        _run_wav(input_path, output_file)
+    return output_file
 
-    (
-        ffmpeg
-        .input(str(input_path))
-        .output(str(output_file), acodec="pcm_s16le", ac=1, ar="16k")
-        .overwrite_output()
-        .run(quiet=True)
+
+@dataclass
+class ExtractionResult:
+    """Outcome of one file of :func:`extract_audio_many`."""
+
+    source: Path
+    output: Optional[Path] = None
+    seconds: float = 0.0
+    input_bytes: int = 0
+    audio_seconds: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class ExtractionReport:
+    """Per-file results and aggregate throughput of :func:`extract_audio_many`."""
+
+    workers: int = 1
+    wall_seconds: float = 0.0
+    results: List[ExtractionResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[ExtractionResult]:
+        return [result for result in self.results if result.error is not None]
+
+    def throughput(self) -> Dict[str, float]:
+        """Return files, input megabytes and audio seconds processed per wall second."""
+        done = [result for result in self.results if result.error is None]
+        wall = self.wall_seconds or float("inf")
+        return {
+            "files_per_second": round(len(done) / wall, 3),
+            "input_mb_per_second": round(sum(r.input_bytes for r in done) / 1e6 / wall, 3),
+            "audio_seconds_per_second": round(sum(r.audio_seconds for r in done) / wall, 1),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "files": len(self.results),
+            "failed": len(self.failed),
+            "cached": sum(result.cached for result in self.results),
+            **self.throughput(),
+            "results": [
+                {
+                    "source": str(result.source),
+                    "output": str(result.output) if result.output else None,
+                    "seconds": round(result.seconds, 3),
+                    "input_bytes": result.input_bytes,
+                    "audio_seconds": round(result.audio_seconds, 3),
+                    "cached": result.cached,
+                    "error": result.error,
+                }
+                for result in self.results
+            ],
+        }
+
+
+def _extract_one(
+    input_path: Path,
+    output_file: Optional[Path],
+    executable: str,
+    cache: Optional[ExtractionCache],
+) -> ExtractionResult:
+    result = ExtractionResult(source=input_path)
+    started = time.perf_counter()
+    try:
+        result.input_bytes = input_path.stat().st_size
+        if cache is not None:
+            wav, result.cached = _cached_wav(input_path, cache, executable)
+            if output_file is not None:
+                shutil.copyfile(wav, output_file)
+            result.output = output_file or wav
+        else:
+            _run_wav(input_path, output_file, executable)
+            result.output = output_file
+        result.audio_seconds = _wav_seconds(result.output)
+    except (RuntimeError, OSError, wave.Error, EOFError) as exc:
+        # A truncated or unreadable WAV fails this file, not the whole batch.
+        result.error = str(exc) or type(exc).__name__
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def extract_audio_many(
+    video_paths: Iterable[str | Path],
+    output_dir: Optional[str | Path] = None,
+    max_workers: Optional[int] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> ExtractionReport:
+    """Extract the audio of many files with up to ``max_workers`` FFmpeg processes.
+
+    Each file is written as ``<stem>.wav`` next to its source or into
+    ``output_dir``; with a ``cache`` and no ``output_dir`` the cached
+    files are reported instead and up-to-date entries are not extracted
+    again. A failing file does not stop the others: its FFmpeg stderr is
+    kept in :attr:`ExtractionResult.error`. ``max_workers`` defaults to
+    the number of available cores.
+    """
+    inputs = [ensure_file_exists(path) for path in video_paths]
+    directory = Path(output_dir).expanduser().resolve() if output_dir else None
+    outputs: List[Optional[Path]] = [
+        (directory / path.name if directory else path).with_suffix(".wav") for path in inputs
+    ]
+    if cache is not None and directory is None:
+        outputs = [None] * len(inputs)
+    elif len(set(outputs)) < len(outputs) or set(outputs) & set(inputs):
+        raise ValueError("Выходные WAV файлы совпадают друг с другом или с исходными файлами")
+    for output in outputs:
+        if output is not None:
+            ensure_directory(output.parent)
+    workers = max(1, min(max_workers or len(available_cores()), len(inputs) or 1))
+    executable = detect_ffmpeg()
+
+    report = ExtractionReport(workers=workers)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffmpeg") as pool:
+        report.results = list(
+            pool.map(_extract_one, inputs, outputs, [executable] * len(inputs), [cache] * len(inputs))
+        )
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+@dataclass
+class SubtitleStats:
+    """How :func:`add_subtitles` produced its output and how long it took.
+
+    For a parallel burn-in ``stages`` holds the probe, encode and concat
+    times and ``segment_seconds`` the encode time of every segment.
+    """
+
+    mode: str = ""
+    codec: Optional[str] = None
+    seconds: float = 0.0
+    workers: int = 1
+    segments: int = 1
+    segment_seconds: List[float] = field(default_factory=list)
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+def _soft_subtitle_codec(output_file: Path, subtitle_file: Path) -> str:
+    codec = SOFT_SUBTITLE_CODECS[output_file.suffix.lower()]
+    if codec is None:
+        codec = "webvtt" if subtitle_file.suffix.lower() == ".vtt" else "srt"
+    return codec
+
+
+def keyframe_times(video_path: str | Path) -> Tuple[List[float], float]:
+    """Return the keyframe timestamps of the first video stream and the duration.
+
+    Only packet headers are read (no decoding), so this takes a fraction
+    of a second even for long videos.
+    """
+    command = [
+        detect_ffprobe(),
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags:format=duration",
+        "-of", "json",
+        str(ensure_file_exists(video_path)),
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f"Не удалось прочитать ключевые кадры: {exc.stderr.decode(errors='ignore')}") from exc
+    info = json.loads(output)
+    keyframes = sorted(
+        float(packet["pts_time"])
+        for packet in info.get("packets", [])
+        if "K" in packet.get("flags", "") and packet.get("pts_time", "N/A") != "N/A"
     )
-    return output_file
+    duration = float(info.get("format", {}).get("duration", "nan"))
+    if duration != duration:  # N/A
+        duration = keyframes[-1] if keyframes else 0.0
+    return keyframes, duration
+
+
+def plan_segments(keyframes: List[float], duration: float, segments: int) -> List[Tuple[float, Optional[float]]]:
+    """Split ``duration`` into up to ``segments`` ``(start, end)`` spans cut at keyframes.
+
+    Each cut is the keyframe closest to an even split; the last span is
+    open-ended (``end`` is ``None``).
+    """
+    cuts: List[float] = []
+    for index in range(1, segments):
+        target = duration * index / segments
+        candidates = [moment for moment in keyframes if (cuts[-1] if cuts else 0.0) < moment < duration]
+        if not candidates:
+            break
+        cuts.append(min(candidates, key=lambda moment: abs(moment - target)))
+    return list(zip([0.0, *cuts], [*cuts, None]))
+
+
+def _burn_segment(
+    input_path: Path,
+    subtitle_file: Path,
+    output_file: Path,
+    span: Tuple[float, Optional[float]],
+    threads: int,
+    executable: str,
+) -> float:
+    start, end = span
+    options: Dict[str, Any] = {"an": None, "sn": None, "threads": threads}
+    if end is not None:
+        options["t"] = f"{end - start:.6f}"
+    # Input seeking restarts timestamps at zero; shifting them back while
+    # the subtitles filter runs keeps every cue at its original time.
+    video_filter = f"setpts=PTS+{start:.6f}/TB,subtitles={subtitle_file},setpts=PTS-STARTPTS"
+    started = time.perf_counter()
+    _run(
+        ffmpeg.input(str(input_path), ss=f"{start:.6f}").output(str(output_file), vf=video_filter, **options),
+        executable,
+        failure="Не удалось добавить субтитры",
+    )
+    return time.perf_counter() - started
 
 
-def add_subtitles(video_path: str | Path, subtitles_path: str | Path, output_path: Optional[str | Path] = None) -> Path:
-    """Burn subtitles into a video file using FFmpeg."""
+def _burn_parallel(
+    input_path: Path,
+    subtitle_file: Path,
+    output_file: Path,
+    workers: int,
+    stats: SubtitleStats,
+    audio_codec: Dict[str, Any],
+) -> bool:
+    """Burn subtitles segment by segment.
+
+    Returns ``False`` when the video cannot be split: too short, or the
+    keyframes cannot be read (no ffprobe, unreadable probe output).
+    """
+    executable = detect_ffmpeg()
+    started = time.perf_counter()
+    try:
+        keyframes, duration = keyframe_times(input_path)
+    except (OSError, RuntimeError, ValueError):
+        return False
+    spans = plan_segments(keyframes, duration, workers)
+    stats.stages["probe"] = time.perf_counter() - started
+    if len(spans) < 2:
+        return False
+    stats.workers = workers
+    stats.segments = len(spans)
+    threads = max(1, len(available_cores()) // len(spans))
+
+    with tempfile.TemporaryDirectory(dir=output_file.parent, prefix=".burn-") as directory:
+        # Parts use the output container so FFmpeg picks the same encoder
+        # a single-process burn would, and the concat can stream-copy.
+        parts = [Path(directory) / f"part{index:03d}{output_file.suffix}" for index in range(len(spans))]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(spans), thread_name_prefix="ffmpeg") as pool:
+            stats.segment_seconds = list(
+                pool.map(
+                    lambda part, span: _burn_segment(input_path, subtitle_file, part, span, threads, executable),
+                    parts,
+                    spans,
+                )
+            )
+        stats.stages["encode"] = time.perf_counter() - started
+
+        playlist = Path(directory) / "parts.txt"
+        playlist.write_text(
+            "".join("file '{}'\n".format(str(part).replace("'", "'\\''")) for part in parts),
+            encoding="utf-8",
+        )
+        started = time.perf_counter()
+        video = ffmpeg.input(str(playlist), format="concat", safe=0)
+        source = ffmpeg.input(str(input_path))
+        _run(
+            ffmpeg.output(video["v"], source["a?"], str(output_file), **{"c:v": "copy", **audio_codec}),
+            executable,
+            failure="Не удалось склеить сегменты",
+        )
+        stats.stages["concat"] = time.perf_counter() - started
+    return True
+
+
+def add_subtitles(
+    video_path: str | Path,
+    subtitles_path: str | Path,
+    output_path: Optional[str | Path] = None,
+    mode: str = "mux",
+    stats: Optional[SubtitleStats] = None,
+    workers: int = 1,
+) -> Path:
+    """Add subtitles to a video file using FFmpeg.
+
+    ``mode="mux"`` stream-copies the video (and the audio, see below) and
+    adds the SRT/VTT file as a subtitle track (``mov_text`` in MP4/MOV, ``webvtt``
+    in WebM, the file's own format in MKV), which takes seconds. Other
+    containers (AVI, FLV ...) have no suitable subtitle stream, so they
+    fall back to ``mode="burn"``; ``stats.mode`` reports the mode used.
+    ``mode="burn"`` renders the subtitles into the picture and re-encodes
+    the video. In both modes the audio is copied only when the output
+    container matches the input and encoded with the container's default
+    codec otherwise.
+    With ``workers > 1`` the video is cut at keyframes
+    into ``workers`` segments burned by parallel FFmpeg processes and
+    joined losslessly with the concat demuxer; videos too short to split
+    are burned in one piece. ``stats`` receives the mode, subtitle codec,
+    duration and the per-segment timings.
+    """
+    if mode not in SUBTITLE_MODES:
+        raise ValueError(f"Неизвестный режим субтитров: {mode} (доступны: {', '.join(SUBTITLE_MODES)})")
+    if workers < 1:
+        raise ValueError("Число процессов должно быть не меньше 1")
     input_path = ensure_file_exists(video_path)
     subtitle_file = ensure_file_exists(subtitles_path)
     output_file = (
@@ -39,13 +548,34 @@ def add_subtitles(video_path: str | Path, subtitles_path: str | Path, output_pat
         else input_path.with_name(f"{input_path.stem}_subtitled{input_path.suffix}")
     )
     ensure_directory(output_file.parent)
-    detect_ffmpeg()
+    stats = stats if stats is not None else SubtitleStats()
+    if mode == "mux" and output_file.suffix.lower() not in SOFT_SUBTITLE_CODECS:
+        mode = "burn"
+    stats.mode = mode
+    # The input's audio stream always fits a container of the same type.
+    audio_codec: Dict[str, Any] = {"c:a": "copy"} if output_file.suffix.lower() == input_path.suffix.lower() else {}
 
-    (
-        ffmpeg
-        .input(str(input_path))
-        .output(str(output_file), vf=f"subtitles={subtitle_file}")
-        .overwrite_output()
-        .run(quiet=True)
-    )
+    started = time.perf_counter()
+    if mode == "mux":
+        stats.codec = _soft_subtitle_codec(output_file, subtitle_file)
+        # Only the first input's video/audio and the new track; subtitle
+        # and data streams of the source may not fit the output container.
+        video = ffmpeg.input(str(input_path))
+        subtitles = ffmpeg.input(str(subtitle_file))
+        _run(
+            ffmpeg.output(
+                video["v"],
+                video["a?"],
+                subtitles["s"],
+                str(output_file),
+                **{"c:v": "copy", **audio_codec, "c:s": stats.codec},
+            ),
+            failure="Не удалось добавить субтитры",
+        )
+    elif workers == 1 or not _burn_parallel(input_path, subtitle_file, output_file, workers, stats, audio_codec):
+        _run(
+            ffmpeg.input(str(input_path)).output(str(output_file), vf=f"subtitles={subtitle_file}", **audio_codec),
+            failure="Не удалось добавить субтитры",
+        )
+    stats.seconds = time.perf_counter() - started
     return output_file